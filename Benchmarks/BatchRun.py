@@ -0,0 +1,296 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Runs the hole detection of CorkHoles and the cutouts of Cutouts on a folder of
+# model snapshots, without Fusion, using the stand-in adsk modules.  The format
+# of the snapshots is described in Common/ModelSnapshot.py, which also writes
+# them in Fusion.  The models are run in a pool of processes and the result of
+# each model is written as a line of JSON as soon as it's finished, so a long
+# run can be watched and a failed model doesn't lose the others.
+#
+# For each body the hole edges found by findHoleEdges are reported with their
+# radius and center.  If the snapshot has the inputs of the Cutouts command,
+# drawGeometry is run and the number of shapes, sketches and profiles and the
+# bodies that would be cut are reported.  Each stage reports its time and the
+# number of API calls it made.
+#
+# The --example option writes example snapshots of plates with holes, slots,
+# filleted bosses and cutout points to the folder instead.
+#
+# Usage:
+#     python BatchRun.py folder [--output results.jsonl] [--processes 4]
+#     python BatchRun.py folder --example 20
+
+import os, sys, time, json, glob, math, random, argparse, multiprocessing
+
+_repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_repoDir, 'Common', 'StandIn'))
+sys.path.insert(0, os.path.join(_repoDir, 'Common'))
+sys.path.insert(0, _repoDir)
+
+import adsk, adsk.core, adsk.fusion
+import ModelSnapshot
+from CorkHoles import CorkHolesCommand
+from Cutouts import CutoutsCommand
+
+
+def _point(values):
+    return adsk.core.Point3D(values[0], values[1], values[2])
+
+
+def _vector(values):
+    return adsk.core.Vector3D(values[0], values[1], values[2])
+
+
+# Surfaces and curves of other types, like fillets and arcs, are loaded as
+# stand-ins that only report their type so the hole detection skips them.  An
+# other surface is given the point and normal recorded for its face.
+def _surface(surface, pointOnFace, normal):
+    if surface['type'] == 'Plane':
+        return adsk.core.Plane(_point(surface['origin']), _vector(surface['normal']))
+    elif surface['type'] == 'Cylinder':
+        return adsk.core.Cylinder(_point(surface['origin']), _vector(surface['axis']), surface['radius'])
+    return adsk.core.Surface(surface['surfaceType'], pointOnFace, normal)
+
+
+def _curve(curve):
+    if curve['type'] == 'Circle':
+        return adsk.core.Circle3D(_point(curve['center']), _vector(curve['normal']), curve['radius'])
+    elif curve['type'] == 'Line':
+        return adsk.core.Line3D(_point(curve['startPoint']), _point(curve['endPoint']))
+    return adsk.core.Curve3D(curve['curveType'])
+
+
+# Creates a stand-in body from the snapshot of a body.
+def createBody(des, bodySnapshot):
+    box = bodySnapshot['boundingBox']
+    body = adsk.fusion.BRepBody(des, _point(box[0:3]), _point(box[3:6]), bodySnapshot['name'], bodySnapshot['isSolid'])
+    des.rootComponent._bRepBodies._items.append(body)
+
+    faces = []
+    for faceSnapshot in bodySnapshot['faces']:
+        # The face is reversed if the recorded normal points the other way from the surface's.
+        pointOnFace = _point(faceSnapshot['pointOnFace'])
+        surface = _surface(faceSnapshot['surface'], pointOnFace, _vector(faceSnapshot['normal']))
+        (rslt, normal) = adsk.core.SurfaceEvaluator(surface).getNormalAtPoint(pointOnFace)
+        isReversed = normal._copy().dotProduct(_vector(faceSnapshot['normal'])) < 0
+        faces.append(adsk.fusion.BRepFace(body, surface, pointOnFace, isReversed))
+
+    edges = []
+    for edgeSnapshot in bodySnapshot['edges']:
+        edge = adsk.fusion.BRepEdge(body, _curve(edgeSnapshot['curve']), edgeSnapshot['isDegenerate'])
+        for faceIndex in edgeSnapshot['faces']:
+            edge._faces._items.append(faces[faceIndex])
+            faces[faceIndex]._edges._items.append(edge)
+        edges.append(edge)
+
+    for (face, faceSnapshot) in zip(faces, bodySnapshot['faces']):
+        for loopSnapshot in faceSnapshot['loops']:
+            loop = adsk.fusion.BRepLoop(face, loopSnapshot['isOuter'])
+            loop._edges._items.extend(edges[edgeIndex] for edgeIndex in loopSnapshot['edges'])
+            face._loops._items.append(loop)
+    return body
+
+
+# Creates a new stand-in design from the snapshot and returns the design, the
+# bodies, and the plane and points of the cutouts, which are None and an empty
+# list if the snapshot doesn't have any.
+def createModel(snapshot):
+    des = adsk.newDesign()
+    bodies = [createBody(des, bodySnapshot) for bodySnapshot in snapshot['bodies']]
+
+    planeEnt = None
+    points = []
+    cutouts = snapshot.get('cutouts')
+    if cutouts:
+        plane = adsk.core.Plane(_point(cutouts['plane']['origin']), _vector(cutouts['plane']['normal']))
+        planeEnt = adsk.fusion.ConstructionPlane(des, plane, 'Cutouts')
+        points = [adsk.fusion.ConstructionPoint(des, _point(point)) for point in cutouts['points']]
+    return (des, bodies, planeEnt, points)
+
+
+# Runs the function and returns its result, time and API calls.  The add-ins
+# report failures with a message box so any message is raised as an error.
+def measure(function, *args):
+    ui = adsk.core.Application.get().userInterface
+    ui._messages = []
+    adsk.resetCallCounts()
+
+    startTime = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - startTime
+
+    if ui._messages:
+        raise RuntimeError(ui._messages[0])
+    return (result, {'seconds': seconds, 'apiCalls': adsk.totalCallCount()})
+
+
+def detectHoles(bodies):
+    return [(body, CorkHolesCommand.findHoleEdges(body)) for body in bodies]
+
+
+# Runs the stages on a snapshot and returns the result as a dictionary.
+def runModel(filename):
+    result = {'file': os.path.basename(filename)}
+    startTime = time.perf_counter()
+    try:
+        snapshot = ModelSnapshot.load(filename)
+        result['model'] = snapshot['name']
+        (des, bodies, planeEnt, points) = createModel(snapshot)
+        result['loadSeconds'] = time.perf_counter() - startTime
+
+        (bodyHoles, result['detect']) = measure(detectHoles, bodies)
+        result['holes'] = [{'body': body._name, 'edge': edge._tempId, 'radius': radius, 'center': list(edge._geometry._center.asArray())}
+                           for (body, holeInfos) in bodyHoles for (edge, matrix, radius) in holeInfos]
+
+        cutouts = snapshot.get('cutouts')
+        if cutouts:
+            pointEnts = adsk.core.ObjectCollection(points)
+            (_, result['cutouts']) = measure(CutoutsCommand.drawGeometry, planeEnt, pointEnts, cutouts['shape'], cutouts['size'], '', cutouts['tileSize'])
+
+            root = des.rootComponent
+            extrude = root.features.extrudeFeatures._items[-1]
+            result['cutouts'].update(shapes=len(points), sketches=len(root.sketches._items), profiles=len(extrude._input._profile._items),
+                                     cutBodies=[body._name for body in extrude._input._participantBodies])
+    except Exception as ex:
+        result['error'] = '{}: {}'.format(type(ex).__name__, ex)
+
+    result['seconds'] = time.perf_counter() - startTime
+    return result
+
+
+# Writes example snapshots of plates with random holes, slots, bosses and cutout points.
+def writeExamples(folder, count):
+    os.makedirs(folder, exist_ok=True)
+    random.seed(1)
+    for i in range(0, count):
+        (des, body, planeEnt, points) = createExample(random.randint(1, 40), random.randint(0, 10), random.randint(0, 200), random.randint(0, 3))
+        snapshot = ModelSnapshot.snapshot('Plate{}'.format(i + 1), [body], planeEnt, points, random.choice(['Square', 'Circle', 'Pentagon']), 0.5)
+        ModelSnapshot.save(os.path.join(folder, 'Plate{}.json'.format(i + 1)), snapshot)
+    print('{} example snapshots written to {}'.format(count, folder))
+
+
+# Creates a stand-in plate whose top face is on the XY plane, with holes and
+# slots through it and bosses on top of it, and a grid of points on its top
+# face.  Some of the bosses have a fillet, which is a torus, and the ends of the
+# slots are arcs, so the snapshot has geometry the hole detection has to skip.
+def createExample(holeCount, bossCount, pointCount, slotCount=0):
+    des = adsk.newDesign()
+    (width, thickness) = (20.0, 1.0)
+    body = adsk.fusion.BRepBody(des, adsk.core.Point3D(0, 0, -thickness), adsk.core.Point3D(width, width, 0), 'Plate')
+    des.rootComponent._bRepBodies._items.append(body)
+
+    up = adsk.core.Vector3D(0, 0, 1)
+    top = adsk.fusion.BRepFace(body, adsk.core.Plane(adsk.core.Point3D(0, 0, 0), up), adsk.core.Point3D(0.01, 0.01, 0))
+    bottom = adsk.fusion.BRepFace(body, adsk.core.Plane(adsk.core.Point3D(0, 0, -thickness), up), adsk.core.Point3D(0.01, 0.01, -thickness), True)
+
+    def addEdge(curve, faces):
+        edge = adsk.fusion.BRepEdge(body, curve)
+        for face in faces:
+            edge._faces._items.append(face)
+            face._edges._items.append(edge)
+        return edge
+
+    def addLoop(face, isOuter, edges):
+        loop = adsk.fusion.BRepLoop(face, isOuter)
+        loop._edges._items.extend(edges)
+        face._loops._items.append(loop)
+
+    for (face, z) in ((top, 0), (bottom, -thickness)):
+        corners = [adsk.core.Point3D(x, y, z) for (x, y) in ((0, 0), (width, 0), (width, width), (0, width))]
+        addLoop(face, True, [addEdge(adsk.core.Line3D(corners[j], corners[(j + 1) % 4]), [face]) for j in range(4)])
+
+    # Holes go through the plate and their faces point in to the axis.  Bosses
+    # stand on the top face and their faces point out.
+    for j in range(0, holeCount + bossCount):
+        isHole = j < holeCount
+        (x, y, radius) = (random.uniform(2, width - 2), random.uniform(2, width - 2), random.choice([0.25, 0.4, 0.5, 0.75]))
+        z = -thickness if isHole else 0
+        cylinder = adsk.core.Cylinder(adsk.core.Point3D(x, y, z), up, radius)
+        cylinderFace = adsk.fusion.BRepFace(body, cylinder, adsk.core.Point3D(x + radius, y, z + thickness / 2), isHole)
+        if not isHole and random.random() < 0.5:
+            # The fillet is a quarter of a torus between the boss and the top face.
+            fillet = radius / 4
+            (s, c) = (math.sin(math.pi / 4), math.cos(math.pi / 4))
+            torus = adsk.core.Surface(adsk.core.SurfaceTypes.TorusSurfaceType, adsk.core.Point3D(x + radius + fillet * (1 - s), y, fillet * (1 - c)),
+                                      adsk.core.Vector3D(s, 0, c))
+            filletFace = adsk.fusion.BRepFace(body, torus, torus._origin._copy())
+            addEdge(adsk.core.Circle3D(adsk.core.Point3D(x, y, fillet), up, radius), [cylinderFace, filletFace])
+            addLoop(top, False, [addEdge(adsk.core.Circle3D(adsk.core.Point3D(x, y, 0), up, radius + fillet), [top, filletFace])])
+            continue
+        for face in ((top, bottom) if isHole else (top,)):
+            faceZ = 0 if face is top else -thickness
+            edge = addEdge(adsk.core.Circle3D(adsk.core.Point3D(x, y, faceZ), up, radius), [face, cylinderFace])
+            addLoop(face, False, [edge])
+
+    # Slots go through the plate along X.  Their sides are planes and their ends
+    # are half cylinders, whose edges are arcs.
+    for j in range(0, slotCount):
+        (x, y, length, radius) = (random.uniform(4, width - 4), random.uniform(2, width - 2), random.uniform(1, 3), random.choice([0.25, 0.5]))
+        sides = [adsk.fusion.BRepFace(body, adsk.core.Plane(adsk.core.Point3D(x, y + side * radius, 0), adsk.core.Vector3D(0, -side, 0)),
+                                      adsk.core.Point3D(x, y + side * radius, -thickness / 2)) for side in (-1, 1)]
+        ends = [adsk.fusion.BRepFace(body, adsk.core.Cylinder(adsk.core.Point3D(x + end * length / 2, y, -thickness), up, radius),
+                                     adsk.core.Point3D(x + end * (length / 2 + radius), y, -thickness / 2), True) for end in (-1, 1)]
+        for (face, z) in ((top, 0), (bottom, -thickness)):
+            corners = [adsk.core.Point3D(x + dx * length / 2, y + dy * radius, z) for (dx, dy) in ((-1, -1), (1, -1), (1, 1), (-1, 1))]
+            arc = adsk.core.Curve3DTypes.Arc3DCurveType
+            addLoop(face, False, [addEdge(adsk.core.Line3D(corners[0], corners[1]), [face, sides[0]]),
+                                  addEdge(adsk.core.Curve3D(arc), [face, ends[1]]),
+                                  addEdge(adsk.core.Line3D(corners[2], corners[3]), [face, sides[1]]),
+                                  addEdge(adsk.core.Curve3D(arc), [face, ends[0]])])
+
+    columns = max(1, int(pointCount ** 0.5))
+    points = [adsk.fusion.ConstructionPoint(des, adsk.core.Point3D(1 + (k % columns) * 18 / columns, 1 + (k // columns) * 18 / columns, 0))
+              for k in range(0, pointCount)]
+    return (des, body, des.rootComponent.xYConstructionPlane, points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run CorkHoles hole detection and Cutouts on model snapshots using the stand-in adsk modules.')
+    parser.add_argument('folder', help='Folder of model snapshots (*.json).')
+    parser.add_argument('--output', default='BatchRun.jsonl', help='File the results are written to, one JSON line for each model.')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help='Number of processes.  1 runs the models in this process.')
+    parser.add_argument('--example', type=int, default=0, help='Write this number of example snapshots to the folder instead.')
+    args = parser.parse_args()
+
+    if args.example:
+        writeExamples(args.folder, args.example)
+        return 0
+
+    filenames = sorted(glob.glob(os.path.join(args.folder, '*.json')))
+    startTime = time.perf_counter()
+    failed = 0
+    with open(args.output, 'w') as outputFile:
+        if args.processes > 1:
+            pool = multiprocessing.Pool(args.processes)
+            results = pool.imap_unordered(runModel, filenames)
+        else:
+            pool = None
+            results = map(runModel, filenames)
+
+        for result in results:
+            outputFile.write(json.dumps(result) + '\n')
+            outputFile.flush()
+            if 'error' in result:
+                failed += 1
+                print('{:<30} {}'.format(result['file'], result['error']))
+
+        if pool:
+            pool.close()
+            pool.join()
+
+    print('{} models, {} failed, in {:.2f} s.  Results written to {}'.format(len(filenames), failed, time.perf_counter() - startTime, args.output))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
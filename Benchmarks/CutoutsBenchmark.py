@@ -0,0 +1,217 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Benchmarks how the Cutouts add-in scales with the number of points.  It runs
+# outside of Fusion using the stand-in adsk modules in Common/StandIn and sweeps
+# the number of points, the shape and how densely the shapes overlap.  For each
+# case the wall time, the number of API calls and the number of entities created
+# are recorded and the results are written as JSON so runs can be compared.
+#
+# Usage:
+#     python CutoutsBenchmark.py [--counts 10 100 ...] [--output results.json]
+#                                [--compare previous.json]
+
+import os, sys, time, json, math, argparse, platform, datetime, subprocess
+
+_repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_repoDir, 'Common', 'StandIn'))
+sys.path.insert(0, _repoDir)
+
+import adsk, adsk.core, adsk.fusion
+from Cutouts import CutoutsCommand
+
+_defaultCounts = [10, 100, 1000, 10000, 50000]
+_defaultShapes = ['Square', 'Circle', 'Pentagon']
+
+# The overlap density is the size of a shape divided by the spacing of the
+# points, so values below 1 don't overlap and larger values overlap more.
+_defaultDensities = [0.5, 1.2, 2.0]
+
+# Tile sizes, as a multiple of the shape size, used for the tiled runs.
+_defaultTileSizes = [10, 40]
+
+_shapeSize = 1.0
+
+
+# Creates a new design containing a plate with a grid of construction points on
+# its top face and returns the plane, the points and the plate body.
+def createModel(count, density):
+    des = adsk.newDesign()
+    root = des.rootComponent
+    spacing = _shapeSize / density
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+
+    points = []
+    for i in range(0, count):
+        pnt = adsk.core.Point3D(i % columns * spacing, i // columns * spacing, 0)
+        points.append(adsk.fusion.ConstructionPoint(des, pnt))
+
+    body = root._addBody(adsk.core.Point3D(-_shapeSize, -_shapeSize, -1),
+                         adsk.core.Point3D(columns * spacing + _shapeSize, rows * spacing + _shapeSize, 0))
+    return (root.xYConstructionPlane, points, body)
+
+
+# Creates the command dialog using the add-in's command created handler and sets
+# the inputs as if the user had selected the plane and points.
+def createCommand(planeEnt, points, shape, tileSize):
+    cmd = adsk.core.Command(None)
+    CutoutsCommand.CutoutCommandCreatedHandler().notify(adsk.core.CommandCreatedEventArgs(command=cmd))
+
+    inputs = cmd.commandInputs
+    inputs.itemById('planeSelect')._selections.append(adsk.core.Selection(planeEnt))
+    pointInput = inputs.itemById('pointSelect')
+    for point in points:
+        pointInput._selections.append(adsk.core.Selection(point))
+    inputs.itemById('sizeSlider')._valueOne = _shapeSize
+    for item in inputs.itemById('shapeList').listItems:
+        item._isSelected = item._name == shape
+    inputs.itemById('tiledMode')._value = tileSize > 0
+    inputs.itemById('tileSize')._value = tileSize
+    return cmd
+
+
+# Returns the number of entities of each type in the design.
+def countEntities(des):
+    root = des.rootComponent
+    counts = {'sketches': root.sketches._items.__len__(), 'sketchLines': 0, 'sketchCircles': 0,
+              'sketchPoints': 0, 'profiles': 0, 'extrudeFeatures': len(root.features.extrudeFeatures._items)}
+    for sketch in root.sketches._items:
+        counts['sketchLines'] += len(sketch._sketchCurves._sketchLines._items)
+        counts['sketchCircles'] += len(sketch._sketchCurves._sketchCircles._items)
+        counts['sketchPoints'] += len(sketch._sketchPoints._items)
+        if sketch._profiles is not None:
+            counts['profiles'] += len(sketch._profiles._items)
+    counts['sketchComputes'] = adsk.callCounts['Sketch.compute']
+    return counts
+
+
+# Runs the function, returning the wall time and the API call counts.
+def measure(function, *args):
+    app = adsk.core.Application.get()
+    app.userInterface._messages = []
+    adsk.resetCallCounts()
+
+    startTime = time.perf_counter()
+    function(*args)
+    seconds = time.perf_counter() - startTime
+
+    # The add-in reports failures with a message box so treat any message as an error.
+    if app.userInterface._messages:
+        raise RuntimeError(app.userInterface._messages[0])
+
+    topCalls = dict(adsk.callCounts.most_common(10))
+    return {'seconds': seconds, 'apiCalls': adsk.totalCallCount(), 'topCalls': topCalls}
+
+
+# Fires the selection event for every point, as happens when the user moves the
+# mouse over them.
+def hoverPoints(cmd, points):
+    event = cmd.selectionEvent
+    event._activeInput = cmd.commandInputs.itemById('pointSelect')
+    for point in points:
+        event._fire(adsk.core.SelectionEventArgs(selection=adsk.core.Selection(point)))
+
+
+def runCase(count, shape, density, tileSizes):
+    results = []
+    case = {'count': count, 'shape': shape, 'density': density}
+
+    # Getting the input from the dialog.
+    (planeEnt, points, body) = createModel(count, density)
+    cmd = createCommand(planeEnt, points, shape, 0)
+    result = measure(CutoutsCommand.getInput, cmd.commandInputs)
+    result.update(case, function='getInput')
+    results.append(result)
+
+    # Hovering over the points during selection.  This doesn't depend on the shape.
+    if shape == _defaultShapes[0]:
+        result = measure(hoverPoints, cmd, points)
+        result.update(case, function='selectionEvent')
+        results.append(result)
+
+    # Creating the cutouts, with a single sketch and then tiled.
+    for tileSize in [0] + [size * _shapeSize for size in tileSizes]:
+        (planeEnt, points, body) = createModel(count, density)
+        cmd = createCommand(planeEnt, points, shape, tileSize)
+        inputs = CutoutsCommand.getInput(cmd.commandInputs)
+        result = measure(CutoutsCommand.drawGeometry, *inputs)
+        result.update(case, function='drawGeometry', tileSize=tileSize)
+        result['entities'] = countEntities(adsk.core.Application.get().activeProduct)
+        results.append(result)
+
+    return results
+
+
+def gitRevision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=_repoDir, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ''
+
+
+# Returns a key that identifies a result so it can be matched across runs.
+def resultKey(result):
+    return (result['function'], result['count'], result['shape'], result['density'], result.get('tileSize', 0))
+
+
+# Prints the change in time and API calls from a previous run.
+def compare(results, previousFilename):
+    with open(previousFilename) as previousFile:
+        previous = {resultKey(result): result for result in json.load(previousFile)['results']}
+
+    print('{:<15} {:>6} {:<9} {:>7} {:>6} {:>10} {:>10} {:>8} {:>10}'.format('function', 'count', 'shape', 'density', 'tile', 'before s', 'after s', 'speedup', 'calls'))
+    for result in results:
+        old = previous.get(resultKey(result))
+        if not old:
+            continue
+        speedup = old['seconds'] / result['seconds'] if result['seconds'] else 0
+        print('{:<15} {:>6} {:<9} {:>7} {:>6g} {:>10.4f} {:>10.4f} {:>7.2f}x {:>+10}'.format(result['function'], result['count'], result['shape'], result['density'],
+              result.get('tileSize', 0), old['seconds'], result['seconds'], speedup, result['apiCalls'] - old['apiCalls']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Cutouts add-in using the stand-in adsk modules.')
+    parser.add_argument('--counts', type=int, nargs='+', default=_defaultCounts, help='Numbers of points to test.')
+    parser.add_argument('--shapes', nargs='+', default=_defaultShapes, choices=_defaultShapes, help='Shapes to test.')
+    parser.add_argument('--densities', type=float, nargs='+', default=_defaultDensities, help='Shape size divided by point spacing.')
+    parser.add_argument('--tile-sizes', type=float, nargs='*', default=_defaultTileSizes, help='Tile sizes, as a multiple of the shape size.')
+    parser.add_argument('--output', default='CutoutsBenchmark.json', help='File the JSON results are written to.')
+    parser.add_argument('--compare', help='Results of a previous run to compare against.')
+    args = parser.parse_args()
+
+    results = []
+    for count in args.counts:
+        for shape in args.shapes:
+            for density in args.densities:
+                caseResults = runCase(count, shape, density, args.tile_sizes)
+                for result in caseResults:
+                    print('{:<15} count={:<6} shape={:<9} density={:<4} tile={:<5g} {:>9.4f} s {:>10} calls'.format(result['function'], count, shape, density,
+                          result.get('tileSize', 0), result['seconds'], result['apiCalls']))
+                results.extend(caseResults)
+
+    output = {'benchmark': 'Cutouts',
+              'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'gitRevision': gitRevision(),
+              'results': results}
+    with open(args.output, 'w') as outputFile:
+        json.dump(output, outputFile, indent=1)
+    print('Results written to ' + args.output)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
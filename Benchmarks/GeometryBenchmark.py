@@ -0,0 +1,203 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Microbenchmarks of Common/GeometryKernel.py against the code the add-ins used
+# before, which did the same math with Point3D, Vector3D and Matrix3D objects.
+# Each operation is run three ways:
+#
+#   objects - The original code using API objects.
+#   kernel  - The GeometryKernel function called once for each item.
+#   batched - The batched GeometryKernel function called once for all of the items.
+#
+# The kernel and batched times include converting the API objects to tuples.
+# The stand-in adsk objects are plain Python objects, so in Fusion, where each
+# API call goes through the C++ API, the difference is much larger.  The number
+# of API calls is reported to show that.
+#
+# Usage:
+#     python GeometryBenchmark.py [--count 10000] [--repeat 5] [--output results.json]
+
+import os, sys, time, json, math, random, argparse, platform, datetime, subprocess
+
+_repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_repoDir, 'Common', 'StandIn'))
+sys.path.insert(0, os.path.join(_repoDir, 'Common'))
+
+import adsk, adsk.core
+import GeometryKernel
+
+
+# The distance between a point and a line, as CorkHoles computed it.
+def objectsDistPointToLine(point, lineRootPoint, lineDirection):
+    dist = lineRootPoint.distanceTo(point)
+    if dist < 0.000001:
+        return 0
+    pointVec = lineRootPoint.vectorTo(point)
+    angle = lineDirection.angleTo(pointVec)
+    return dist * math.sin(angle)
+
+
+# The distance between a point and a plane, as Cutouts computed it.
+def objectsMinDistPointToPlane(point, plane):
+    temp = -(plane.origin.x * plane.normal.x + plane.origin.y * plane.normal.y + plane.origin.z * plane.normal.z)
+    return (plane.normal.x * point.x + plane.normal.y * point.y + plane.normal.z * point.z + temp) / math.sqrt(plane.normal.x ** 2 + plane.normal.y ** 2 + plane.normal.z ** 2)
+
+
+# The end point of a normal, as GeometryEval computed it.
+def objectsNormalEnd(point, normal, length):
+    pnt1 = adsk.core.Point3D.cast(point)
+    pnt2 = pnt1.copy()
+    normal = adsk.core.Vector3D.cast(normal).copy()
+    normal.scaleBy(length)
+    pnt2.translateBy(normal)
+    return pnt2
+
+
+# The matrix that positions a cork, as CorkHoles computed it.
+def objectsCorkMatrix(center, xDir, zDir):
+    xDir = xDir.copy()
+    zDir = zDir.copy()
+    yDir = zDir.crossProduct(xDir)
+    xDir.normalize()
+    yDir.normalize()
+    zDir.normalize()
+    transMatrix = adsk.core.Matrix3D.create()
+    transMatrix.setWithCoordinateSystem(center, xDir, yDir, zDir)
+    return transMatrix
+
+
+def randomPoints(count):
+    return [adsk.core.Point3D.create(random.uniform(-10, 10), random.uniform(-10, 10), random.uniform(-10, 10)) for i in range(0, count)]
+
+
+def randomVectors(count):
+    vectors = []
+    for i in range(0, count):
+        vector = adsk.core.Vector3D.create(random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(-1, 1) + 2)
+        vector.normalize()
+        vectors.append(vector)
+    return vectors
+
+
+# Returns the functions that run each way of doing each operation on the count
+# items.  Each returns a list of floats so the results can be compared.
+def operations(count):
+    points = randomPoints(count)
+    vectors = randomVectors(count)
+    lineOrigin = adsk.core.Point3D.create(1, 2, 3)
+    lineDirection = adsk.core.Vector3D.create(0.3, -0.2, 0.9)
+    plane = adsk.core.Plane.create(adsk.core.Point3D.create(1, 2, 3), adsk.core.Vector3D.create(0.3, -0.2, 0.9))
+    length = 2.0
+
+    def toPoint(point):
+        return GeometryKernel.fromAPI(point)
+
+    def flatten(items):
+        return [value for item in items for value in item]
+
+    def lineKernel():
+        line = GeometryKernel.line(toPoint(lineOrigin), toPoint(lineDirection))
+        return [GeometryKernel.distanceToLine(toPoint(point), line) for point in points]
+
+    def lineBatched():
+        line = GeometryKernel.line(toPoint(lineOrigin), toPoint(lineDirection))
+        return GeometryKernel.distancesToLine([toPoint(point) for point in points], line)
+
+    def planeKernel():
+        planeEq = GeometryKernel.planeFromAPI(plane)
+        return [GeometryKernel.distanceToPlane(toPoint(point), planeEq) for point in points]
+
+    def planeBatched():
+        return GeometryKernel.distancesToPlane([toPoint(point) for point in points], GeometryKernel.planeFromAPI(plane))
+
+    def normalKernel():
+        return flatten(GeometryKernel.offsetPoint(toPoint(point), toPoint(normal), length) for (point, normal) in zip(points, vectors))
+
+    def normalBatched():
+        return flatten(GeometryKernel.offsetPoints([toPoint(point) for point in points], [toPoint(normal) for normal in vectors], length))
+
+    def matrixKernel():
+        zDir = GeometryKernel.normalize(toPoint(lineDirection))
+        results = []
+        for (center, normal) in zip(points, vectors):
+            xDir = GeometryKernel.normalize(toPoint(normal))
+            yDir = GeometryKernel.normalize(GeometryKernel.cross(zDir, xDir))
+            results.extend(GeometryKernel.coordinateSystem(toPoint(center), xDir, yDir, zDir))
+        return results
+
+    return {'distanceToLine': {'objects': lambda: [objectsDistPointToLine(point, lineOrigin, lineDirection) for point in points],
+                               'kernel': lineKernel, 'batched': lineBatched},
+            'distanceToPlane': {'objects': lambda: [objectsMinDistPointToPlane(point, plane) for point in points],
+                                'kernel': planeKernel, 'batched': planeBatched},
+            'normalEnd': {'objects': lambda: flatten(objectsNormalEnd(point, normal, length).asArray() for (point, normal) in zip(points, vectors)),
+                          'kernel': normalKernel, 'batched': normalBatched},
+            'corkMatrix': {'objects': lambda: flatten(objectsCorkMatrix(center, normal, lineDirection).asArray() for (center, normal) in zip(points, vectors)),
+                           'kernel': matrixKernel}}
+
+
+# Runs the function the number of times and returns the fastest time, the API
+# calls of one run and the results.
+def measure(function, repeat):
+    times = []
+    for i in range(0, repeat):
+        adsk.resetCallCounts()
+        startTime = time.perf_counter()
+        values = function()
+        times.append(time.perf_counter() - startTime)
+    return (min(times), adsk.totalCallCount(), values)
+
+
+def gitRevision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=_repoDir, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark GeometryKernel against API object math using the stand-in adsk modules.')
+    parser.add_argument('--count', type=int, default=10000, help='Number of items in each run.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs.  The fastest is reported.')
+    parser.add_argument('--output', default='GeometryBenchmark.json', help='File the JSON results are written to.')
+    args = parser.parse_args()
+
+    random.seed(1)
+    adsk.newDesign()
+
+    results = []
+    print('{:<16} {:<8} {:>10} {:>10} {:>8} {:>12}'.format('operation', 'method', 'ms', 'calls', 'speedup', 'max error'))
+    for (name, methods) in operations(args.count).items():
+        (objectSeconds, calls, objectValues) = measure(methods['objects'], args.repeat)
+        for (method, function) in methods.items():
+            if method == 'objects':
+                (seconds, values) = (objectSeconds, objectValues)
+            else:
+                (seconds, calls, values) = measure(function, args.repeat)
+            maxError = max(abs(a - b) for (a, b) in zip(values, objectValues))
+            speedup = objectSeconds / seconds if seconds else 0
+            results.append({'operation': name, 'method': method, 'count': args.count, 'seconds': seconds,
+                            'apiCalls': calls, 'speedup': speedup, 'maxError': maxError})
+            print('{:<16} {:<8} {:>10.2f} {:>10} {:>7.2f}x {:>12.2e}'.format(name, method, seconds * 1000, calls, speedup, maxError))
+
+    output = {'benchmark': 'Geometry',
+              'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'gitRevision': gitRevision(),
+              'results': results}
+    with open(args.output, 'w') as outputFile:
+        json.dump(output, outputFile, indent=1)
+    print('Results written to ' + args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Replays traces recorded by Common/ApiTrace.py in Fusion.  The function that
+# was recorded is run using the current code of the add-in and the stand-in adsk
+# modules, with each API call answered from the trace.  For each trace the time
+# is reported, along with the time recorded in Fusion, the number of API calls
+# answered from the trace and whether the result is the same as the recorded
+# one.  The --profile option runs the replays under cProfile.
+#
+# Usage:
+#     python ReplayTrace.py trace.gz [trace.gz ...] [--repeat 5] [--profile]
+#                           [--sort cumulative] [--output results.json]
+
+import os, sys, time, json, argparse, platform, datetime, subprocess, importlib, cProfile, pstats
+
+_repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_repoDir, 'Common', 'StandIn'))
+sys.path.insert(0, os.path.join(_repoDir, 'Common'))
+sys.path.insert(0, _repoDir)
+
+import adsk, adsk.core, adsk.fusion
+import ApiTrace, EntityCache
+
+
+# Returns the module and the function of the add-in that was recorded.  Fusion
+# can give the add-in package a longer name, so only the add-in folder and the
+# module names are used if the full name isn't found.
+def findFunction(trace):
+    moduleName = trace['module']
+    try:
+        module = importlib.import_module(moduleName)
+    except ImportError:
+        module = importlib.import_module('.'.join(moduleName.split('.')[-2:]))
+
+    function = module
+    for name in trace['function'].split('.'):
+        function = getattr(function, name)
+    return (module, function)
+
+
+# Replays the trace the number of times and returns the fastest replay.
+def replayTrace(trace, module, function, repeat, profiler):
+    # Start the module the same way LazyCommand does when it's first used.
+    adsk.newDesign()
+    if hasattr(module, 'start'):
+        module.start()
+
+    try:
+        fastest = None
+        for i in range(0, repeat):
+            EntityCache.clear()
+            if profiler:
+                profiler.enable()
+            try:
+                replay = ApiTrace.replay(trace, function)
+            finally:
+                if profiler:
+                    profiler.disable()
+            if fastest is None or replay.seconds < fastest.seconds:
+                fastest = replay
+    finally:
+        if hasattr(module, 'stop'):
+            module.stop()
+    return fastest
+
+
+def gitRevision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=_repoDir, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay API traces recorded in Fusion using the stand-in adsk modules.')
+    parser.add_argument('traces', nargs='+', help='Trace files written by ApiTrace.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of replays of each trace.  The fastest is reported.')
+    parser.add_argument('--profile', action='store_true', help='Run the replays under cProfile and print the statistics.')
+    parser.add_argument('--sort', default='cumulative', help='Sort order of the profile statistics.')
+    parser.add_argument('--output', default='', help='File the JSON results are written to.')
+    args = parser.parse_args()
+
+    profiler = cProfile.Profile() if args.profile else None
+    results = []
+    failed = False
+    print('{:<40} {:>10} {:>10} {:>8} {:>8} {:>7}'.format('function', 'ms', 'fusion ms', 'calls', 'missing', 'match'))
+    for filename in args.traces:
+        trace = ApiTrace.load(filename)
+        (module, function) = findFunction(trace)
+        name = '{}.{}'.format(trace['module'].split('.')[-1], trace['function'])
+        try:
+            replay = replayTrace(trace, module, function, args.repeat, profiler)
+        except ApiTrace.TraceMissingError as ex:
+            failed = True
+            print('{:<40} {}'.format(name, ex))
+            results.append({'trace': filename, 'function': name, 'error': str(ex)})
+            continue
+
+        failed = failed or not replay.resultMatches
+        results.append({'trace': filename, 'function': name, 'seconds': replay.seconds, 'recordedSeconds': trace['seconds'],
+                        'apiCalls': replay.served, 'missing': len(replay.missing), 'resultMatches': replay.resultMatches})
+        print('{:<40} {:>10.2f} {:>10.2f} {:>8} {:>8} {:>7}'.format(name, replay.seconds * 1000, trace['seconds'] * 1000,
+                                                                    replay.served, len(replay.missing), 'yes' if replay.resultMatches else 'no'))
+
+    if profiler:
+        pstats.Stats(profiler).strip_dirs().sort_stats(args.sort).print_stats(30)
+
+    if args.output:
+        output = {'benchmark': 'ReplayTrace',
+                  'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+                  'python': platform.python_version(),
+                  'platform': platform.platform(),
+                  'gitRevision': gitRevision(),
+                  'repeat': args.repeat,
+                  'results': results}
+        with open(args.output, 'w') as outputFile:
+            json.dump(output, outputFile, indent=1)
+        print('Results written to ' + args.output)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Reports how many milliseconds each add-in adds to the time Fusion takes to
+# start, using the stand-in adsk modules in Common/StandIn.  The time is the
+# import of the add-in's main module plus its run function.  Each add-in is
+# loaded in two ways:
+#
+#   eager - The command module is imported along with the main module, as the
+#           add-ins did before the commands were loaded by LazyCommand.
+#   lazy  - Only the main module is imported.  The command module is imported
+#           the first time the command is run.
+#
+# The time of running the first command, which is when the lazy add-ins pay for
+# the import, is also reported.  Every measurement is made in a new Python
+# process so nothing has already been imported.
+#
+# Usage:
+#     python StartupBenchmark.py [--addins Cutouts ...] [--repeat 5] [--output results.json]
+
+import os, sys, time, json, argparse, platform, datetime, subprocess, importlib, statistics
+
+_repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_defaultAddIns = ['CorkHoles', 'Cutouts', 'GeometryEval', 'PointAtCoord', 'ShowProxy']
+_modes = ['eager', 'lazy']
+
+
+# Loads the add-in in this process and returns the times in milliseconds.  This
+# is run in a child process for each measurement.
+def measureStartup(addIn, mode):
+    sys.path.insert(0, os.path.join(_repoDir, 'Common', 'StandIn'))
+    sys.path.insert(0, _repoDir)
+
+    # The adsk modules are part of Fusion and are already loaded when the add-ins start.
+    import adsk, adsk.core, adsk.fusion
+    adsk.newDesign()
+    ui = adsk.core.Application.get().userInterface
+    existingIds = set(definition.id for definition in ui.commandDefinitions)
+
+    startTime = time.perf_counter()
+    module = importlib.import_module('{0}.{0}'.format(addIn))
+    if mode == 'eager':
+        importlib.import_module('{0}.{0}Command'.format(addIn))
+    importTime = time.perf_counter() - startTime
+    module.run(None)
+    startupTime = time.perf_counter() - startTime
+
+    # Create the first command the add-in added, as happens when the user clicks its button.
+    definition = [definition for definition in ui.commandDefinitions if definition.id not in existingIds][0]
+    startTime = time.perf_counter()
+    definition.commandCreated._fire(adsk.core.CommandCreatedEventArgs(command=adsk.core.Command(definition)))
+    firstCommandTime = time.perf_counter() - startTime
+
+    if ui._messages:
+        raise RuntimeError(ui._messages[0])
+
+    module.stop(None)
+    return {'importMs': importTime * 1000, 'startupMs': startupTime * 1000, 'firstCommandMs': firstCommandTime * 1000,
+            'modules': len(sys.modules)}
+
+
+# Runs the measurement in a new Python process and returns the result.
+def runChild(addIn, mode):
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', addIn, mode])
+    return json.loads(output.decode().splitlines()[-1])
+
+
+def gitRevision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=_repoDir, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the startup time of the add-ins using the stand-in adsk modules.')
+    parser.add_argument('--addins', nargs='+', default=_defaultAddIns, choices=_defaultAddIns, help='Add-ins to measure.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of times to load each add-in.  The median is reported.')
+    parser.add_argument('--output', default='StartupBenchmark.json', help='File the JSON results are written to.')
+    parser.add_argument('--child', nargs=2, metavar=('ADDIN', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measureStartup(*args.child)))
+        return
+
+    results = []
+    for addIn in args.addins:
+        for mode in _modes:
+            runs = [runChild(addIn, mode) for i in range(0, args.repeat)]
+            result = {'addIn': addIn, 'mode': mode, 'modules': runs[0]['modules']}
+            for key in ('importMs', 'startupMs', 'firstCommandMs'):
+                result[key] = statistics.median(run[key] for run in runs)
+            results.append(result)
+
+    print('{:<13} {:>12} {:>12} {:>8} {:>15} {:>15}'.format('add-in', 'eager ms', 'lazy ms', 'saved', 'eager 1st cmd', 'lazy 1st cmd'))
+    totals = {mode: 0.0 for mode in _modes}
+    for addIn in args.addins:
+        (eager, lazy) = [result for result in results if result['addIn'] == addIn]
+        totals['eager'] += eager['startupMs']
+        totals['lazy'] += lazy['startupMs']
+        saved = 1 - lazy['startupMs'] / eager['startupMs'] if eager['startupMs'] else 0
+        print('{:<13} {:>12.2f} {:>12.2f} {:>7.0%} {:>15.2f} {:>15.2f}'.format(addIn, eager['startupMs'], lazy['startupMs'], saved,
+              eager['firstCommandMs'], lazy['firstCommandMs']))
+    print('{:<13} {:>12.2f} {:>12.2f}'.format('total', totals['eager'], totals['lazy']))
+
+    output = {'benchmark': 'Startup',
+              'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'gitRevision': gitRevision(),
+              'repeat': args.repeat,
+              'results': results}
+    with open(args.output, 'w') as outputFile:
+        json.dump(output, outputFile, indent=1)
+    print('Results written to ' + args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,544 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Records the calls a function makes to the Fusion API so the function can be
+# run again later, outside of Fusion, against the results that were recorded.
+# This makes it possible to profile the add-ins on the models that are slow
+# without needing Fusion or the model.
+#
+# While a function is recorded, the API objects passed to it, and every API
+# object it gets from them, are wrapped in proxies that write each property,
+# method call and result to the trace.  The static functions of the API
+# classes, like Application.get and the cast functions, are also recorded.
+# Points, vectors and matrices are written by value and the function uses
+# them directly.  The trace is written as gzipped JSON.
+#
+# Recording is off by default.  The add-ins call their expensive functions
+# using ApiTrace.call, which only records when a trace folder has been set by
+# the FUSION_API_TRACE environment variable or by running this in the Python
+# console of the Text Commands window:
+#     import ApiTrace; ApiTrace.enable('C:/Temp/Traces')
+#
+# A trace is replayed by replay, which is used by Benchmarks/ReplayTrace.py.
+# It's run using the stand-in adsk modules.  Each API call is answered with the
+# result recorded for the same object, member and arguments, so the function
+# can be changed, as long as it doesn't need results that weren't recorded.
+
+import adsk, adsk.core
+import collections, datetime, gzip, inspect, json, math, os, sys, time, traceback
+
+traceFormat = 1
+
+# The folder traces are written to.  Nothing is recorded when it's empty.
+traceFolder = os.environ.get('FUSION_API_TRACE', '')
+
+# The API classes whose objects are recorded by value.
+_valueTypes = {'Point2D': 2, 'Point3D': 3, 'Vector3D': 3, 'Matrix3D': 16}
+
+_apiModules = ('adsk.core', 'adsk.fusion', 'adsk.cam')
+
+# The recorder that's recording, if any.
+_recorder = None
+
+
+class TraceMissingError(Exception):
+    pass
+
+
+def enable(folder):
+    global traceFolder
+    os.makedirs(folder, exist_ok=True)
+    traceFolder = folder
+
+
+def disable():
+    global traceFolder
+    traceFolder = ''
+
+
+# Calls the function and returns its result.  When tracing is enabled, the call
+# is recorded to a new file in the trace folder.
+def call(function, *args):
+    if not traceFolder or _recorder:
+        return function(*args)
+
+    name = '{}.{}'.format(function.__module__, function.__qualname__)
+    filename = os.path.join(traceFolder, '{}-{}.trace.gz'.format(name, datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')))
+    return record(filename, function, *args)
+
+
+# Calls the function, recording the API calls it makes to the file, and returns
+# its result.
+def record(filename, function, *args):
+    global _recorder
+    recorder = _Recorder()
+    _recorder = recorder
+    recorder.patchStatics()
+    error = None
+    try:
+        wrappedArgs = recorder.wrap(args)
+        startTime = time.perf_counter()
+        try:
+            result = function(*wrappedArgs)
+        except Exception:
+            error = traceback.format_exc()
+            result = None
+        seconds = time.perf_counter() - startTime
+    finally:
+        recorder.unpatchStatics()
+        _recorder = None
+
+    trace = {'format': traceFormat,
+             'module': function.__module__,
+             'function': function.__qualname__,
+             'time': datetime.datetime.now().isoformat(timespec='seconds'),
+             'seconds': seconds,
+             'args': _serialize(wrappedArgs),
+             'result': _serialize(result),
+             'error': error,
+             'enums': _enumConstants(),
+             'events': recorder.events}
+    with gzip.open(filename, 'wt', encoding='utf-8') as traceFile:
+        json.dump(trace, traceFile, separators=(',', ':'))
+
+    if error:
+        raise RuntimeError('The traced function failed:\n' + error)
+    return _unwrap(result)
+
+
+def load(filename):
+    with gzip.open(filename, 'rt', encoding='utf-8') as traceFile:
+        trace = json.load(traceFile)
+    if trace.get('format') != traceFormat:
+        raise ValueError('{} is not a version {} trace.'.format(filename, traceFormat))
+    return trace
+
+
+# Calls the function with the arguments of the trace, answering its API calls
+# with the recorded results.  It should be run using the stand-in adsk modules.
+# Returns a Replay with the result and statistics of the run.
+def replay(trace, function):
+    replayer = _Replayer(trace)
+    replayer.patchStatics()
+    try:
+        args = replayer.deserialize(trace['args'])
+        startTime = time.perf_counter()
+        result = function(*args)
+        replayer.seconds = time.perf_counter() - startTime
+    finally:
+        replayer.unpatchStatics()
+
+    replayer.result = result
+    replayer.resultMatches = _isClose(_serialize(result), trace['result'])
+    return replayer
+
+
+# Returns whether the object is one of the API objects that's recorded by value.
+def _isValue(value):
+    valueType = type(value)
+    return valueType.__name__ in _valueTypes and valueType.__module__.startswith('adsk.')
+
+
+def _isAPIObject(value):
+    return type(value).__module__ in _apiModules
+
+
+# Returns the value converted to JSON values.  Proxies are written as references.
+def _serialize(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, (_RecordingProxy, _ReplayObject)):
+        return {'r': value._id}
+    elif isinstance(value, list):
+        return [_serialize(item) for item in value]
+    elif isinstance(value, tuple):
+        return {'t': [_serialize(item) for item in value]}
+    elif _isValue(value):
+        return {'v': type(value).__name__, 'a': list(value.asArray())}
+    elif _isAPIObject(value):
+        return {'o': type(value).__name__}
+    else:
+        return {'s': repr(value)}
+
+
+def _unwrap(value):
+    if isinstance(value, _RecordingProxy):
+        return value._object
+    elif isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    elif isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    return value
+
+
+# Returns a serialized value as a hashable value so it can be used as a key.
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    elif isinstance(value, dict):
+        return tuple((key, _freeze(value[key])) for key in sorted(value))
+    return value
+
+
+# Compares serialized values, allowing for rounding differences in the numbers.
+def _isClose(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        return isinstance(a, (int, float)) and isinstance(b, (int, float)) and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    elif isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(_isClose(x, y) for (x, y) in zip(a, b))
+    elif isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(_isClose(a[key], b[key]) for key in a)
+    return a == b
+
+
+# Returns the constants of the enumeration classes in the API modules, like
+# Curve3DTypes, so they can be added to the stand-in when it's missing them.
+def _enumConstants():
+    enums = {}
+    for moduleName in _apiModules:
+        module = sys.modules.get(moduleName)
+        if not module:
+            continue
+        for (className, cls) in vars(module).items():
+            if not inspect.isclass(cls):
+                continue
+            constants = {name: value for (name, value) in vars(cls).items() if not name.startswith('_')}
+            if constants and all(type(value) is int for value in constants.values()):
+                enums['{}.{}'.format(moduleName, className)] = constants
+    return enums
+
+
+# Returns the static functions of the classes in the API modules as a list of
+# (class, name, descriptor) tuples.
+def _staticFunctions():
+    functions = []
+    for moduleName in _apiModules:
+        module = sys.modules.get(moduleName)
+        if not module:
+            continue
+        for cls in list(vars(module).values()):
+            if inspect.isclass(cls) and cls.__module__ == moduleName:
+                for (name, descriptor) in list(vars(cls).items()):
+                    if isinstance(descriptor, (staticmethod, classmethod)) and not name.startswith('_'):
+                        functions.append((cls, name, descriptor))
+    return functions
+
+
+def _staticName(cls, name):
+    return '{}.{}.{}'.format(cls.__module__, cls.__name__, name)
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+        self.nextId = 1
+        self.patched = []
+
+    def wrap(self, value):
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        elif isinstance(value, tuple):
+            return tuple(self.wrap(item) for item in value)
+        elif _isAPIObject(value) and not _isValue(value):
+            proxy = _RecordingProxy(self, value, self.nextId)
+            self.nextId += 1
+            return proxy
+        return value
+
+    # Calls the function with the unwrapped arguments, records the call and
+    # returns the result wrapped in proxies.  After recording has finished, the
+    # call is passed straight to the API.
+    def invoke(self, kind, objectId, name, args, function):
+        if _recorder is not self:
+            return function(*_unwrap(args))
+
+        try:
+            result = self.wrap(function(*_unwrap(args)))
+        except Exception as ex:
+            self.events.append([kind, objectId, name, _serialize(args), {'e': str(ex)}])
+            raise
+        self.events.append([kind, objectId, name, _serialize(args), _serialize(result)])
+        return result
+
+    # Replaces the static functions of the API classes with ones that record
+    # their calls.  Calls that create a point, vector or matrix from numbers
+    # aren't recorded because they'll work the same using the stand-in.
+    def patchStatics(self):
+        for (cls, name, descriptor) in _staticFunctions():
+            self.patched.append((cls, name, descriptor))
+            if isinstance(descriptor, classmethod):
+                setattr(cls, name, classmethod(self._recordStatic(name, descriptor.__func__, True)))
+            else:
+                setattr(cls, name, staticmethod(self._recordStatic(_staticName(cls, name), descriptor.__func__, False)))
+
+    def unpatchStatics(self):
+        for (cls, name, descriptor) in reversed(self.patched):
+            setattr(cls, name, descriptor)
+        self.patched = []
+
+    # Returns a function that records the calls of the static function.  Class
+    # methods, which are inherited, are recorded using the class they're called on.
+    def _recordStatic(self, name, function, isClassMethod):
+        def recordedStatic(*args):
+            if isClassMethod:
+                (cls, args) = (args[0], args[1:])
+                staticName = _staticName(cls, name)
+                call = lambda *args: function(cls, *args)
+            else:
+                (staticName, call) = (name, function)
+
+            if _recorder is not self:
+                return call(*_unwrap(args))
+            if not any(isinstance(arg, _RecordingProxy) for arg in args):
+                result = call(*args)
+                if _isValue(result):
+                    return result
+                result = self.wrap(result)
+                self.events.append(['static', 0, staticName, _serialize(args), _serialize(result)])
+                return result
+            return self.invoke('static', 0, staticName, args, call)
+        return recordedStatic
+
+
+# Wraps an API object while it's being recorded.
+class _RecordingProxy:
+    __slots__ = ('_recorder', '_object', '_id')
+
+    def __init__(self, recorder, obj, objectId):
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_object', obj)
+        object.__setattr__(self, '_id', objectId)
+
+    def __getattr__(self, name):
+        obj = self._object
+        if isinstance(inspect.getattr_static(type(obj), name, None), property):
+            return self._recorder.invoke('get', self._id, name, (), lambda: getattr(obj, name))
+
+        method = getattr(obj, name)
+        if not callable(method):
+            return self._recorder.invoke('get', self._id, name, (), lambda: method)
+        return lambda *args: self._recorder.invoke('call', self._id, name, args, method)
+
+    def __setattr__(self, name, value):
+        obj = self._object
+        self._recorder.invoke('set', self._id, name, (value,), lambda value: setattr(obj, name, value))
+
+    def __iter__(self):
+        obj = self._object
+        return iter(self._recorder.invoke('iter', self._id, '', (), lambda: list(obj)))
+
+    def __len__(self):
+        obj = self._object
+        return self._recorder.invoke('len', self._id, '', (), lambda: len(obj))
+
+    def __getitem__(self, index):
+        obj = self._object
+        return self._recorder.invoke('item', self._id, '', (index,), lambda index: obj[index])
+
+    def __eq__(self, other):
+        obj = self._object
+        return self._recorder.invoke('eq', self._id, '', (other,), lambda other: obj == other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def __bool__(self):
+        return True
+
+
+class _Replayer:
+    def __init__(self, trace):
+        self.objects = {}
+        self.patched = []
+        self.enums = trace.get('enums', {})
+        self.statics = set()
+        self.served = 0
+        self.missing = []
+        self.seconds = 0.0
+        self.result = None
+        self.resultMatches = False
+
+        # The recorded calls of each member of each object, in the order they
+        # were made, as lists of [args, result, used].  The calls are also
+        # indexed by their exact arguments.
+        self.calls = collections.defaultdict(list)
+        self.exactCalls = collections.defaultdict(collections.deque)
+        for (kind, objectId, name, args, result) in trace['events']:
+            calls = self.calls[(kind, objectId, name)]
+            self.exactCalls[(kind, objectId, name, _freeze(args))].append(len(calls))
+            calls.append([args, result, False])
+            if kind == 'static':
+                self.statics.add(name)
+
+    def has(self, kind, objectId, name):
+        return (kind, objectId, name) in self.calls
+
+    # Returns the recorded result of the call.  The first unused call with the
+    # same arguments is used, or the last one when they've all been used.  When
+    # there isn't a call with exactly the same arguments, one with arguments
+    # that only differ by rounding is used.  Otherwise, if every recorded call
+    # of the member had the same result, like writing a message that includes
+    # a time, that result is used.
+    def serve(self, kind, objectId, name, args):
+        calls = self.calls.get((kind, objectId, name))
+        serializedArgs = _serialize(args)
+        call = None
+        if calls:
+            indices = self.exactCalls.get((kind, objectId, name, _freeze(serializedArgs)))
+            if indices:
+                call = calls[indices.popleft() if len(indices) > 1 else indices[0]]
+            else:
+                similar = [call for call in calls if _isClose(call[0], serializedArgs)]
+                unused = [call for call in similar if not call[2]]
+                call = unused[0] if unused else similar[-1] if similar else None
+                if call is None and all(other[1] == calls[0][1] for other in calls):
+                    call = calls[-1]
+
+        if call is None:
+            self.missing.append([kind, objectId, name, serializedArgs])
+            raise TraceMissingError('The trace has no result for {} {} of object {} with {}.'.format(kind, name, objectId, json.dumps(serializedArgs)))
+
+        call[2] = True
+        self.served += 1
+        return self.deserialize(call[1])
+
+    def deserialize(self, value):
+        if isinstance(value, list):
+            return [self.deserialize(item) for item in value]
+        elif not isinstance(value, dict):
+            return value
+        elif 'r' in value:
+            obj = self.objects.get(value['r'])
+            if obj is None:
+                obj = _ReplayObject(self, value['r'])
+                self.objects[value['r']] = obj
+            return obj
+        elif 't' in value:
+            return tuple(self.deserialize(item) for item in value['t'])
+        elif 'v' in value:
+            return _createValue(value['v'], value['a'])
+        elif 'e' in value:
+            raise RuntimeError(value['e'])
+        return None
+
+    # Replaces the static functions of the stand-in classes that were recorded
+    # with ones that return the recorded results, and adds the enumerations and
+    # classes the stand-in doesn't have.
+    def patchStatics(self):
+        for (fullName, constants) in self.enums.items():
+            cls = self._standInClass(fullName)
+            for (name, value) in constants.items():
+                if name not in vars(cls):
+                    self._setAttribute(cls, name, value)
+
+        for staticName in self.statics:
+            (className, name) = staticName.rsplit('.', 1)
+            cls = self._standInClass(className)
+            self._setAttribute(cls, name, staticmethod(self._replayStatic(staticName, getattr(cls, name, None))))
+
+    def unpatchStatics(self):
+        for (owner, name, descriptor, existed) in reversed(self.patched):
+            if existed:
+                setattr(owner, name, descriptor)
+            else:
+                delattr(owner, name)
+        self.patched = []
+
+    def _setAttribute(self, owner, name, value):
+        self.patched.append((owner, name, vars(owner).get(name), name in vars(owner)))
+        setattr(owner, name, value)
+
+    # Returns the stand-in class with the full name, adding an empty class if
+    # the stand-in doesn't have it.
+    def _standInClass(self, fullName):
+        (moduleName, className) = fullName.rsplit('.', 1)
+        module = sys.modules.get(moduleName)
+        if module is None:
+            module = __import__(moduleName, fromlist=['_'])
+        cls = getattr(module, className, None)
+        if cls is None:
+            cls = type(className, (), {'__module__': moduleName})
+            self._setAttribute(module, className, cls)
+        return cls
+
+    def _replayStatic(self, staticName, original):
+        def replayedStatic(*args):
+            if original is not None and not any(isinstance(arg, _ReplayObject) for arg in args):
+                key = ('static', 0, staticName, _freeze(_serialize(args)))
+                if key not in self.exactCalls:
+                    return original(*args)
+            return self.serve('static', 0, staticName, args)
+        return replayedStatic
+
+
+# Returns the stand-in object for a value that was recorded.
+def _createValue(typeName, values):
+    if typeName == 'Matrix3D':
+        matrix = adsk.core.Matrix3D.create()
+        matrix.setWithArray(values)
+        return matrix
+    return getattr(adsk.core, typeName).create(*values)
+
+
+# Stands in for an API object that was recorded.
+class _ReplayObject:
+    __slots__ = ('_replayer', '_id', '_attributes')
+
+    def __init__(self, replayer, objectId):
+        object.__setattr__(self, '_replayer', replayer)
+        object.__setattr__(self, '_id', objectId)
+        object.__setattr__(self, '_attributes', {})
+
+    def __getattr__(self, name):
+        if name in self._attributes:
+            return self._attributes[name]
+
+        replayer = self._replayer
+        if replayer.has('get', self._id, name):
+            return replayer.serve('get', self._id, name, ())
+        elif replayer.has('call', self._id, name):
+            return lambda *args: replayer.serve('call', self._id, name, args)
+
+        replayer.missing.append(['get', self._id, name, []])
+        raise TraceMissingError('The trace has nothing for {} of object {}.'.format(name, self._id))
+
+    # Properties that are set return the new value from then on.
+    def __setattr__(self, name, value):
+        self._attributes[name] = value
+        if self._replayer.has('set', self._id, name):
+            self._replayer.serve('set', self._id, name, (value,))
+
+    def __iter__(self):
+        return iter(self._replayer.serve('iter', self._id, '', ()))
+
+    def __len__(self):
+        return self._replayer.serve('len', self._id, '', ())
+
+    def __getitem__(self, index):
+        return self._replayer.serve('item', self._id, '', (index,))
+
+    def __eq__(self, other):
+        if isinstance(other, _ReplayObject) and other._id == self._id:
+            return True
+        return self._replayer.serve('eq', self._id, '', (other,))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def __bool__(self):
+        return True
@@ -0,0 +1,245 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# A cache, shared by the add-ins, of values computed from entities like faces,
+# bodies and occurrences.  Values are stored by the add-in that owns them, the
+# entity token of the entity and a key for the kind of value.  Each value is
+# also stored with the version of the model it was computed from, and is only
+# returned while the model is still at that version.
+#
+# Fusion doesn't guarantee that two entity tokens for the same entity are the
+# same string, so an entity can be looked up with a token that's different from
+# the one its value was stored with.  That's a miss and the value is computed
+# again, which is correct but slower, and the new value is stored as well until
+# one of them is the least recently used.  The duplicates counter of each owner
+# counts the values that were stored when an equal value was already cached for
+# another token with the same key, which is most likely this.
+#
+# The version changes whenever a command finishes, because it could have changed
+# the geometry.  Fusion doesn't have an event for changes to the timeline so this
+# is how they're detected.  Commands that can't change existing geometry, like
+# the add-in commands that only display information, can be registered so they
+# don't change the version.  Changing the version doesn't touch the cached values.
+# Old values are removed when they're looked up or when they're the least
+# recently used.  Everything is removed when another document is activated or
+# a document is closed.
+#
+# The cache is limited to a memory budget.  When it's over budget the least
+# recently used values are removed.  The size of each value is estimated from
+# the size of the Python objects unless it's given when the value is stored.
+#
+# Typical use by an add-in is:
+#     EntityCache.register('GeometryEval', ['ekinsGeometrySample'])
+#     points = EntityCache.getOrCompute('GeometryEval', face, density, lambda: evaluate(face, density))
+#     EntityCache.release('GeometryEval')
+
+import adsk.core
+import collections, sys
+import HandlerRegistry
+
+# The default memory budget in bytes.
+defaultMaxBytes = 32 * 1024 * 1024
+
+# The cached values, least recently used first.  Each is keyed by (owner, token, key)
+# and is a list of [version, value, size, fingerprint].
+_entries = collections.OrderedDict()
+
+# The key of the entry of each value, keyed by (owner, key, fingerprint of the value),
+# used to count the values stored again for a different token.
+_fingerprints = {}
+_totalBytes = 0
+_maxBytes = defaultMaxBytes
+
+_modelVersion = 0
+
+# The ids of the commands that don't change the model version.  The Select
+# command finishes every time the selection changes.
+_readOnlyCommands = {'SelectCommand'}
+
+# The counters of each owner that's registered.
+_owners = {}
+
+# Used by getOrCompute to tell a missing value from a cached None.
+_missing = object()
+
+
+# CommandTerminated event handler class that changes the model version.
+class _CommandTerminatedHandler(adsk.core.ApplicationCommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        global _modelVersion
+        eventArgs = adsk.core.ApplicationCommandEventArgs.cast(args)
+        if eventArgs.commandId not in _readOnlyCommands:
+            _modelVersion += 1
+
+
+# DocumentActivated and DocumentClosed event handler class that removes
+# everything because the entities belong to a different document.
+class _DocumentEventHandler(adsk.core.DocumentEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        clear()
+
+
+# Starts using the cache for the owner.  The commands of the owner that don't
+# change any existing geometry can be given so they don't invalidate the cache.
+def register(owner, readOnlyCommands=()):
+    if not _owners:
+        app = adsk.core.Application.get()
+        HandlerRegistry.addHandler('EntityCache', app.userInterface.commandTerminated, _CommandTerminatedHandler())
+        HandlerRegistry.addHandler('EntityCache', app.documentActivated, _DocumentEventHandler())
+        HandlerRegistry.addHandler('EntityCache', app.documentClosed, _DocumentEventHandler())
+
+    _owners.setdefault(owner, {'hits': 0, 'misses': 0, 'stale': 0, 'duplicates': 0, 'evictions': 0})
+    _readOnlyCommands.update(readOnlyCommands)
+
+
+# Removes the values of the owner.  The events are disconnected when no owners are left.
+def release(owner):
+    if _owners.pop(owner, None) is None:
+        return
+
+    for entryKey in [entryKey for entryKey in _entries if entryKey[0] == owner]:
+        _remove(entryKey)
+
+    if not _owners:
+        HandlerRegistry.releaseHandlers('EntityCache')
+
+
+# Returns the value the owner stored for the entity token and key, or the
+# default if there isn't one for the current model version or the owner isn't
+# registered.
+def get(owner, token, key=None, default=None):
+    counters = _owners.get(owner)
+    if counters is None:
+        return default
+
+    entryKey = (owner, token, key)
+    entry = _entries.get(entryKey)
+    if entry is None:
+        counters['misses'] += 1
+        return default
+
+    if entry[0] != _modelVersion:
+        counters['misses'] += 1
+        counters['stale'] += 1
+        _remove(entryKey)
+        return default
+
+    counters['hits'] += 1
+    _entries.move_to_end(entryKey)
+    return entry[1]
+
+
+# Stores the value for the entity token and key.  The size is the number of
+# bytes the value uses and is estimated if it isn't given.  Nothing is stored
+# for an owner that isn't registered because its values would never be released.
+def put(owner, token, value, key=None, size=None):
+    global _totalBytes
+    counters = _owners.get(owner)
+    if counters is None:
+        return
+
+    entryKey = (owner, token, key)
+    if entryKey in _entries:
+        _remove(entryKey)
+
+    # Count the value if an equal one is cached for another token.
+    fingerprint = (owner, key, _fingerprint(value))
+    otherKey = _fingerprints.get(fingerprint)
+    if otherKey is not None and _entries[otherKey][0] == _modelVersion:
+        counters['duplicates'] += 1
+    _fingerprints[fingerprint] = entryKey
+
+    if size is None:
+        size = _sizeOf(value)
+    _entries[entryKey] = [_modelVersion, value, size, fingerprint]
+    _totalBytes += size
+    _trim()
+
+
+# Returns the cached value for the entity and key or calls compute, which takes
+# no arguments, to compute and cache it.  The entity can return a different token
+# than the one its value was cached with, so a miss only means the value is
+# computed again.
+def getOrCompute(owner, entity, key, compute):
+    token = entity.entityToken
+    value = get(owner, token, key, _missing)
+    if value is _missing:
+        value = compute()
+        put(owner, token, value, key)
+    return value
+
+
+# Changes the model version so all of the cached values are invalid.
+def invalidate():
+    global _modelVersion
+    _modelVersion += 1
+
+
+def clear():
+    global _totalBytes
+    _entries.clear()
+    _fingerprints.clear()
+    _totalBytes = 0
+
+
+def setMaxBytes(maxBytes):
+    global _maxBytes
+    _maxBytes = maxBytes
+    _trim()
+
+
+# Returns a dictionary of the size of the cache and the counters of each owner.
+def stats():
+    return {'entries': len(_entries), 'bytes': _totalBytes, 'maxBytes': _maxBytes, 'modelVersion': _modelVersion,
+            'owners': {owner: dict(counters) for (owner, counters) in _owners.items()}}
+
+
+def _remove(entryKey):
+    global _totalBytes
+    entry = _entries.pop(entryKey)
+    _totalBytes -= entry[2]
+    if _fingerprints.get(entry[3]) == entryKey:
+        del _fingerprints[entry[3]]
+
+
+# Removes the least recently used values until the cache is within budget.
+def _trim():
+    while _totalBytes > _maxBytes and _entries:
+        entryKey = next(iter(_entries))
+        _remove(entryKey)
+        counters = _owners.get(entryKey[0])
+        if counters:
+            counters['evictions'] += 1
+
+
+# Returns a hash of the value that's the same for equal values.  Values that
+# can't be hashed, like lists, are hashed by their repr.
+def _fingerprint(value):
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(repr(value))
+
+
+# Estimates the memory used by a value made of tuples, lists, dictionaries and
+# simple values.  Other objects are only counted by their own size.
+def _sizeOf(value):
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(_sizeOf(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_sizeOf(item) + _sizeOf(value[item]) for item in value)
+    return size
@@ -0,0 +1,280 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Simple geometry math that works with tuples of floats instead of API objects.
+# Every Point3D, Vector3D or Matrix3D that's created, copied or changed is a call
+# into Fusion, which is much slower than doing the same math in Python.  The
+# add-ins convert the API objects to tuples when they get them, do their math
+# using these functions and only create API objects for the results they pass
+# back to Fusion.
+#
+#   Points and vectors are (x, y, z) tuples.
+#   Planes are normalized plane equations (a, b, c, d), where the signed distance
+#     of a point from the plane is a*x + b*y + c*z + d.
+#   Lines are (origin, direction) tuples where the direction has a length of one.
+#   Matrices are 16 values in the same order as Matrix3D.asArray, so the
+#     translation is in the values at 3, 7 and 11.
+#
+# The functions that end in an s take a sequence of points and return a list.
+# Fusion's Python doesn't include NumPy so these are plain Python loops, with the
+# constants of the loop taken out of the tuples first.
+
+import adsk.core
+import math
+
+identity = (1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0)
+
+
+# Returns the tuple of a Point3D or Vector3D.  It uses asArray because that's
+# a single call to the API where getting x, y and z is three.
+def fromAPI(obj):
+    return tuple(obj.asArray())
+
+
+def toPoint3D(point):
+    return adsk.core.Point3D.create(point[0], point[1], point[2])
+
+
+def toVector3D(vector):
+    return adsk.core.Vector3D.create(vector[0], vector[1], vector[2])
+
+
+# Returns the plane equation of a Plane.
+def planeFromAPI(plane):
+    return planeEquation(fromAPI(plane.origin), fromAPI(plane.normal))
+
+
+def matrixFromAPI(matrix):
+    return tuple(matrix.asArray())
+
+
+def toMatrix3D(matrix):
+    result = adsk.core.Matrix3D.create()
+    result.setWithArray(list(matrix))
+    return result
+
+
+def add(a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def subtract(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def scale(vector, factor):
+    return (vector[0] * factor, vector[1] * factor, vector[2] * factor)
+
+
+def dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0])
+
+
+def length(vector):
+    return math.sqrt(vector[0] * vector[0] + vector[1] * vector[1] + vector[2] * vector[2])
+
+
+# Returns the vector with a length of one.  A zero length vector is returned unchanged.
+def normalize(vector):
+    vectorLength = length(vector)
+    if vectorLength == 0:
+        return vector
+    return (vector[0] / vectorLength, vector[1] / vectorLength, vector[2] / vectorLength)
+
+
+def distance(a, b):
+    return length(subtract(b, a))
+
+
+# Returns the point moved the distance along the direction, which should have a length of one.
+def offsetPoint(point, direction, offset):
+    return (point[0] + direction[0] * offset, point[1] + direction[1] * offset, point[2] + direction[2] * offset)
+
+
+# Moves each point the distance along its own direction.
+def offsetPoints(points, directions, offset):
+    return [(x + dx * offset, y + dy * offset, z + dz * offset) for ((x, y, z), (dx, dy, dz)) in zip(points, directions)]
+
+
+# Returns the normalized plane equation of the plane through the origin with the normal.
+def planeEquation(origin, normal):
+    (a, b, c) = normalize(normal)
+    return (a, b, c, -(a * origin[0] + b * origin[1] + c * origin[2]))
+
+
+# Returns the signed distance of the point from the plane.
+def distanceToPlane(point, plane):
+    return plane[0] * point[0] + plane[1] * point[1] + plane[2] * point[2] + plane[3]
+
+
+def distancesToPlane(points, plane):
+    (a, b, c, d) = plane
+    return [a * x + b * y + c * z + d for (x, y, z) in points]
+
+
+# Returns a list indicating if each point lies on the plane.
+def pointsOnPlane(points, plane, tolerance=0.00001):
+    (a, b, c, d) = plane
+    return [abs(a * x + b * y + c * z + d) < tolerance for (x, y, z) in points]
+
+
+def line(origin, direction):
+    return (origin, normalize(direction))
+
+
+# Returns the distance between the point and the infinite line.  It's the length
+# of the part of the vector from the line origin to the point that's
+# perpendicular to the line.
+def distanceToLine(point, line):
+    return length(cross(subtract(point, line[0]), line[1]))
+
+
+def distancesToLine(points, line):
+    ((ox, oy, oz), (dx, dy, dz)) = line
+    result = []
+    for (x, y, z) in points:
+        (vx, vy, vz) = (x - ox, y - oy, z - oz)
+        (cx, cy, cz) = (vy * dz - vz * dy, vz * dx - vx * dz, vx * dy - vy * dx)
+        result.append(math.sqrt(cx * cx + cy * cy + cz * cz))
+    return result
+
+
+# Returns the matrix that transforms from the coordinate system to world space,
+# the same as Matrix3D.setWithCoordinateSystem.
+def coordinateSystem(origin, xAxis, yAxis, zAxis):
+    return (xAxis[0], yAxis[0], zAxis[0], origin[0],
+            xAxis[1], yAxis[1], zAxis[1], origin[1],
+            xAxis[2], yAxis[2], zAxis[2], origin[2],
+            0.0, 0.0, 0.0, 1.0)
+
+
+# Returns the matrix that applies b and then a.
+def multiply(a, b):
+    return tuple(sum(a[row * 4 + i] * b[i * 4 + col] for i in range(4)) for row in range(4) for col in range(4))
+
+
+def transformPoint(matrix, point):
+    (x, y, z) = point
+    m = matrix
+    return (m[0] * x + m[1] * y + m[2] * z + m[3],
+            m[4] * x + m[5] * y + m[6] * z + m[7],
+            m[8] * x + m[9] * y + m[10] * z + m[11])
+
+
+def transformVector(matrix, vector):
+    (x, y, z) = vector
+    m = matrix
+    return (m[0] * x + m[1] * y + m[2] * z,
+            m[4] * x + m[5] * y + m[6] * z,
+            m[8] * x + m[9] * y + m[10] * z)
+
+
+def transformPoints(matrix, points):
+    (m0, m1, m2, m3, m4, m5, m6, m7, m8, m9, m10, m11) = matrix[:12]
+    return [(m0 * x + m1 * y + m2 * z + m3, m4 * x + m5 * y + m6 * z + m7, m8 * x + m9 * y + m10 * z + m11) for (x, y, z) in points]
+
+
+# Returns the points and normals of a triangle mesh at (u, v) parameters.  The
+# mesh is given as the flat lists of a TriangleMesh: the node coordinates,
+# normals and texture coordinates and three node indices for each triangle.
+# Each parameter is looked up in the triangle that contains it in the texture
+# space and the point and normal are interpolated from its nodes.  Parameters
+# outside of the mesh use the closest triangle.  The triangles are sorted into a
+# grid of cells first so only the triangles near each parameter are tested.
+def sampleMesh(coordinates, normals, textureCoordinates, indices, parameters):
+    us = textureCoordinates[0::2]
+    vs = textureCoordinates[1::2]
+    (minU, maxU, minV, maxV) = (min(us), max(us), min(vs), max(vs))
+    triangleCount = len(indices) // 3
+    cellCount = max(1, int(math.sqrt(triangleCount / 2)))
+    cellU = (maxU - minU) / cellCount or 1.0
+    cellV = (maxV - minV) / cellCount or 1.0
+
+    def cell(value, minValue, cellSize):
+        return min(cellCount - 1, max(0, int((value - minValue) / cellSize)))
+
+    # Each triangle is kept as its nodes, its first corner and the inverse of
+    # the matrix of its two edges, which converts a parameter to the weights of
+    # the second and third nodes.  Triangles with no area are skipped.
+    cells = {}
+    for triangle in range(0, triangleCount):
+        (a, b, c) = indices[triangle * 3:triangle * 3 + 3]
+        (au, av) = (us[a], vs[a])
+        (e1u, e1v, e2u, e2v) = (us[b] - au, vs[b] - av, us[c] - au, vs[c] - av)
+        det = e1u * e2v - e2u * e1v
+        if det == 0:
+            continue
+        item = (a, b, c, au, av, e2v / det, -e2u / det, -e1v / det, e1u / det)
+        (bu, cu, bv, cv) = (us[b], us[c], vs[b], vs[c])
+        for i in range(cell(min(au, bu, cu), minU, cellU), cell(max(au, bu, cu), minU, cellU) + 1):
+            for j in range(cell(min(av, bv, cv), minV, cellV), cell(max(av, bv, cv), minV, cellV) + 1):
+                key = (i, j)
+                if key in cells:
+                    cells[key].append(item)
+                else:
+                    cells[key] = [item]
+    if not cells:
+        raise ValueError('The mesh doesn\'t have any triangles.')
+
+    points = []
+    pointNormals = []
+    for (u, v) in parameters:
+        # Search the rings of cells around the parameter until there's a triangle,
+        # stopping at the first one that contains the parameter.
+        (i, j) = (cell(u, minU, cellU), cell(v, minV, cellV))
+        best = None
+        bestWeight = -math.inf
+        for ring in range(0, cellCount):
+            for ci in range(i - ring, i + ring + 1):
+                for cj in range(j - ring, j + ring + 1):
+                    if ring and max(abs(ci - i), abs(cj - j)) != ring:
+                        continue
+                    for (a, b, c, au, av, m0, m1, m2, m3) in cells.get((ci, cj), ()):
+                        (du, dv) = (u - au, v - av)
+                        wb = du * m0 + dv * m1
+                        wc = du * m2 + dv * m3
+                        wa = 1 - wb - wc
+                        minWeight = min(wa, wb, wc)
+                        if minWeight > bestWeight:
+                            (best, bestWeight) = ((a, b, c, wa, wb, wc), minWeight)
+                            if minWeight >= 0:
+                                break
+                    if bestWeight >= 0:
+                        break
+                if bestWeight >= 0:
+                    break
+            if best is not None:
+                break
+
+        # Parameters outside of the triangle are moved to its closest corner or edge.
+        (a, b, c, wa, wb, wc) = best
+        if bestWeight < 0:
+            (wa, wb, wc) = (max(0.0, wa), max(0.0, wb), max(0.0, wc))
+            total = wa + wb + wc
+            (wa, wb, wc) = (wa / total, wb / total, wc / total)
+        (a, b, c) = (a * 3, b * 3, c * 3)
+        points.append((coordinates[a] * wa + coordinates[b] * wb + coordinates[c] * wc,
+                       coordinates[a + 1] * wa + coordinates[b + 1] * wb + coordinates[c + 1] * wc,
+                       coordinates[a + 2] * wa + coordinates[b + 2] * wb + coordinates[c + 2] * wc))
+        pointNormals.append(normalize((normals[a] * wa + normals[b] * wb + normals[c] * wc,
+                                       normals[a + 1] * wa + normals[b + 1] * wb + normals[c + 1] * wc,
+                                       normals[a + 2] * wa + normals[b + 2] * wb + normals[c + 2] * wc)))
+    return (points, pointNormals)
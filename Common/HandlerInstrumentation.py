@@ -0,0 +1,227 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Measures how long the event handlers of the add-ins take.  It's off by default
+# and while it's off the handlers aren't changed in any way.  When it's enabled,
+# the notify method of every handler held by HandlerRegistry is wrapped to record
+# the number of calls and a histogram of their latency.  Calls that take longer
+# than the slow time also have the stack of the handler sampled while it's still
+# running, so it shows what the handler was doing.  The slow calls and periodic
+# summaries are written as JSON lines to a rotating log file.
+#
+# It can be enabled by setting the FUSION_HANDLER_STATS environment variable
+# before Fusion starts, or at any time by running this in the Python console of
+# the Text Commands window:
+#     import HandlerInstrumentation; HandlerInstrumentation.enable()
+
+# Only the modules needed to check whether it's enabled are imported when the
+# add-ins start.  The others are imported when it's enabled.
+import bisect, os, sys, time
+
+# The log is written to this file in the temporary folder unless another file is given.
+defaultLogName = 'FusionHandlerStats.log'
+
+# Calls that take longer than this, in seconds, are logged with sampled stacks.
+defaultSlowTime = 0.1
+
+# The time, in seconds, between the summaries written to the log.
+defaultSummaryInterval = 60.0
+
+# The upper bounds, in seconds, of the latency histogram buckets.  They increase
+# by 20% from 10 microseconds to about 60 seconds.  The last bucket has no upper bound.
+_bucketBounds = [0.00001 * 1.2 ** i for i in range(0, 86)]
+
+# The maximum number of sampled stacks kept for each handler.
+_maxSamples = 5
+
+isEnabled = False
+_stats = {}
+_logger = None
+_slowTime = defaultSlowTime
+_summaryInterval = defaultSummaryInterval
+_lastSummaryTime = 0.0
+
+# The calls that are running, innermost last, as lists of [stats, startTime, sampledStack].
+_activeCalls = []
+_mainThreadId = None
+_watchdog = None
+_stopWatchdog = None
+
+
+class HandlerStats:
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.totalSeconds = 0.0
+        self.maxSeconds = 0.0
+        self.slowCount = 0
+        self.buckets = [0] * (len(_bucketBounds) + 1)
+        self.samples = []
+
+    def add(self, seconds):
+        self.count += 1
+        self.totalSeconds += seconds
+        if seconds > self.maxSeconds:
+            self.maxSeconds = seconds
+        self.buckets[bisect.bisect_left(_bucketBounds, seconds)] += 1
+
+    # Returns the latency, in seconds, that the fraction of calls are faster than.
+    # It's the upper bound of the histogram bucket the percentile falls in.
+    def percentile(self, fraction):
+        if self.count == 0:
+            return 0.0
+        target = fraction * self.count
+        total = 0
+        for (bucket, count) in enumerate(self.buckets):
+            total += count
+            if total >= target:
+                return _bucketBounds[bucket] if bucket < len(_bucketBounds) else self.maxSeconds
+        return self.maxSeconds
+
+    def summary(self):
+        return {'count': self.count, 'totalSeconds': self.totalSeconds, 'maxSeconds': self.maxSeconds,
+                'p50': self.percentile(0.5), 'p95': self.percentile(0.95), 'p99': self.percentile(0.99),
+                'slowCount': self.slowCount}
+
+
+# Starts recording the handlers.  Handlers that are already registered are
+# instrumented now and new handlers are instrumented when they're registered.
+def enable(logFilename='', slowTime=defaultSlowTime, summaryInterval=defaultSummaryInterval,
+           maxBytes=1000000, backupCount=5):
+    global isEnabled, _logger, _slowTime, _summaryInterval, _lastSummaryTime, _mainThreadId, _watchdog, _stopWatchdog
+    if isEnabled:
+        return
+
+    import logging, logging.handlers, tempfile, threading
+    if not logFilename:
+        logFilename = os.path.join(tempfile.gettempdir(), defaultLogName)
+
+    _logger = logging.getLogger('FusionHandlerStats')
+    _logger.propagate = False
+    _logger.setLevel(logging.INFO)
+    for logHandler in list(_logger.handlers):
+        _logger.removeHandler(logHandler)
+    _logger.addHandler(logging.handlers.RotatingFileHandler(logFilename, maxBytes=maxBytes, backupCount=backupCount))
+
+    _slowTime = slowTime
+    _summaryInterval = summaryInterval
+    _lastSummaryTime = time.perf_counter()
+    _mainThreadId = threading.get_ident()
+    isEnabled = True
+
+    # Sample the stacks of slow calls from another thread while they're running.
+    _stopWatchdog = threading.Event()
+    _watchdog = threading.Thread(target=_watchSlowCalls, args=(_stopWatchdog,), name='HandlerInstrumentation', daemon=True)
+    _watchdog.start()
+
+    import HandlerRegistry
+    HandlerRegistry._instrumentAll()
+
+
+# Stops recording, writes a final summary and restores the original notify methods.
+def disable():
+    global isEnabled, _logger, _watchdog
+    if not isEnabled:
+        return
+
+    isEnabled = False
+    _stopWatchdog.set()
+    _watchdog = None
+    writeSummary()
+
+    import HandlerRegistry
+    HandlerRegistry._uninstrumentAll()
+
+    for logHandler in list(_logger.handlers):
+        logHandler.close()
+        _logger.removeHandler(logHandler)
+    _logger = None
+
+
+# Wraps the notify method of the handler so its calls are recorded under the name.
+def instrument(handler, name):
+    if not isEnabled or 'notify' in handler.__dict__:
+        return
+
+    stats = _stats.get(name)
+    if not stats:
+        stats = HandlerStats(name)
+        _stats[name] = stats
+
+    notify = handler.notify
+    def timedNotify(args):
+        call = [stats, time.perf_counter(), None]
+        _activeCalls.append(call)
+        try:
+            return notify(args)
+        finally:
+            _activeCalls.pop()
+            seconds = time.perf_counter() - call[1]
+            stats.add(seconds)
+            if seconds >= _slowTime:
+                _logSlowCall(stats, seconds, call[2])
+            if call[1] - _lastSummaryTime > _summaryInterval and not _activeCalls:
+                writeSummary()
+
+    handler.notify = timedNotify
+
+
+# Restores the original notify method of the handler.
+def uninstrument(handler):
+    if 'notify' in handler.__dict__:
+        del handler.notify
+
+
+# Returns the summary of each handler, keyed by name.
+def summary():
+    return {name: stats.summary() for (name, stats) in _stats.items()}
+
+
+def reset():
+    _stats.clear()
+
+
+def writeSummary():
+    global _lastSummaryTime
+    _lastSummaryTime = time.perf_counter()
+    if _logger:
+        import json
+        _logger.info(json.dumps({'type': 'summary', 'time': time.time(), 'handlers': summary()}))
+
+
+def _logSlowCall(stats, seconds, sampledStack):
+    stats.slowCount += 1
+    if sampledStack and len(stats.samples) < _maxSamples:
+        stats.samples.append(sampledStack)
+    if _logger:
+        import json
+        _logger.info(json.dumps({'type': 'slowCall', 'time': time.time(), 'handler': stats.name,
+                                 'seconds': seconds, 'stack': sampledStack}))
+
+
+# Runs in the watchdog thread and records the stack of the main thread once for
+# each call that runs longer than the slow time.  The stack is logged with the
+# call when it finishes and the first few are kept with the handler's stats.
+def _watchSlowCalls(stopEvent):
+    import traceback
+    while not stopEvent.wait(_slowTime / 2):
+        try:
+            call = _activeCalls[-1]
+        except IndexError:
+            continue
+
+        (stats, startTime, sampledStack) = call
+        if sampledStack or time.perf_counter() - startTime < _slowTime:
+            continue
+
+        frame = sys._current_frames().get(_mainThreadId)
+        call[2] = ''.join(traceback.format_stack(frame)) if frame else '(no stack)'
@@ -0,0 +1,195 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Keeps the references to event handlers that Fusion requires, shared by all of
+# the add-ins.  A handler must be referenced for as long as it's connected to an
+# event or it will be deleted by Python.  Rather than appending every handler to
+# a global list that keeps growing, handlers are held in one of two scopes:
+#
+#   Command scopes hold the handlers connected to the events of one command, like
+#   execute and inputChanged.  They're released when the command is destroyed.
+#
+#   Add-in scopes hold handlers that last as long as the add-in is running, like
+#   the commandCreated handler of a button or handlers of application events.
+#   They're released when the add-in calls releaseHandlers from its stop function.
+#
+# Typical use in a commandCreated handler is:
+#     scope = HandlerRegistry.commandScope(cmd, 'Cutouts')
+#     scope.add(cmd.execute, CutoutCommandExecuteHandler())
+
+import adsk.core
+import gc, itertools, os, weakref
+
+# HandlerInstrumentation is optional so this module can be copied into a script
+# on its own.  Without it the handlers are never instrumented.
+try:
+    import HandlerInstrumentation
+except ImportError:
+    HandlerInstrumentation = None
+
+# The command scopes that haven't been released, keyed by their id.
+_commandScopes = {}
+_scopeIds = itertools.count(1)
+
+# The handlers of each add-in, keyed by the add-in name.  Each is a list of
+# (event, handler) tuples.
+_addInHandlers = {}
+
+# Every handler that has been registered and still exists.  It's used to check
+# that released handlers are actually deleted.
+_liveHandlers = weakref.WeakSet()
+
+_counts = {'handlersAdded': 0, 'commandScopesCreated': 0, 'commandScopesReleased': 0}
+
+
+# CommandEvent handler class for the destroy event of a command that releases the
+# handlers of the command.
+class _DestroyHandler(adsk.core.CommandEventHandler):
+    def __init__(self, scopeId):
+        super().__init__()
+        self.scopeId = scopeId
+    def notify(self, args):
+        scope = _commandScopes.get(self.scopeId)
+        if scope:
+            scope.release()
+
+
+class CommandScope:
+    def __init__(self, command, owner):
+        self.id = next(_scopeIds)
+        self.owner = owner
+        self.handlers = []
+        _commandScopes[self.id] = self
+        _counts['commandScopesCreated'] += 1
+
+        self.add(command.destroy, _DestroyHandler(self.id))
+
+    # Connects the handler to the event and holds a reference to it until the
+    # command is destroyed.  Returns the handler.
+    def add(self, event, handler):
+        if HandlerInstrumentation and HandlerInstrumentation.isEnabled:
+            _instrument(self.owner, handler)
+        event.add(handler)
+        self.handlers.append(handler)
+        _liveHandlers.add(handler)
+        _counts['handlersAdded'] += 1
+        return handler
+
+    # Drops the references to the handlers.  This is called when the command is destroyed.
+    def release(self):
+        if _commandScopes.pop(self.id, None):
+            _counts['commandScopesReleased'] += 1
+        self.handlers = []
+
+
+# Returns a new scope for the handlers of the command.  It should be called from
+# the commandCreated event of the command.
+def commandScope(command, owner=''):
+    return CommandScope(command, owner)
+
+
+# Connects the handler to the event and holds a reference to it until the add-in
+# is stopped.  Returns the handler.
+def addHandler(owner, event, handler):
+    if HandlerInstrumentation and HandlerInstrumentation.isEnabled:
+        _instrument(owner, handler)
+    event.add(handler)
+    _addInHandlers.setdefault(owner, []).append((event, handler))
+    _liveHandlers.add(handler)
+    _counts['handlersAdded'] += 1
+    return handler
+
+
+# Disconnects and drops the references to all of the handlers of the add-in,
+# including those of any of its commands that are still running.
+def releaseHandlers(owner):
+    for (event, handler) in _addInHandlers.pop(owner, []):
+        try:
+            event.remove(handler)
+        except:
+            # The object the event belongs to might have been deleted already.
+            pass
+
+    for scope in [scope for scope in _commandScopes.values() if scope.owner == owner]:
+        scope.release()
+
+
+# Returns the number of handlers that still exist, whether or not they've been released.
+def liveHandlerCount():
+    gc.collect()
+    return len(_liveHandlers)
+
+
+# Returns a dictionary of the number of handlers held in each scope and the totals
+# since the add-ins were loaded.
+def stats():
+    result = dict(_counts)
+    result['liveHandlers'] = liveHandlerCount()
+    result['activeCommandScopes'] = len(_commandScopes)
+    result['commandHandlers'] = sum(len(scope.handlers) for scope in _commandScopes.values())
+    result['addInHandlers'] = {owner: len(handlers) for (owner, handlers) in _addInHandlers.items()}
+    return result
+
+
+# Returns a dictionary of memory statistics.  The number of objects tracked by the
+# garbage collector is always included.  The Python memory use is included when
+# tracemalloc is tracing, which can be started with startMemoryTracing.
+def memoryStats():
+    gc.collect()
+    result = {'gcObjects': len(gc.get_objects())}
+
+    # tracemalloc isn't imported until it's needed so it doesn't slow down starting the add-ins.
+    import tracemalloc
+    if tracemalloc.is_tracing():
+        (current, peak) = tracemalloc.get_traced_memory()
+        result['tracedBytes'] = current
+        result['tracedPeakBytes'] = peak
+    return result
+
+
+def startMemoryTracing():
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stopMemoryTracing():
+    import tracemalloc
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+# The calls are recorded under the owner and the class of the handler, or the
+# instrumentationName of handlers that pass the event on to another handler.
+def _instrument(owner, handler):
+    name = getattr(handler, 'instrumentationName', None) or type(handler).__name__
+    HandlerInstrumentation.instrument(handler, '{}.{}'.format(owner, name))
+
+
+# Called by HandlerInstrumentation to instrument all of the handlers that are held.
+def _instrumentAll():
+    for (owner, handlers) in _addInHandlers.items():
+        for (event, handler) in handlers:
+            _instrument(owner, handler)
+    for scope in _commandScopes.values():
+        for handler in scope.handlers:
+            _instrument(scope.owner, handler)
+
+
+def _uninstrumentAll():
+    for handler in list(_liveHandlers):
+        HandlerInstrumentation.uninstrument(handler)
+
+
+# The instrumentation can be turned on for the whole session with an environment variable.
+if HandlerInstrumentation and os.environ.get('FUSION_HANDLER_STATS'):
+    HandlerInstrumentation.enable()
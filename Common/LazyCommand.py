@@ -0,0 +1,91 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Lets an add-in create its buttons when Fusion starts without importing the
+# code that implements its commands.  The run function of the add-in only
+# creates the command definitions and controls and connects a
+# CommandCreatedHandler from this module to each one.  The module that
+# implements the command is imported the first time the command is run and the
+# handler then passes the event on to the real commandCreated handler.
+#
+# When the implementation module is first imported, its start function is
+# called if it has one.  It can be used to connect to application events that
+# are only needed once the command has been used.  The add-in's stop function
+# should call stopModule so the module's stop function is called if it was loaded.
+
+import adsk.core, traceback
+import importlib, sys, time
+
+# The time, in seconds, it took to import each implementation module, keyed by
+# the full module name.
+importTimes = {}
+
+# The full names of the implementation modules whose start function has been
+# called and whose stop function hasn't been called since.
+_started = set()
+
+
+def _startModule(fullName, module):
+    if hasattr(module, 'start'):
+        module.start()
+    _started.add(fullName)
+
+
+# Returns the implementation module, importing it the first time and calling its
+# start function if it hasn't been started or was stopped by stopModule.  The
+# package is the package of the add-in, which is the __package__ of its main module.
+def loadModule(package, moduleName):
+    fullName = package + '.' + moduleName if package else moduleName
+    module = sys.modules.get(fullName)
+    if module is None:
+        startTime = time.perf_counter()
+        module = importlib.import_module(fullName)
+        _startModule(fullName, module)
+        importTimes[fullName] = time.perf_counter() - startTime
+    elif fullName not in _started:
+        _startModule(fullName, module)
+    return module
+
+
+# Calls the stop function of the implementation module if it has been started.
+def stopModule(package, moduleName):
+    fullName = package + '.' + moduleName if package else moduleName
+    if fullName not in _started:
+        return
+
+    _started.discard(fullName)
+    module = sys.modules.get(fullName)
+    if module is not None and hasattr(module, 'stop'):
+        module.stop()
+
+
+# CommandCreated event handler class that imports the implementation module and
+# passes the event to the handler class of the module with the given name.  The
+# id of the command definition names the handler in HandlerInstrumentation, so
+# the calls of each command are recorded separately.
+class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self, package, moduleName, handlerClassName, commandId=''):
+        super().__init__()
+        self.package = package
+        self.moduleName = moduleName
+        self.handlerClassName = handlerClassName
+        self.instrumentationName = '{}.{}'.format(commandId, handlerClassName) if commandId else handlerClassName
+        self.handler = None
+    def notify(self, args):
+        try:
+            if not self.handler:
+                module = loadModule(self.package, self.moduleName)
+                self.handler = getattr(module, self.handlerClassName)()
+            self.handler.notify(args)
+        except:
+            ui = adsk.core.Application.get().userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
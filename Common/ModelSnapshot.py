@@ -0,0 +1,133 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Writes snapshots of models that Benchmarks/BatchRun.py runs the hole detection
+# of CorkHoles and the cutouts of Cutouts on outside of Fusion.  A snapshot has
+# the topology and geometry of the bodies and, optionally, the inputs of the
+# Cutouts command.  It can be written in Fusion by running this in the Python
+# console of the Text Commands window:
+#     import ModelSnapshot
+#     body = adsk.core.Application.get().activeProduct.rootComponent.bRepBodies.item(0)
+#     ModelSnapshot.save('C:/Temp/Snapshots/Part.json', ModelSnapshot.snapshot('Part', [body]))
+#
+# A snapshot is a JSON file.  Lengths are in centimeters and points and vectors
+# are [x, y, z] lists.
+#
+#   {"format": 1,
+#    "name": "Part",
+#    "bodies": [{"name": "Body1", "isSolid": true,
+#                "boundingBox": [minX, minY, minZ, maxX, maxY, maxZ],
+#                "faces": [{"surface": surface, "pointOnFace": point,
+#                           "normal": the normal of the face at pointOnFace,
+#                           "loops": [{"isOuter": true, "edges": [edge indices]}]}],
+#                "edges": [{"curve": curve, "isDegenerate": false, "faces": [face indices]}]}],
+#    "cutouts": {"plane": {"origin": point, "normal": vector},
+#                "points": [point, ...], "shape": "Square", "size": 1.0, "tileSize": 0}}
+#
+# Faces and edges are referred to by their index in the lists of their body.
+# The surfaces and curves are one of:
+#
+#   {"type": "Plane", "origin": point, "normal": vector}
+#   {"type": "Cylinder", "origin": point, "axis": vector, "radius": 1.0}
+#   {"type": "Circle", "center": point, "normal": vector, "radius": 1.0}
+#   {"type": "Line", "startPoint": point, "endPoint": point}
+#   {"type": "Other", "surfaceType": n} or {"type": "Other", "curveType": n}
+#
+# The "cutouts" section is left out when there are no cutout inputs.
+
+import adsk.core, adsk.fusion
+import json
+
+snapshotFormat = 1
+
+
+def _xyz(obj):
+    return list(obj.asArray())
+
+
+def _surface(surface):
+    surfaceType = surface.surfaceType
+    if surfaceType == adsk.core.SurfaceTypes.PlaneSurfaceType:
+        plane = adsk.core.Plane.cast(surface)
+        return {'type': 'Plane', 'origin': _xyz(plane.origin), 'normal': _xyz(plane.normal)}
+    elif surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType:
+        cylinder = adsk.core.Cylinder.cast(surface)
+        return {'type': 'Cylinder', 'origin': _xyz(cylinder.origin), 'axis': _xyz(cylinder.axis), 'radius': cylinder.radius}
+    return {'type': 'Other', 'surfaceType': surfaceType}
+
+
+def _curve(curve):
+    curveType = curve.curveType
+    if curveType == adsk.core.Curve3DTypes.Circle3DCurveType:
+        circle = adsk.core.Circle3D.cast(curve)
+        return {'type': 'Circle', 'center': _xyz(circle.center), 'normal': _xyz(circle.normal), 'radius': circle.radius}
+    elif curveType == adsk.core.Curve3DTypes.Line3DCurveType:
+        line = adsk.core.Line3D.cast(curve)
+        return {'type': 'Line', 'startPoint': _xyz(line.startPoint), 'endPoint': _xyz(line.endPoint)}
+    return {'type': 'Other', 'curveType': curveType}
+
+
+# Returns the snapshot of a body.  The faces and edges are numbered using their
+# temporary ids, which are only unique within the body.
+def snapshotBody(body):
+    faceIndices = {}
+    edgeIndices = {}
+    for face in body.faces:
+        faceIndices[face.tempId] = len(faceIndices)
+    for edge in body.edges:
+        edgeIndices[edge.tempId] = len(edgeIndices)
+
+    faces = []
+    for face in body.faces:
+        pointOnFace = face.pointOnFace
+        (rslt, normal) = face.evaluator.getNormalAtPoint(pointOnFace)
+        loops = [{'isOuter': loop.isOuter, 'edges': [edgeIndices[edge.tempId] for edge in loop.edges]} for loop in face.loops]
+        faces.append({'surface': _surface(face.geometry), 'pointOnFace': _xyz(pointOnFace), 'normal': _xyz(normal), 'loops': loops})
+
+    edges = []
+    for edge in body.edges:
+        edges.append({'curve': _curve(edge.geometry), 'isDegenerate': edge.isDegenerate,
+                      'faces': [faceIndices[face.tempId] for face in edge.faces]})
+
+    box = body.boundingBox
+    return {'name': body.name, 'isSolid': body.isSolid, 'boundingBox': _xyz(box.minPoint) + _xyz(box.maxPoint),
+            'faces': faces, 'edges': edges}
+
+
+# Returns the snapshot of the bodies.  If a plane is given, the inputs of the
+# Cutouts command are included, with the points as their model coordinates.
+def snapshot(name, bodies, planeEnt=None, pointEnts=(), shape='Square', size=1.0, tileSize=0):
+    result = {'format': snapshotFormat, 'name': name, 'bodies': [snapshotBody(body) for body in bodies]}
+    if planeEnt:
+        plane = planeEnt.geometry
+        points = []
+        for pntEnt in pointEnts:
+            if pntEnt.objectType == adsk.fusion.SketchPoint.classType():
+                points.append(_xyz(pntEnt.worldGeometry))
+            else:
+                points.append(_xyz(pntEnt.geometry))
+        result['cutouts'] = {'plane': {'origin': _xyz(plane.origin), 'normal': _xyz(plane.normal)},
+                             'points': points, 'shape': shape, 'size': size, 'tileSize': tileSize}
+    return result
+
+
+def save(filename, snapshot):
+    with open(filename, 'w') as snapshotFile:
+        json.dump(snapshot, snapshotFile, separators=(',', ':'))
+
+
+def load(filename):
+    with open(filename) as snapshotFile:
+        snapshot = json.load(snapshotFile)
+    if snapshot.get('format') != snapshotFormat:
+        raise ValueError('{} is not a version {} model snapshot.'.format(filename, snapshotFormat))
+    return snapshot
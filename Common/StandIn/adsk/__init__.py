@@ -0,0 +1,55 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# A local stand-in for the parts of the Fusion 360 adsk modules used by these
+# samples.  It allows the sample code to be run outside of Fusion, for example
+# to benchmark it.  It isn't a model of Fusion and doesn't compute any real
+# geometry.  It only keeps enough state for the samples to run and counts
+# every call made through the API so the cost of a sample can be measured.
+#
+# To use it, put the StandIn folder at the front of sys.path before the sample
+# is imported.
+
+import collections
+
+# The number of times each API property or method has been used, keyed by
+# "ClassName.memberName".
+callCounts = collections.Counter()
+
+
+# Clears the API call counts.
+def resetCallCounts():
+    callCounts.clear()
+
+
+# Returns the total number of API calls made since the counts were reset.
+def totalCallCount():
+    return sum(callCounts.values())
+
+
+# Replaces the active design with a new, empty design and returns it.
+def newDesign():
+    app = core.Application.get()
+    des = fusion.Design()
+    app._setActiveProduct(des)
+    return des
+
+
+def terminate():
+    pass
+
+
+def autoTerminate(value):
+    pass
+
+
+from . import core, fusion, cam
@@ -0,0 +1,1403 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Stand-in for adsk.core.  See __init__.py for details.
+
+import collections, math
+import adsk
+
+
+# Counts a call to a static API function.
+def _count(name):
+    adsk.callCounts[name] += 1
+
+
+# Base class of all the stand-in API objects.  Every access of a public member
+# is counted as an API call.  The stand-in classes keep their own state in
+# members whose names start with an underscore so it isn't counted.
+class Base:
+    def __getattribute__(self, name):
+        if name[0] != '_':
+            adsk.callCounts[type(self).__name__ + '.' + name] += 1
+        return object.__getattribute__(self, name)
+
+    @classmethod
+    def cast(cls, obj):
+        _count(cls.__name__ + '.cast')
+        return obj if isinstance(obj, cls) else None
+
+    @classmethod
+    def classType(cls):
+        _count(cls.__name__ + '.classType')
+        return 'adsk::' + cls.__module__.split('.')[-1] + '::' + cls.__name__
+
+    @property
+    def objectType(self):
+        return 'adsk::' + type(self).__module__.split('.')[-1] + '::' + type(self).__name__
+
+    @property
+    def isValid(self):
+        return True
+
+
+# A read-only collection of API objects.
+class Collection(Base):
+    def __init__(self, items=None):
+        self._items = list(items) if items else []
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def item(self, index):
+        return self._items[index]
+
+    def itemByName(self, name):
+        for item in self._items:
+            if item._name == name:
+                return item
+        return None
+
+    def itemById(self, id):
+        for item in self._items:
+            if item._id == id:
+                return item
+        return None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+class ObjectCollection(Collection):
+    @staticmethod
+    def create():
+        _count('ObjectCollection.create')
+        return ObjectCollection()
+
+    def add(self, item):
+        self._items.append(item)
+        return True
+
+    def clear(self):
+        self._items = []
+        return True
+
+
+class Point2D(Base):
+    def __init__(self, x, y):
+        self._x = x
+        self._y = y
+
+    @staticmethod
+    def create(x=0, y=0):
+        _count('Point2D.create')
+        return Point2D(x, y)
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    def asArray(self):
+        return (self._x, self._y)
+
+
+class Point3D(Base):
+    def __init__(self, x, y, z):
+        self._x = x
+        self._y = y
+        self._z = z
+
+    @staticmethod
+    def create(x=0, y=0, z=0):
+        _count('Point3D.create')
+        return Point3D(x, y, z)
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+
+    @property
+    def z(self):
+        return self._z
+
+    @z.setter
+    def z(self, value):
+        self._z = value
+
+    def asArray(self):
+        return (self._x, self._y, self._z)
+
+    def copy(self):
+        return Point3D(self._x, self._y, self._z)
+
+    def _copy(self):
+        return Point3D(self._x, self._y, self._z)
+
+    def distanceTo(self, point):
+        return math.sqrt((point._x - self._x) ** 2 + (point._y - self._y) ** 2 + (point._z - self._z) ** 2)
+
+    def vectorTo(self, point):
+        return Vector3D(point._x - self._x, point._y - self._y, point._z - self._z)
+
+    def translateBy(self, vector):
+        self._x += vector._x
+        self._y += vector._y
+        self._z += vector._z
+        return True
+
+    def isEqualTo(self, point):
+        return self.distanceTo(point) < 1e-10
+
+    def transformBy(self, matrix):
+        (self._x, self._y, self._z) = matrix._transformPoint(self._x, self._y, self._z)
+        return True
+
+
+class Vector3D(Base):
+    def __init__(self, x, y, z):
+        self._x = x
+        self._y = y
+        self._z = z
+
+    @staticmethod
+    def create(x=0, y=0, z=0):
+        _count('Vector3D.create')
+        return Vector3D(x, y, z)
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    @property
+    def z(self):
+        return self._z
+
+    @property
+    def length(self):
+        return math.sqrt(self._x ** 2 + self._y ** 2 + self._z ** 2)
+
+    def asArray(self):
+        return (self._x, self._y, self._z)
+
+    def copy(self):
+        return Vector3D(self._x, self._y, self._z)
+
+    def _copy(self):
+        return Vector3D(self._x, self._y, self._z)
+
+    def normalize(self):
+        length = math.sqrt(self._x ** 2 + self._y ** 2 + self._z ** 2)
+        if length == 0:
+            return False
+        self._x /= length
+        self._y /= length
+        self._z /= length
+        return True
+
+    def scaleBy(self, scale):
+        self._x *= scale
+        self._y *= scale
+        self._z *= scale
+        return True
+
+    def dotProduct(self, vector):
+        return self._x * vector._x + self._y * vector._y + self._z * vector._z
+
+    def crossProduct(self, vector):
+        return Vector3D(self._y * vector._z - self._z * vector._y,
+                        self._z * vector._x - self._x * vector._z,
+                        self._x * vector._y - self._y * vector._x)
+
+    def angleTo(self, vector):
+        lengths = math.sqrt(self._x ** 2 + self._y ** 2 + self._z ** 2) * math.sqrt(vector._x ** 2 + vector._y ** 2 + vector._z ** 2)
+        if lengths == 0:
+            return 0
+        cosAngle = (self._x * vector._x + self._y * vector._y + self._z * vector._z) / lengths
+        return math.acos(max(-1.0, min(1.0, cosAngle)))
+
+    def transformBy(self, matrix):
+        (self._x, self._y, self._z) = matrix._transformVector(self._x, self._y, self._z)
+        return True
+
+
+class Matrix3D(Base):
+    def __init__(self):
+        self._cells = [[1.0 if row == col else 0.0 for col in range(4)] for row in range(4)]
+
+    @staticmethod
+    def create():
+        _count('Matrix3D.create')
+        return Matrix3D()
+
+    def getCell(self, row, column):
+        return self._cells[row][column]
+
+    def setCell(self, row, column, value):
+        self._cells[row][column] = value
+        return True
+
+    def asArray(self):
+        return tuple(value for row in self._cells for value in row)
+
+    def setWithArray(self, cells):
+        self._cells = [list(cells[row * 4:row * 4 + 4]) for row in range(4)]
+        return True
+
+    def copy(self):
+        matrix = Matrix3D()
+        matrix._cells = [list(row) for row in self._cells]
+        return matrix
+
+    def setWithCoordinateSystem(self, origin, xAxis, yAxis, zAxis):
+        for (col, values) in enumerate(((axis._x, axis._y, axis._z) for axis in (xAxis, yAxis, zAxis, origin))):
+            for row in range(3):
+                self._cells[row][col] = values[row]
+        self._cells[3] = [0.0, 0.0, 0.0, 1.0]
+        return True
+
+    def getAsCoordinateSystem(self):
+        cells = self._cells
+        return (Point3D(cells[0][3], cells[1][3], cells[2][3]),
+                Vector3D(cells[0][0], cells[1][0], cells[2][0]),
+                Vector3D(cells[0][1], cells[1][1], cells[2][1]),
+                Vector3D(cells[0][2], cells[1][2], cells[2][2]))
+
+    def transformBy(self, matrix):
+        other = matrix._cells
+        self._cells = [[sum(other[row][i] * self._cells[i][col] for i in range(4)) for col in range(4)] for row in range(4)]
+        return True
+
+    def _transformPoint(self, x, y, z):
+        cells = self._cells
+        return tuple(cells[row][0] * x + cells[row][1] * y + cells[row][2] * z + cells[row][3] for row in range(3))
+
+    def _transformVector(self, x, y, z):
+        cells = self._cells
+        return tuple(cells[row][0] * x + cells[row][1] * y + cells[row][2] * z for row in range(3))
+
+
+class BoundingBox3D(Base):
+    def __init__(self, minPoint, maxPoint):
+        self._minPoint = minPoint
+        self._maxPoint = maxPoint
+
+    @staticmethod
+    def create(minPoint, maxPoint):
+        _count('BoundingBox3D.create')
+        return BoundingBox3D(minPoint._copy(), maxPoint._copy())
+
+    @property
+    def minPoint(self):
+        return self._minPoint._copy()
+
+    @property
+    def maxPoint(self):
+        return self._maxPoint._copy()
+
+
+class Plane(Base):
+    def __init__(self, origin, normal):
+        self._origin = origin
+        self._normal = normal
+
+    @staticmethod
+    def create(origin, normal):
+        _count('Plane.create')
+        return Plane(origin._copy(), normal._copy())
+
+    @property
+    def origin(self):
+        return self._origin._copy()
+
+    @property
+    def normal(self):
+        return self._normal._copy()
+
+    @property
+    def surfaceType(self):
+        return SurfaceTypes.PlaneSurfaceType
+
+
+class Circle3D(Base):
+    def __init__(self, center, normal, radius):
+        self._center = center
+        self._normal = normal
+        self._radius = radius
+
+    @staticmethod
+    def createByCenter(center, normal, radius):
+        _count('Circle3D.createByCenter')
+        return Circle3D(center._copy(), normal._copy(), radius)
+
+    @property
+    def center(self):
+        return self._center._copy()
+
+    @property
+    def normal(self):
+        return self._normal._copy()
+
+    @property
+    def radius(self):
+        return self._radius
+
+    @property
+    def curveType(self):
+        return Curve3DTypes.Circle3DCurveType
+
+
+class Line3D(Base):
+    def __init__(self, startPoint, endPoint):
+        self._startPoint = startPoint
+        self._endPoint = endPoint
+
+    @staticmethod
+    def create(startPoint, endPoint):
+        _count('Line3D.create')
+        return Line3D(startPoint._copy(), endPoint._copy())
+
+    @property
+    def startPoint(self):
+        return self._startPoint._copy()
+
+    @property
+    def endPoint(self):
+        return self._endPoint._copy()
+
+    @property
+    def curveType(self):
+        return Curve3DTypes.Line3DCurveType
+
+
+class Cylinder(Base):
+    def __init__(self, origin, axis, radius):
+        self._origin = origin
+        self._axis = axis
+        self._radius = radius
+
+    @staticmethod
+    def create(origin, axis, radius):
+        _count('Cylinder.create')
+        return Cylinder(origin._copy(), axis._copy(), radius)
+
+    @property
+    def origin(self):
+        return self._origin._copy()
+
+    @property
+    def axis(self):
+        return self._axis._copy()
+
+    @property
+    def radius(self):
+        return self._radius
+
+    @property
+    def surfaceType(self):
+        return SurfaceTypes.CylinderSurfaceType
+
+
+# A surface of a type the stand-in doesn't model, like a fillet or a NURBS
+# surface in a model snapshot.  It only reports its type.  It's evaluated as the
+# plane that touches it at the point it was recorded at, with the normal there.
+class Surface(Base):
+    def __init__(self, surfaceType, origin, normal):
+        self._surfaceType = surfaceType
+        self._origin = origin
+        self._normal = normal
+
+    @property
+    def surfaceType(self):
+        return self._surfaceType
+
+
+# A curve of a type the stand-in doesn't model, like an arc or a spline in a
+# model snapshot.  It only reports its type.
+class Curve3D(Base):
+    def __init__(self, curveType):
+        self._curveType = curveType
+
+    @property
+    def curveType(self):
+        return self._curveType
+
+
+class BoundingBox2D(Base):
+    def __init__(self, minPoint, maxPoint):
+        self._minPoint = minPoint
+        self._maxPoint = maxPoint
+
+    @property
+    def minPoint(self):
+        return Point2D(self._minPoint._x, self._minPoint._y)
+
+    @property
+    def maxPoint(self):
+        return Point2D(self._maxPoint._x, self._maxPoint._y)
+
+
+# Evaluates a plane or cylinder.  The parameters of a plane are distances along
+# two directions in the plane and those of a cylinder are the angle around the
+# axis and the distance along it.  Other surfaces are evaluated as a plane.  The normals of a face whose normal is
+# reversed from the surface's, like the inside of a hole, point the other way.
+class SurfaceEvaluator(Base):
+    def __init__(self, surface, isReversed=False, parametricRange=(0.0, 0.0, 1.0, 1.0)):
+        self._surface = surface
+        self._isReversed = isReversed
+        self._parametricRange = parametricRange
+
+        # The directions of the parameters, perpendicular to the plane normal or cylinder axis.
+        axis = surface._axis if isinstance(surface, Cylinder) else surface._normal
+        axis = Vector3D(axis._x, axis._y, axis._z)
+        axis.normalize()
+        xDir = Vector3D(1, 0, 0) if abs(axis._x) < 0.9 else Vector3D(0, 1, 0)
+        yDir = axis.crossProduct(xDir)
+        yDir.normalize()
+        self._axes = (yDir.crossProduct(axis), yDir, axis)
+
+    def parametricRange(self):
+        (minU, minV, maxU, maxV) = self._parametricRange
+        return BoundingBox2D(Point2D(minU, minV), Point2D(maxU, maxV))
+
+    def _evaluate(self, u, v):
+        (xDir, yDir, axis) = self._axes
+        surface = self._surface
+        origin = surface._origin
+        if isinstance(surface, Cylinder):
+            (c, s) = (math.cos(u), math.sin(u))
+            normal = (xDir._x * c + yDir._x * s, xDir._y * c + yDir._y * s, xDir._z * c + yDir._z * s)
+            point = tuple(o + n * surface._radius + a * v for (o, n, a) in zip((origin._x, origin._y, origin._z), normal, (axis._x, axis._y, axis._z)))
+        else:
+            normal = (axis._x, axis._y, axis._z)
+            point = (origin._x + xDir._x * u + yDir._x * v, origin._y + xDir._y * u + yDir._y * v, origin._z + xDir._z * u + yDir._z * v)
+        if self._isReversed:
+            normal = (-normal[0], -normal[1], -normal[2])
+        return (point, normal)
+
+    def getPointsAtParameters(self, parameters):
+        return (True, [Point3D(*self._evaluate(param._x, param._y)[0]) for param in parameters])
+
+    def getNormalsAtParameters(self, parameters):
+        return (True, [Vector3D(*self._evaluate(param._x, param._y)[1]) for param in parameters])
+
+    def getNormalAtPoint(self, point):
+        surface = self._surface
+        if isinstance(surface, Cylinder):
+            axis = surface._axis
+            (dx, dy, dz) = (point._x - surface._origin._x, point._y - surface._origin._y, point._z - surface._origin._z)
+            along = (dx * axis._x + dy * axis._y + dz * axis._z) / (axis._x ** 2 + axis._y ** 2 + axis._z ** 2)
+            normal = Vector3D(dx - axis._x * along, dy - axis._y * along, dz - axis._z * along)
+        else:
+            normal = surface._normal._copy()
+        normal.normalize()
+        if self._isReversed:
+            normal.scaleBy(-1)
+        return (True, normal)
+
+
+class ValueInput(Base):
+    def __init__(self, realValue=None, stringValue=None):
+        self._realValue = realValue
+        self._stringValue = stringValue
+
+    @staticmethod
+    def createByReal(value):
+        _count('ValueInput.createByReal')
+        return ValueInput(realValue=value)
+
+    @staticmethod
+    def createByString(value):
+        _count('ValueInput.createByString')
+        return ValueInput(stringValue=value)
+
+    @property
+    def realValue(self):
+        return self._realValue
+
+    @property
+    def stringValue(self):
+        return self._stringValue
+
+
+class Curve3DTypes:
+    Line3DCurveType = 0
+    Arc3DCurveType = 1
+    Circle3DCurveType = 2
+    Ellipse3DCurveType = 3
+    EllipticalArc3DCurveType = 4
+    InfiniteLine3DCurveType = 5
+    NurbsCurve3DCurveType = 6
+
+
+class SurfaceTypes:
+    PlaneSurfaceType = 0
+    CylinderSurfaceType = 1
+    ConeSurfaceType = 2
+    SphereSurfaceType = 3
+    TorusSurfaceType = 4
+    EllipticalCylinderSurfaceType = 5
+    EllipticalConeSurfaceType = 6
+    NurbsSurfaceType = 7
+
+
+class DropDownStyles:
+    CheckBoxDropDownStyle = 0
+    LabeledIconDropDownStyle = 1
+    TextListDropDownStyle = 2
+
+
+class DialogResults:
+    DialogError = -1
+    DialogOK = 0
+    DialogCancel = 1
+    DialogYes = 2
+    DialogNo = 3
+
+
+# Event handling.
+
+class Event(Base):
+    def __init__(self, name, sender=None):
+        self._name = name
+        self._sender = sender
+        self._handlers = []
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def sender(self):
+        return self._sender
+
+    def add(self, handler):
+        self._handlers.append(handler)
+        return True
+
+    def remove(self, handler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+            return True
+        return False
+
+    # Calls the notify method of every connected handler.
+    def _fire(self, args):
+        args._firingEvent = self
+        for handler in list(self._handlers):
+            handler.notify(args)
+
+
+class SelectionEvent(Event):
+    def __init__(self, name, sender=None):
+        super().__init__(name, sender)
+        self._activeInput = None
+
+    @property
+    def activeInput(self):
+        return self._activeInput
+
+
+class EventArgs(Base):
+    def __init__(self, **values):
+        self._firingEvent = None
+        for (name, value) in values.items():
+            setattr(self, '_' + name, value)
+
+    @property
+    def firingEvent(self):
+        return self._firingEvent
+
+
+class CommandCreatedEventArgs(EventArgs):
+    @property
+    def command(self):
+        return self._command
+
+
+class CommandEventArgs(EventArgs):
+    @property
+    def command(self):
+        return self._command
+
+    @property
+    def isValidResult(self):
+        return getattr(self, '_isValidResult', False)
+
+    @isValidResult.setter
+    def isValidResult(self, value):
+        self._isValidResult = value
+
+
+class InputChangedEventArgs(EventArgs):
+    @property
+    def input(self):
+        return self._input
+
+    @property
+    def inputs(self):
+        return self._input._parentCommand._commandInputs
+
+
+class SelectionEventArgs(EventArgs):
+    @property
+    def selection(self):
+        return self._selection
+
+    @property
+    def isSelectable(self):
+        return getattr(self, '_isSelectable', True)
+
+    @isSelectable.setter
+    def isSelectable(self, value):
+        self._isSelectable = value
+
+
+class CustomEventArgs(EventArgs):
+    @property
+    def additionalInfo(self):
+        return self._additionalInfo
+
+
+class DocumentEventArgs(EventArgs):
+    @property
+    def document(self):
+        return self._document
+
+
+class ApplicationCommandEventArgs(EventArgs):
+    @property
+    def commandId(self):
+        return self._commandId
+
+
+class EventHandler:
+    def __init__(self):
+        pass
+
+    def notify(self, args):
+        pass
+
+
+class CommandCreatedEventHandler(EventHandler):
+    pass
+
+
+class CommandEventHandler(EventHandler):
+    pass
+
+
+class InputChangedEventHandler(EventHandler):
+    pass
+
+
+class SelectionEventHandler(EventHandler):
+    pass
+
+
+class CustomEventHandler(EventHandler):
+    pass
+
+
+class DocumentEventHandler(EventHandler):
+    pass
+
+
+class ApplicationCommandEventHandler(EventHandler):
+    pass
+
+
+# Commands and command inputs.
+
+class CommandInput(Base):
+    def __init__(self, id, name, parentCommand):
+        self._id = id
+        self._name = name
+        self._parentCommand = parentCommand
+        self._isEnabled = True
+        self._isVisible = True
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def parentCommand(self):
+        return self._parentCommand
+
+    @property
+    def isEnabled(self):
+        return self._isEnabled
+
+    @isEnabled.setter
+    def isEnabled(self, value):
+        self._isEnabled = value
+
+    @property
+    def isVisible(self):
+        return self._isVisible
+
+    @isVisible.setter
+    def isVisible(self, value):
+        self._isVisible = value
+
+
+class Selection(Base):
+    def __init__(self, entity):
+        self._entity = entity
+
+    @property
+    def entity(self):
+        return self._entity
+
+
+class SelectionCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand):
+        super().__init__(id, name, parentCommand)
+        self._selections = []
+        self._filters = []
+        self._limits = (1, 0)
+
+    def addSelectionFilter(self, filter):
+        self._filters.append(filter)
+        return True
+
+    def setSelectionLimits(self, minimum, maximum=0):
+        self._limits = (minimum, maximum)
+        return True
+
+    @property
+    def selectionCount(self):
+        return len(self._selections)
+
+    def selection(self, index):
+        return self._selections[index]
+
+    def addSelection(self, entity):
+        self._selections.append(Selection(entity))
+        return True
+
+    def clearSelection(self):
+        self._selections = []
+        return True
+
+
+class ListItem(Base):
+    def __init__(self, name, isSelected, parentList):
+        self._name = name
+        self._isSelected = isSelected
+        self._parentList = parentList
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def index(self):
+        return self._parentList._items.index(self)
+
+    @property
+    def isSelected(self):
+        return self._isSelected
+
+    @isSelected.setter
+    def isSelected(self, value):
+        if value:
+            for item in self._parentList._items:
+                item._isSelected = False
+        self._isSelected = value
+
+
+class ListItems(Collection):
+    def add(self, name, isSelected, icon='', beforeIndex=-1):
+        item = ListItem(name, False, self)
+        if beforeIndex < 0:
+            self._items.append(item)
+        else:
+            self._items.insert(beforeIndex, item)
+        if isSelected:
+            item.isSelected = True
+        return item
+
+    def clear(self):
+        self._items = []
+        return True
+
+
+class DropDownCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand):
+        super().__init__(id, name, parentCommand)
+        self._listItems = ListItems()
+
+    @property
+    def listItems(self):
+        return self._listItems
+
+    @property
+    def selectedItem(self):
+        for item in self._listItems._items:
+            if item._isSelected:
+                return item
+        return None
+
+
+class ValueCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand, unitType, initialValue):
+        super().__init__(id, name, parentCommand)
+        self._unitType = unitType
+        self._value = initialValue._realValue if initialValue._realValue is not None else float(initialValue._stringValue.split()[0])
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+    @property
+    def unitType(self):
+        return self._unitType
+
+
+class FloatSliderCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand, unitType, min, max):
+        super().__init__(id, name, parentCommand)
+        self._unitType = unitType
+        self._valueOne = min
+        self._spinStep = 1
+
+    @property
+    def valueOne(self):
+        return self._valueOne
+
+    @valueOne.setter
+    def valueOne(self, value):
+        self._valueOne = value
+
+    @property
+    def spinStep(self):
+        return self._spinStep
+
+    @spinStep.setter
+    def spinStep(self, value):
+        self._spinStep = value
+
+
+class BoolValueCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand, isCheckBox, initialValue):
+        super().__init__(id, name, parentCommand)
+        self._value = initialValue
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class StringValueCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand, initialValue):
+        super().__init__(id, name, parentCommand)
+        self._value = initialValue
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class TextBoxCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand, text):
+        super().__init__(id, name, parentCommand)
+        self._text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+
+    @property
+    def formattedText(self):
+        return self._text
+
+    @formattedText.setter
+    def formattedText(self, value):
+        self._text = value
+
+
+class GroupCommandInput(CommandInput):
+    def __init__(self, id, name, parentCommand):
+        super().__init__(id, name, parentCommand)
+        self._children = CommandInputs(parentCommand)
+        self._isExpanded = True
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def isExpanded(self):
+        return self._isExpanded
+
+    @isExpanded.setter
+    def isExpanded(self, value):
+        self._isExpanded = value
+
+
+class CommandInputs(Collection):
+    def __init__(self, command):
+        super().__init__()
+        self._command = command
+
+    @property
+    def command(self):
+        return self._command
+
+    def itemById(self, id):
+        for input in self._items:
+            if input._id == id:
+                return input
+            if isinstance(input, GroupCommandInput):
+                child = input._children.itemById(id)
+                if child:
+                    return child
+        return None
+
+    def _add(self, input):
+        self._items.append(input)
+        return input
+
+    def addSelectionInput(self, id, name, commandPrompt):
+        return self._add(SelectionCommandInput(id, name, self._command))
+
+    def addDropDownCommandInput(self, id, name, dropDownStyle):
+        return self._add(DropDownCommandInput(id, name, self._command))
+
+    def addValueInput(self, id, name, unitType, initialValue):
+        return self._add(ValueCommandInput(id, name, self._command, unitType, initialValue))
+
+    def addFloatSliderCommandInput(self, id, name, unitType, min, max, hasTwoSliders=False):
+        return self._add(FloatSliderCommandInput(id, name, self._command, unitType, min, max))
+
+    def addBoolValueInput(self, id, name, isCheckBox, resourceFolder='', initialValue=False):
+        return self._add(BoolValueCommandInput(id, name, self._command, isCheckBox, initialValue))
+
+    def addStringValueInput(self, id, name, initialValue=''):
+        return self._add(StringValueCommandInput(id, name, self._command, initialValue))
+
+    def addTextBoxCommandInput(self, id, name, text, numRows, isReadOnly):
+        return self._add(TextBoxCommandInput(id, name, self._command, text))
+
+    def addGroupCommandInput(self, id, name):
+        return self._add(GroupCommandInput(id, name, self._command))
+
+
+class Command(Base):
+    def __init__(self, parentCommandDefinition):
+        self._parentCommandDefinition = parentCommandDefinition
+        self._commandInputs = CommandInputs(self)
+        self._execute = Event('execute', self)
+        self._executePreview = Event('executePreview', self)
+        self._inputChanged = Event('inputChanged', self)
+        self._selectionEvent = SelectionEvent('selectionEvent', self)
+        self._validateInputs = Event('validateInputs', self)
+        self._destroy = Event('destroy', self)
+        self._isAutoExecute = False
+
+    @property
+    def parentCommandDefinition(self):
+        return self._parentCommandDefinition
+
+    @property
+    def commandInputs(self):
+        return self._commandInputs
+
+    @property
+    def execute(self):
+        return self._execute
+
+    @property
+    def executePreview(self):
+        return self._executePreview
+
+    @property
+    def inputChanged(self):
+        return self._inputChanged
+
+    @property
+    def selectionEvent(self):
+        return self._selectionEvent
+
+    @property
+    def validateInputs(self):
+        return self._validateInputs
+
+    @property
+    def destroy(self):
+        return self._destroy
+
+    @property
+    def isAutoExecute(self):
+        return self._isAutoExecute
+
+    @isAutoExecute.setter
+    def isAutoExecute(self, value):
+        self._isAutoExecute = value
+
+    def doExecute(self, terminate):
+        self._execute._fire(CommandEventArgs(command=self))
+        if terminate:
+            self._destroy._fire(CommandEventArgs(command=self))
+        return True
+
+
+class CommandDefinition(Base):
+    def __init__(self, id, name, tooltip, resourceFolder, parentCollection):
+        self._id = id
+        self._name = name
+        self._tooltip = tooltip
+        self._resourceFolder = resourceFolder
+        self._parentCollection = parentCollection
+        self._commandCreated = Event('commandCreated', self)
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def commandCreated(self):
+        return self._commandCreated
+
+    def deleteMe(self):
+        self._parentCollection._items.remove(self)
+        return True
+
+    # Runs the command, firing the commandCreated event and returning the created
+    # command.  Like Fusion, a command without any inputs is executed immediately.
+    def execute(self, input=None):
+        command = Command(self)
+        self._commandCreated._fire(CommandCreatedEventArgs(command=command))
+        if command._commandInputs.count == 0:
+            command.doExecute(True)
+        return command
+
+
+class CommandDefinitions(Collection):
+    def addButtonDefinition(self, id, name, tooltip, resourceFolder=''):
+        if self.itemById(id):
+            raise RuntimeError('3 : A command definition with the id "{}" already exists.'.format(id))
+        definition = CommandDefinition(id, name, tooltip, resourceFolder, self)
+        self._items.append(definition)
+        return definition
+
+
+class ToolbarControl(Base):
+    def __init__(self, id, parentControls, commandDefinition=None):
+        self._id = id
+        self._parentControls = parentControls
+        self._commandDefinition = commandDefinition
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def commandDefinition(self):
+        return self._commandDefinition
+
+    def deleteMe(self):
+        self._parentControls._items.remove(self)
+        return True
+
+
+class ToolbarControls(Collection):
+    def addCommand(self, commandDefinition, positionID='', isBefore=True):
+        control = ToolbarControl(commandDefinition._id, self, commandDefinition)
+        self._items.append(control)
+        return control
+
+    def addSeparator(self, id='', positionID='', isBefore=True):
+        control = ToolbarControl(id, self)
+        self._items.append(control)
+        return control
+
+
+class ToolbarPanel(Base):
+    def __init__(self, id):
+        self._id = id
+        self._controls = ToolbarControls()
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def controls(self):
+        return self._controls
+
+
+class ToolbarPanels(Collection):
+    # Any panel that's asked for is created so the samples can add their controls.
+    def itemById(self, id):
+        panel = super().itemById(id)
+        if not panel:
+            panel = ToolbarPanel(id)
+            self._items.append(panel)
+        return panel
+
+
+class Palette(Base):
+    def __init__(self, id):
+        self._id = id
+        self._lines = []
+
+    @property
+    def id(self):
+        return self._id
+
+    def writeText(self, text):
+        self._lines.append(text)
+        return True
+
+
+class Palettes(Collection):
+    pass
+
+
+class ProgressBar(Base):
+    def __init__(self):
+        self._isVisible = False
+        self._progressValue = 0
+        self._maximumValue = 100
+        self._message = ''
+
+    def show(self, message, minimumValue, maximumValue, isInfinite=False):
+        self._isVisible = True
+        self._message = message
+        self._maximumValue = maximumValue
+        return True
+
+    def showBusy(self, message, allowAutoScroll=True):
+        self._isVisible = True
+        self._message = message
+        return True
+
+    def hide(self):
+        self._isVisible = False
+        return True
+
+    @property
+    def isVisible(self):
+        return self._isVisible
+
+    @property
+    def progressValue(self):
+        return self._progressValue
+
+    @progressValue.setter
+    def progressValue(self, value):
+        self._progressValue = value
+
+    @property
+    def message(self):
+        return self._message
+
+    @message.setter
+    def message(self, value):
+        self._message = value
+
+
+class UserInterface(Base):
+    def __init__(self):
+        self._commandDefinitions = CommandDefinitions()
+        self._allToolbarPanels = ToolbarPanels()
+        self._palettes = Palettes([Palette('TextCommands')])
+        self._progressBar = ProgressBar()
+        self._messages = []
+        self._commandTerminated = Event('commandTerminated', self)
+        self._commandStarting = Event('commandStarting', self)
+
+    @property
+    def commandDefinitions(self):
+        return self._commandDefinitions
+
+    @property
+    def allToolbarPanels(self):
+        return self._allToolbarPanels
+
+    @property
+    def palettes(self):
+        return self._palettes
+
+    @property
+    def progressBar(self):
+        return self._progressBar
+
+    @property
+    def commandTerminated(self):
+        return self._commandTerminated
+
+    @property
+    def commandStarting(self):
+        return self._commandStarting
+
+    # Messages are saved instead of being displayed so they can be checked.
+    def messageBox(self, text, title='', buttons=0, icon=0):
+        self._messages.append(text)
+        return DialogResults.DialogOK
+
+
+class Document(Base):
+    _nextId = 1
+
+    def __init__(self, name, product):
+        self._name = name
+        self._products = Collection([product])
+        self._creationId = 'StandInDocument{}'.format(Document._nextId)
+        Document._nextId += 1
+        product._parentDocument = self
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def creationId(self):
+        return self._creationId
+
+    @property
+    def products(self):
+        return self._products
+
+
+class Application(Base):
+    _instance = None
+
+    def __init__(self):
+        self._userInterface = UserInterface()
+        self._activeProduct = None
+        self._activeDocument = None
+        self._customEvents = {}
+        self._pendingCustomEvents = collections.deque()
+        self._isFiringCustomEvents = False
+        self._documentActivated = Event('documentActivated', self)
+        self._documentClosed = Event('documentClosed', self)
+        self._documentOpened = Event('documentOpened', self)
+        self._documentSaved = Event('documentSaved', self)
+
+    @staticmethod
+    def get():
+        _count('Application.get')
+        if not Application._instance:
+            Application._instance = Application()
+        return Application._instance
+
+    @property
+    def userInterface(self):
+        return self._userInterface
+
+    @property
+    def activeProduct(self):
+        return self._activeProduct
+
+    @property
+    def activeDocument(self):
+        return self._activeDocument
+
+    @property
+    def documentActivated(self):
+        return self._documentActivated
+
+    @property
+    def documentClosed(self):
+        return self._documentClosed
+
+    @property
+    def documentOpened(self):
+        return self._documentOpened
+
+    @property
+    def documentSaved(self):
+        return self._documentSaved
+
+    def registerCustomEvent(self, eventId):
+        event = Event(eventId, self)
+        self._customEvents[eventId] = event
+        return event
+
+    def unregisterCustomEvent(self, eventId):
+        return self._customEvents.pop(eventId, None) is not None
+
+    # Custom events are queued and fired in order.  The queue is processed as soon as
+    # an event is fired from outside of a custom event handler, so events fired from
+    # a handler are fired after it returns, as they would be in Fusion.
+    def fireCustomEvent(self, eventId, additionalInfo=''):
+        if eventId not in self._customEvents:
+            return False
+        self._pendingCustomEvents.append((eventId, additionalInfo))
+        if not self._isFiringCustomEvents:
+            self._isFiringCustomEvents = True
+            try:
+                while self._pendingCustomEvents:
+                    (eventId, additionalInfo) = self._pendingCustomEvents.popleft()
+                    event = self._customEvents.get(eventId)
+                    if event:
+                        event._fire(CustomEventArgs(additionalInfo=additionalInfo))
+            finally:
+                self._isFiringCustomEvents = False
+        return True
+
+    def _setActiveProduct(self, product):
+        self._activeProduct = product
+        self._activeDocument = Document('Untitled', product)
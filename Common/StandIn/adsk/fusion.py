@@ -0,0 +1,1049 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Stand-in for adsk.fusion.  See __init__.py for details.
+#
+# Sketches don't solve anything.  They keep track of which sketch points are
+# connected so they know when a chain of lines closes into a loop, and the
+# profiles are found by grouping loops whose bounding rectangles overlap.  A
+# group of n overlapping loops is treated as creating 2n - 1 single loop regions.
+# Each entity added to a sketch whose compute isn't deferred is counted as a
+# "Sketch.compute" call.
+
+import math
+import adsk
+from .core import Base, Collection, ObjectCollection, Point3D, Vector3D, Matrix3D, BoundingBox3D, Plane, SurfaceEvaluator, Event, _count
+
+
+class DesignTypes:
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+
+class FeatureOperations:
+    JoinFeatureOperation = 0
+    CutFeatureOperation = 1
+    IntersectFeatureOperation = 2
+    NewBodyFeatureOperation = 3
+    NewComponentFeatureOperation = 4
+
+
+class ExtentDirections:
+    PositiveExtentDirection = 0
+    NegativeExtentDirection = 1
+    SymmetricExtentDirection = 2
+
+
+class FusionUnitsManager(Base):
+    # The number of centimeters in each supported length unit.
+    _lengthUnits = {'mm': 0.1, 'cm': 1.0, 'm': 100.0, 'in': 2.54, 'ft': 30.48}
+
+    def __init__(self):
+        self._defaultLengthUnits = 'cm'
+
+    @property
+    def defaultLengthUnits(self):
+        return self._defaultLengthUnits
+
+    @defaultLengthUnits.setter
+    def defaultLengthUnits(self, value):
+        self._defaultLengthUnits = value
+
+    @property
+    def internalUnits(self):
+        return 'cm'
+
+    def convert(self, valueInInputUnits, inputUnits, outputUnits):
+        units = FusionUnitsManager._lengthUnits
+        return valueInInputUnits * units[inputUnits] / units[outputUnits]
+
+    def formatInternalValue(self, internalValue, displayUnits='', showUnits=True):
+        if not displayUnits:
+            displayUnits = self._defaultLengthUnits
+        value = internalValue / FusionUnitsManager._lengthUnits[displayUnits]
+        if showUnits:
+            return '{:g} {}'.format(value, displayUnits)
+        return '{:g}'.format(value)
+
+
+class Attribute(Base):
+    def __init__(self, groupName, name, value):
+        self._groupName = groupName
+        self._name = name
+        self._value = value
+
+    @property
+    def groupName(self):
+        return self._groupName
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class Attributes(Collection):
+    def add(self, groupName, name, value):
+        attrib = self.itemByName(groupName, name)
+        if attrib:
+            attrib._value = value
+        else:
+            attrib = Attribute(groupName, name, value)
+            self._items.append(attrib)
+        return attrib
+
+    def itemByName(self, groupName, name):
+        for attrib in self._items:
+            if attrib._groupName == groupName and attrib._name == name:
+                return attrib
+        return None
+
+
+class TimelineObject(Base):
+    def __init__(self, timeline, entity):
+        self._timeline = timeline
+        self._entity = entity
+
+    @property
+    def index(self):
+        return self._timeline._items.index(self)
+
+    @property
+    def entity(self):
+        return self._entity
+
+
+class TimelineGroup(Base):
+    def __init__(self, startIndex, endIndex):
+        self._startIndex = startIndex
+        self._endIndex = endIndex
+        self._name = ''
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+
+class TimelineGroups(Collection):
+    def add(self, startIndex, endIndex):
+        group = TimelineGroup(startIndex, endIndex)
+        self._items.append(group)
+        return group
+
+
+class Timeline(Collection):
+    def __init__(self):
+        super().__init__()
+        self._timelineGroups = TimelineGroups()
+
+    @property
+    def markerPosition(self):
+        return len(self._items)
+
+    @property
+    def timelineGroups(self):
+        return self._timelineGroups
+
+    def _add(self, entity):
+        timelineObject = TimelineObject(self, entity)
+        self._items.append(timelineObject)
+        return timelineObject
+
+
+class Design(Base):
+    def __init__(self, designType=DesignTypes.ParametricDesignType):
+        self._designType = designType
+        self._unitsManager = FusionUnitsManager()
+        self._attributes = Attributes()
+        self._timeline = Timeline()
+        self._parentDocument = None
+        self._tokenCount = 0
+        self._entities = {}
+        self._rootComponent = Component(self, 'Root')
+        self._allComponents = Collection([self._rootComponent])
+
+    @property
+    def designType(self):
+        return self._designType
+
+    @designType.setter
+    def designType(self, value):
+        self._designType = value
+
+    @property
+    def rootComponent(self):
+        return self._rootComponent
+
+    @property
+    def allComponents(self):
+        return self._allComponents
+
+    @property
+    def unitsManager(self):
+        return self._unitsManager
+
+    @property
+    def attributes(self):
+        return self._attributes
+
+    @property
+    def timeline(self):
+        return self._timeline
+
+    @property
+    def parentDocument(self):
+        return self._parentDocument
+
+    def findEntityByToken(self, entityToken):
+        entity = self._entities.get(entityToken)
+        return [entity] if entity else []
+
+    # Assigns a new entity token to an entity.
+    def _newToken(self, entity):
+        self._tokenCount += 1
+        token = 'token{}'.format(self._tokenCount)
+        self._entities[token] = entity
+        return token
+
+    # Adds an entity to the timeline if this is a parametric design.
+    def _addToTimeline(self, entity):
+        if self._designType == DesignTypes.ParametricDesignType:
+            return self._timeline._add(entity)
+        return None
+
+
+# Base class of entities that have an entity token.
+class Entity(Base):
+    def __init__(self, design):
+        self._design = design
+        self._entityToken = None
+
+    @property
+    def entityToken(self):
+        if not self._entityToken:
+            self._entityToken = self._design._newToken(self)
+        return self._entityToken
+
+
+class ConstructionPlane(Entity):
+    def __init__(self, design, plane, name=''):
+        super().__init__(design)
+        self._geometry = plane
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def geometry(self):
+        return Plane(self._geometry._origin._copy(), self._geometry._normal._copy())
+
+
+class ConstructionPoint(Entity):
+    def __init__(self, design, point, name=''):
+        super().__init__(design)
+        self._geometry = point
+        self._name = name
+        self._timelineObject = None
+
+    @property
+    def geometry(self):
+        return self._geometry._copy()
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def timelineObject(self):
+        return self._timelineObject
+
+    def _modelPoint(self):
+        return self._geometry
+
+
+class ConstructionPointInput(Base):
+    def __init__(self):
+        self._point = None
+        self._targetBaseOrFormFeature = None
+
+    def setByPoint(self, point):
+        self._point = point._copy()
+        return True
+
+    @property
+    def targetBaseOrFormFeature(self):
+        return self._targetBaseOrFormFeature
+
+    @targetBaseOrFormFeature.setter
+    def targetBaseOrFormFeature(self, value):
+        self._targetBaseOrFormFeature = value
+
+
+class ConstructionPoints(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, occurrenceForCreation=None):
+        return ConstructionPointInput()
+
+    def add(self, input):
+        design = self._component._design
+        point = ConstructionPoint(design, input._point, 'Point{}'.format(len(self._items) + 1))
+        baseFeature = input._targetBaseOrFormFeature
+        if baseFeature:
+            if not baseFeature._isEditing:
+                raise RuntimeError('3 : The base feature must be in edit mode.')
+            baseFeature._entities.append(point)
+        else:
+            point._timelineObject = design._addToTimeline(point)
+        self._items.append(point)
+        return point
+
+
+class BaseFeature(Entity):
+    def __init__(self, design, name):
+        super().__init__(design)
+        self._name = name
+        self._isEditing = False
+        self._entities = []
+        self._timelineObject = design._addToTimeline(self)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def timelineObject(self):
+        return self._timelineObject
+
+    def startEdit(self):
+        self._isEditing = True
+        return True
+
+    def finishEdit(self):
+        self._isEditing = False
+        return True
+
+
+class BaseFeatures(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def add(self):
+        feature = BaseFeature(self._component._design, 'Base Feature{}'.format(len(self._items) + 1))
+        self._items.append(feature)
+        return feature
+
+
+# Bodies only have faces and edges when they're created with them, for example
+# from a model snapshot.  Faces and edges add themselves to their body.  Box
+# bodies added by Component._addBody only have a bounding box.
+class BRepBody(Entity):
+    def __init__(self, design, minPoint, maxPoint, name='Body', isSolid=True):
+        super().__init__(design)
+        self._boundingBox = BoundingBox3D(minPoint, maxPoint)
+        self._name = name
+        self._isSolid = isSolid
+        self._faces = BRepFaces()
+        self._edges = BRepEdges()
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def isSolid(self):
+        return self._isSolid
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(self._boundingBox._minPoint._copy(), self._boundingBox._maxPoint._copy())
+
+    @property
+    def faces(self):
+        return self._faces
+
+    @property
+    def edges(self):
+        return self._edges
+
+
+class BRepBodies(Collection):
+    pass
+
+
+class BRepFace(Entity):
+    def __init__(self, body, geometry, pointOnFace, isReversed=False, parametricRange=(0.0, 0.0, 1.0, 1.0)):
+        super().__init__(body._design)
+        self._body = body
+        self._geometry = geometry
+        self._pointOnFace = pointOnFace
+        self._evaluator = SurfaceEvaluator(geometry, isReversed, parametricRange)
+        self._meshManager = MeshManager(self)
+        self._loops = BRepLoops()
+        self._edges = BRepEdges()
+        self._tempId = len(body._faces._items)
+        body._faces._items.append(self)
+
+    @property
+    def tempId(self):
+        return self._tempId
+
+    @property
+    def body(self):
+        return self._body
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @property
+    def pointOnFace(self):
+        return self._pointOnFace._copy()
+
+    @property
+    def evaluator(self):
+        return self._evaluator
+
+    @property
+    def meshManager(self):
+        return self._meshManager
+
+    @property
+    def loops(self):
+        return self._loops
+
+    @property
+    def edges(self):
+        return self._edges
+
+
+class BRepFaces(Collection):
+    pass
+
+
+# The display mesh of a face is a grid of triangles over its parametric range,
+# with the parameters as the texture coordinates.
+class TriangleMesh(Base):
+    _divisions = 32
+
+    def __init__(self, evaluator):
+        (minU, minV, maxU, maxV) = evaluator._parametricRange
+        divisions = TriangleMesh._divisions
+        self._coordinates = []
+        self._normals = []
+        self._textureCoordinates = []
+        for i in range(0, divisions + 1):
+            for j in range(0, divisions + 1):
+                (u, v) = (minU + (maxU - minU) * i / divisions, minV + (maxV - minV) * j / divisions)
+                (point, normal) = evaluator._evaluate(u, v)
+                self._coordinates.extend(point)
+                self._normals.extend(normal)
+                self._textureCoordinates.extend((u, v))
+
+        self._indices = []
+        for i in range(0, divisions):
+            for j in range(0, divisions):
+                node = i * (divisions + 1) + j
+                self._indices.extend((node, node + divisions + 1, node + 1, node + 1, node + divisions + 1, node + divisions + 2))
+
+    @property
+    def nodeCount(self):
+        return len(self._coordinates) // 3
+
+    @property
+    def triangleCount(self):
+        return len(self._indices) // 3
+
+    @property
+    def nodeCoordinatesAsDouble(self):
+        return list(self._coordinates)
+
+    @property
+    def normalVectorsAsDouble(self):
+        return list(self._normals)
+
+    @property
+    def textureCoordinatesAsDouble(self):
+        return list(self._textureCoordinates)
+
+    @property
+    def nodeIndices(self):
+        return list(self._indices)
+
+
+class TriangleMeshList(Collection):
+    @property
+    def bestMesh(self):
+        return self._items[0] if self._items else None
+
+
+class MeshManager(Base):
+    def __init__(self, face):
+        self._face = face
+        self._displayMeshes = None
+
+    @property
+    def displayMeshes(self):
+        if self._displayMeshes is None:
+            self._displayMeshes = TriangleMeshList([TriangleMesh(self._face._evaluator)])
+        return self._displayMeshes
+
+
+class BRepEdge(Entity):
+    def __init__(self, body, geometry, isDegenerate=False):
+        super().__init__(body._design)
+        self._body = body
+        self._geometry = geometry
+        self._isDegenerate = isDegenerate
+        self._faces = BRepFaces()
+        self._tempId = len(body._edges._items)
+        body._edges._items.append(self)
+
+    @property
+    def tempId(self):
+        return self._tempId
+
+    @property
+    def body(self):
+        return self._body
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @property
+    def isDegenerate(self):
+        return self._isDegenerate
+
+    @property
+    def faces(self):
+        return self._faces
+
+
+class BRepEdges(Collection):
+    pass
+
+
+class BRepLoop(Base):
+    def __init__(self, face, isOuter):
+        self._face = face
+        self._isOuter = isOuter
+        self._edges = BRepEdges()
+
+    @property
+    def face(self):
+        return self._face
+
+    @property
+    def isOuter(self):
+        return self._isOuter
+
+    @property
+    def edges(self):
+        return self._edges
+
+
+class BRepLoops(Collection):
+    pass
+
+
+class SketchPoint(Entity):
+    def __init__(self, sketch, point):
+        super().__init__(sketch._design)
+        self._sketch = sketch
+        self._geometry = point
+        self._id = sketch._addPoint(self)
+
+    @property
+    def geometry(self):
+        return self._geometry._copy()
+
+    @property
+    def worldGeometry(self):
+        return self._sketch._toModel(self._geometry)
+
+    @property
+    def parentSketch(self):
+        return self._sketch
+
+    def _modelPoint(self):
+        return self._sketch._toModel(self._geometry)
+
+
+class SketchPoints(Collection):
+    def add(self, point):
+        return SketchPoint(self._sketch, point._copy())
+
+
+class SketchLine(Entity):
+    def __init__(self, sketch, startPoint, endPoint):
+        super().__init__(sketch._design)
+        self._startSketchPoint = startPoint
+        self._endSketchPoint = endPoint
+
+    @property
+    def startSketchPoint(self):
+        return self._startSketchPoint
+
+    @property
+    def endSketchPoint(self):
+        return self._endSketchPoint
+
+
+class SketchCircle(Entity):
+    def __init__(self, sketch, centerPoint, radius):
+        super().__init__(sketch._design)
+        self._centerSketchPoint = centerPoint
+        self._radius = radius
+
+    @property
+    def centerSketchPoint(self):
+        return self._centerSketchPoint
+
+    @property
+    def radius(self):
+        return self._radius
+
+
+class SketchLines(Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def addByTwoPoints(self, startPoint, endPoint):
+        sketch = self._sketch
+        start = sketch._sketchPoint(startPoint)
+        end = sketch._sketchPoint(endPoint)
+        line = SketchLine(sketch, start, end)
+        self._items.append(line)
+        sketch._connect(start, end)
+        sketch._entityAdded()
+        return line
+
+
+class SketchCircles(Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def addByCenterRadius(self, centerPoint, radius):
+        sketch = self._sketch
+        center = sketch._sketchPoint(centerPoint)
+        circle = SketchCircle(sketch, center, radius)
+        self._items.append(circle)
+        pnt = center._geometry
+        sketch._loops.append((pnt._x - radius, pnt._y - radius, pnt._x + radius, pnt._y + radius))
+        sketch._entityAdded()
+        return circle
+
+
+class SketchCurves(Base):
+    def __init__(self, sketch):
+        self._sketchLines = SketchLines(sketch)
+        self._sketchCircles = SketchCircles(sketch)
+
+    @property
+    def sketchLines(self):
+        return self._sketchLines
+
+    @property
+    def sketchCircles(self):
+        return self._sketchCircles
+
+    @property
+    def count(self):
+        return len(self._sketchLines._items) + len(self._sketchCircles._items)
+
+
+class ProfileLoops(Collection):
+    pass
+
+
+class Profile(Base):
+    def __init__(self, sketch, loopCount, box):
+        self._sketch = sketch
+        self._profileLoops = ProfileLoops([None] * loopCount)
+        self._box = box
+
+    @property
+    def profileLoops(self):
+        return self._profileLoops
+
+    @property
+    def parentSketch(self):
+        return self._sketch
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(Point3D(self._box[0], self._box[1], 0), Point3D(self._box[2], self._box[3], 0))
+
+
+class Profiles(Collection):
+    pass
+
+
+class Sketch(Entity):
+    def __init__(self, component, plane):
+        super().__init__(component._design)
+        self._component = component
+        self._isComputeDeferred = False
+        self._sketchPoints = SketchPoints()
+        self._sketchPoints._sketch = self
+        self._sketchCurves = SketchCurves(self)
+        self._profiles = None
+
+        # Union-find of the connected sketch points, used to find closed loops.
+        self._parents = []
+        self._boxes = []
+        self._loops = []
+
+        # Set up the sketch coordinate system from the plane.
+        n = plane._normal
+        length = math.sqrt(n._x ** 2 + n._y ** 2 + n._z ** 2)
+        normal = (n._x / length, n._y / length, n._z / length)
+        if abs(normal[2]) > 0.9:
+            xDir = (1.0, 0.0, 0.0)
+        else:
+            xDir = (-normal[1], normal[0], 0.0)
+        length = math.sqrt(xDir[0] ** 2 + xDir[1] ** 2 + xDir[2] ** 2)
+        xDir = (xDir[0] / length, xDir[1] / length, xDir[2] / length)
+        yDir = (normal[1] * xDir[2] - normal[2] * xDir[1], normal[2] * xDir[0] - normal[0] * xDir[2], normal[0] * xDir[1] - normal[1] * xDir[0])
+        self._origin = plane._origin._copy()
+        self._axes = (xDir, yDir, normal)
+
+    @property
+    def isComputeDeferred(self):
+        return self._isComputeDeferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, value):
+        self._isComputeDeferred = value
+        self._profiles = None
+
+    @property
+    def parentComponent(self):
+        return self._component
+
+    @property
+    def sketchPoints(self):
+        return self._sketchPoints
+
+    @property
+    def sketchCurves(self):
+        return self._sketchCurves
+
+    @property
+    def origin(self):
+        return self._origin._copy()
+
+    @property
+    def xDirection(self):
+        return Vector3D(*self._axes[0])
+
+    @property
+    def yDirection(self):
+        return Vector3D(*self._axes[1])
+
+    @property
+    def profiles(self):
+        if self._profiles is None:
+            self._profiles = self._computeProfiles()
+        return self._profiles
+
+    def modelToSketchSpace(self, modelPoint):
+        return Point3D(*self._toSketch(modelPoint))
+
+    def sketchToModelSpace(self, sketchPoint):
+        return self._toModel(sketchPoint)
+
+    def project(self, entity):
+        point = SketchPoint(self, Point3D(*self._toSketch(entity._modelPoint())))
+        self._entityAdded()
+        return ObjectCollection([point])
+
+    def _toSketch(self, pnt):
+        vec = (pnt._x - self._origin._x, pnt._y - self._origin._y, pnt._z - self._origin._z)
+        return tuple(vec[0] * axis[0] + vec[1] * axis[1] + vec[2] * axis[2] for axis in self._axes)
+
+    def _toModel(self, pnt):
+        origin = self._origin
+        (xDir, yDir, zDir) = self._axes
+        return Point3D(origin._x + pnt._x * xDir[0] + pnt._y * yDir[0] + pnt._z * zDir[0],
+                       origin._y + pnt._x * xDir[1] + pnt._y * yDir[1] + pnt._z * zDir[1],
+                       origin._z + pnt._x * xDir[2] + pnt._y * yDir[2] + pnt._z * zDir[2])
+
+    # Counts the sketch compute that Fusion does when an entity is added.
+    def _entityAdded(self):
+        self._profiles = None
+        if not self._isComputeDeferred:
+            _count('Sketch.compute')
+
+    # Returns the sketch point for the input point, creating one if a Point3D was given.
+    def _sketchPoint(self, point):
+        if isinstance(point, SketchPoint):
+            return point
+        return SketchPoint(self, point._copy())
+
+    def _addPoint(self, point):
+        self._sketchPoints._items.append(point)
+        pnt = point._geometry
+        self._parents.append(len(self._parents))
+        self._boxes.append((pnt._x, pnt._y, pnt._x, pnt._y))
+        return len(self._parents) - 1
+
+    def _find(self, id):
+        parents = self._parents
+        while parents[id] != id:
+            parents[id] = parents[parents[id]]
+            id = parents[id]
+        return id
+
+    # Connects two sketch points and records a loop if they were already connected.
+    def _connect(self, start, end):
+        startRoot = self._find(start._id)
+        endRoot = self._find(end._id)
+        if startRoot == endRoot:
+            self._loops.append(self._boxes[startRoot])
+        else:
+            (box1, box2) = (self._boxes[startRoot], self._boxes[endRoot])
+            self._parents[endRoot] = startRoot
+            self._boxes[startRoot] = (min(box1[0], box2[0]), min(box1[1], box2[1]), max(box1[2], box2[2]), max(box1[3], box2[3]))
+
+    # Groups the loops whose bounding rectangles overlap and creates the profiles.
+    def _computeProfiles(self):
+        loops = self._loops
+        profiles = Profiles()
+        if not loops:
+            return profiles
+
+        cellSize = max(max(box[2] - box[0], box[3] - box[1]) for box in loops) or 1.0
+        groups = list(range(len(loops)))
+
+        def find(id):
+            while groups[id] != id:
+                groups[id] = groups[groups[id]]
+                id = groups[id]
+            return id
+
+        cells = {}
+        for (index, box) in enumerate(loops):
+            for i in range(math.floor(box[0] / cellSize), math.floor(box[2] / cellSize) + 1):
+                for j in range(math.floor(box[1] / cellSize), math.floor(box[3] / cellSize) + 1):
+                    cell = cells.setdefault((i, j), [])
+                    for other in cell:
+                        otherBox = loops[other]
+                        if box[0] < otherBox[2] and otherBox[0] < box[2] and box[1] < otherBox[3] and otherBox[1] < box[3]:
+                            groups[find(index)] = find(other)
+                    cell.append(index)
+
+        groupSizes = {}
+        for index in range(len(loops)):
+            root = find(index)
+            groupSizes[root] = groupSizes.get(root, 0) + 1
+
+        for (index, box) in enumerate(loops):
+            profiles._items.append(Profile(self, 1, box))
+            if groupSizes[find(index)] > 1 and find(index) != index:
+                # Each overlap creates an additional region.
+                profiles._items.append(Profile(self, 1, box))
+        return profiles
+
+
+class Sketches(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def add(self, planarEntity, occurrenceForCreation=None):
+        sketch = Sketch(self._component, planarEntity._geometry)
+        sketch._name = 'Sketch{}'.format(len(self._items) + 1)
+        self._items.append(sketch)
+        self._component._design._addToTimeline(sketch)
+        return sketch
+
+
+class ExtrudeFeatureInput(Base):
+    def __init__(self, profile, operation):
+        self._profile = profile
+        self._operation = operation
+        self._extent = None
+        self._participantBodies = []
+
+    @property
+    def profile(self):
+        return self._profile
+
+    @property
+    def operation(self):
+        return self._operation
+
+    @property
+    def participantBodies(self):
+        return list(self._participantBodies)
+
+    @participantBodies.setter
+    def participantBodies(self, value):
+        self._participantBodies = list(value)
+
+    def setDistanceExtent(self, isSymmetric, distance):
+        self._extent = ('distance', isSymmetric, distance._realValue)
+        return True
+
+    def setAllExtent(self, direction):
+        self._extent = ('all', direction)
+        return True
+
+
+class ExtrudeFeature(Entity):
+    def __init__(self, design, input):
+        super().__init__(design)
+        self._input = input
+        self._timelineObject = design._addToTimeline(self)
+
+    @property
+    def timelineObject(self):
+        return self._timelineObject
+
+
+class ExtrudeFeatures(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, profile, operation):
+        return ExtrudeFeatureInput(profile, operation)
+
+    def add(self, input):
+        if input._extent is None:
+            raise RuntimeError('3 : No extent has been defined.')
+        feature = ExtrudeFeature(self._component._design, input)
+        self._items.append(feature)
+        return feature
+
+
+class Features(Base):
+    def __init__(self, component):
+        self._extrudeFeatures = ExtrudeFeatures(component)
+        self._baseFeatures = BaseFeatures(component)
+
+    @property
+    def extrudeFeatures(self):
+        return self._extrudeFeatures
+
+    @property
+    def baseFeatures(self):
+        return self._baseFeatures
+
+
+class Occurrences(Collection):
+    pass
+
+
+class Component(Entity):
+    def __init__(self, design, name):
+        super().__init__(design)
+        self._name = name
+        self._description = ''
+        self._sketches = Sketches(self)
+        self._features = Features(self)
+        self._bRepBodies = BRepBodies()
+        self._constructionPoints = ConstructionPoints(self)
+        self._occurrences = Occurrences()
+        self._xYConstructionPlane = ConstructionPlane(design, Plane(Point3D(0, 0, 0), Vector3D(0, 0, 1)), 'XY')
+        self._xZConstructionPlane = ConstructionPlane(design, Plane(Point3D(0, 0, 0), Vector3D(0, 1, 0)), 'XZ')
+        self._yZConstructionPlane = ConstructionPlane(design, Plane(Point3D(0, 0, 0), Vector3D(1, 0, 0)), 'YZ')
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def description(self):
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+
+    @property
+    def parentDesign(self):
+        return self._design
+
+    @property
+    def sketches(self):
+        return self._sketches
+
+    @property
+    def features(self):
+        return self._features
+
+    @property
+    def bRepBodies(self):
+        return self._bRepBodies
+
+    @property
+    def constructionPoints(self):
+        return self._constructionPoints
+
+    @property
+    def occurrences(self):
+        return self._occurrences
+
+    @property
+    def allOccurrences(self):
+        return Occurrences()
+
+    @property
+    def xYConstructionPlane(self):
+        return self._xYConstructionPlane
+
+    @property
+    def xZConstructionPlane(self):
+        return self._xZConstructionPlane
+
+    @property
+    def yZConstructionPlane(self):
+        return self._yZConstructionPlane
+
+    # Adds a box shaped body to the component.
+    def _addBody(self, minPoint, maxPoint, name='Body'):
+        body = BRepBody(self._design, minPoint, maxPoint, name)
+        self._bRepBodies._items.append(body)
+        return body
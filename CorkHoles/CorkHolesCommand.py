@@ -0,0 +1,298 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#    
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+import adsk.core, adsk.fusion, traceback
+import os, sys, time
+
+# The modules shared by the add-ins are in the Common folder next to the add-in folders.
+_commonDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Common')
+if _commonDir not in sys.path:
+    sys.path.append(_commonDir)
+import HandlerRegistry, GeometryKernel, ApiTrace
+
+def findHoleEdges(inBody):
+    try:
+        body = adsk.fusion.BRepBody.cast(inBody)
+        
+        # Initialize a list that's used to return information about the found "hole" edges.
+        corkPositions = []
+        
+        # Iterate over all the edges looking for "hole" edges.
+        for edge in body.edges:
+            if not edge.isDegenerate:
+                # Check to see if the edge is a circle.
+                if edge.geometry.curveType == adsk.core.Curve3DTypes.Circle3DCurveType:
+                    # Get the two faces that are connected by the edge.
+                    cylinderFace = None
+                    planeFace = None
+                    for face in edge.faces:
+                        if face.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType:
+                            cylinderFace = face
+                        elif face.geometry.surfaceType == adsk.core.SurfaceTypes.PlaneSurfaceType:
+                            planeFace = face
+        
+                    if cylinderFace and planeFace:
+                        # Check to see if the circular edge is an inner loop of the planar face
+                        # and that the loop consists of a single curve, which is the circular edge.
+                        for planeLoop in planeFace.loops:
+                            if not planeLoop.isOuter and planeLoop.edges.count == 1 and planeLoop.edges[0] == edge:
+                                # Get an arbitrary point on the cylinder and the normal there.
+                                apiPnt = cylinderFace.pointOnFace
+                                (rslt, apiNormal) = cylinderFace.evaluator.getNormalAtPoint(apiPnt)
+                                cyl = cylinderFace.geometry
+                                normal = GeometryKernel.normalize(GeometryKernel.fromAPI(apiNormal))
+        
+                                # Move the point on the cylinder the radius of the cylinder along the normal.
+                                pnt = GeometryKernel.offsetPoint(GeometryKernel.fromAPI(apiPnt), normal, cyl.radius)
+                                
+                                # Check to see if the point lies along the cylinder axis.
+                                # if it does, then this is a hole and not a boss.
+                                axis = GeometryKernel.line(GeometryKernel.fromAPI(cyl.origin), GeometryKernel.fromAPI(cyl.axis))
+                                if GeometryKernel.distanceToLine(pnt, axis) < cyl.radius:
+                                    # Create a matrix that will define the position of the cork.
+                                    (rslt, zDir) = planeFace.evaluator.getNormalAtPoint(planeFace.pointOnFace)
+                                    zDir = GeometryKernel.normalize(GeometryKernel.fromAPI(zDir))
+                                    xDir = normal
+                                    yDir = GeometryKernel.normalize(GeometryKernel.cross(zDir, xDir))
+                                    circle = edge.geometry
+                                    transMatrix = GeometryKernel.coordinateSystem(GeometryKernel.fromAPI(circle.center), xDir, yDir, zDir)
+                                    
+                                    # Save the edge, matrix, and radius.
+                                    corkPositions.append([edge, GeometryKernel.toMatrix3D(transMatrix), circle.radius])
+                                    
+                                break
+    
+        return corkPositions
+    except:
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+    
+    
+# The cork template.  A cork is a cone whose top and bottom radii and height
+# are these multiples of the radius of the hole, so each size is the template
+# scaled by the radius.
+_corkTopRadius = 1.2
+_corkBottomRadius = 0.8
+_corkHeight = 1.5
+
+# The appearance of the corks, which is looked up in the library the first time
+# a cork is created in the session.
+_corkAppearance = None
+
+
+def corkAppearance():
+    global _corkAppearance
+    if not _corkAppearance or not _corkAppearance.isValid:
+        app = adsk.core.Application.get()
+        matLib = app.materialLibraries.itemByName('Fusion 360 Appearance Library')
+        _corkAppearance = matLib.appearances.itemByName('Paint - Enamel Glossy (Yellow)')
+    return _corkAppearance
+
+
+# Returns the components of the corks in the design, keyed by their description.
+def findCorkComponents(design):
+    corkComps = {}
+    for comp in design.allComponents:
+        description = comp.description
+        if description.startswith('Cork_'):
+            corkComps[description] = comp
+    return corkComps
+
+
+# Look for an existing cork of the needed size or create a new one
+# if an existing one isn't found and insert it using the input matrix.
+# New corks are added to corkComps.
+def placeCork(design, radius, matrix, corkComps):
+    try:
+        # Look for an existing component by looking for a pre-defined name.
+        corkName = 'Cork_' + "{0:.6f}".format(radius)
+        checkComp = corkComps.get(corkName)
+        if checkComp:
+            occ = design.rootComponent.occurrences.addExistingComponent(checkComp, matrix)
+            return occ
+                
+        # No existing cork was found so create a new one.
+        occ = design.rootComponent.occurrences.addNewComponent(matrix)
+        
+        corkComp = adsk.fusion.Component.cast(occ.component)
+        corkComp.name = 'Cork (' + design.unitsManager.formatInternalValue(radius, design.unitsManager.defaultLengthUnits, True) + ')'
+        corkComp.description = corkName
+        corkComps[corkName] = corkComp
+
+        # Create the body by scaling the template, with the wide end, which is
+        # jointed to the hole, on the +Z side.
+        height = radius * _corkHeight
+        tempBRep = adsk.fusion.TemporaryBRepManager.get()
+        corkBody = tempBRep.createCylinderOrCone(adsk.core.Point3D.create(0, 0, height/2), radius * _corkTopRadius,
+                                                 adsk.core.Point3D.create(0, 0, -height/2), radius * _corkBottomRadius)
+
+        # Add the body.  Bodies can only be added to a parametric design in a
+        # base feature.
+        if design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+            baseFeature = corkComp.features.baseFeatures.add()
+            baseFeature.startEdit()
+            corkComp.bRepBodies.add(corkBody, baseFeature)
+            baseFeature.finishEdit()
+        else:
+            corkComp.bRepBodies.add(corkBody)
+
+        # Change the color.  The body returned while the base feature was being
+        # edited isn't the body in the finished model, so get it from the new
+        # component, which only has the cork.
+        corkComp.bRepBodies.item(0).appearance = corkAppearance()
+        
+        return occ
+    except:
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# Writes a line of timing information to the TEXT COMMANDS window.
+def writeTiming(message):
+    app = adsk.core.Application.get()
+    textPalette = app.userInterface.palettes.itemById('TextCommands')
+    if textPalette:
+        textPalette.writeText(message)
+
+
+def placeCorks(body):
+    ui = None
+    try:
+        app = adsk.core.Application.get()
+        ui  = app.userInterface
+
+        des = adsk.fusion.Design.cast(app.activeProduct)
+
+        # Get the hole edges in the body.
+        holeInfos = ApiTrace.call(findHoleEdges, body)
+        
+        firstTimelineObj = None
+        lastTimelineObj = None
+
+        # Find the corks that already exist once, instead of for each hole.
+        corkComps = findCorkComponents(des)
+        newCorkTimes = []
+        startTime = time.perf_counter()
+        
+        # Iterate through each edge.
+        for holeInfo in holeInfos:
+            (partEdge, transMatrix, radius) = holeInfo
+
+            # Place the cork, timing the creation of each new size.
+            corkCount = len(corkComps)
+            corkStartTime = time.perf_counter()
+            corkOcc = placeCork(des, radius, transMatrix, corkComps)
+            if len(corkComps) > corkCount:
+                newCorkTimes.append((radius, time.perf_counter() - corkStartTime))
+            
+            # Find the top edge of the cork, which is the circular edge that is larger than the defined radius, 
+            corkComp = corkOcc.component
+            corkBody = corkComp.bRepBodies.item(0)
+            topEdge = None
+            for corkEdge in corkBody.edges:
+                if corkEdge.geometry.curveType == adsk.core.Curve3DTypes.Circle3DCurveType:
+                    circle = adsk.core.Circle3D.cast(corkEdge.geometry)
+                    if circle.radius > radius:
+                        topEdge = corkEdge
+                        break
+
+            # The edge was found in the context of the cork part.  Create
+            # a proxy in the context of the root component.
+            topEdge = topEdge.createForAssemblyContext(corkOcc)
+            
+            # Create a joint between the part edge and the cork edge.                        
+            partJointGeom = adsk.fusion.JointGeometry.createByCurve(partEdge, adsk.fusion.JointKeyPointTypes.CenterKeyPoint)
+            corkJointGeom = adsk.fusion.JointGeometry.createByCurve(topEdge, adsk.fusion.JointKeyPointTypes.CenterKeyPoint)
+            jointInput = corkComp.joints.createInput(corkJointGeom, partJointGeom)
+            jointInput.offset = adsk.core.ValueInput.createByReal(-radius * _corkHeight / 2)
+            jointInput.isFlipped = True            
+            joint = corkOcc.sourceComponent.joints.add(jointInput)
+ 
+            # Capture the first and last timeline objects.
+            if not firstTimelineObj:
+                firstTimelineObj = corkOcc.timelineObject
+                
+            lastTimelineObj = joint.timelineObject
+                
+        # Report the time taken to create each new size of cork.
+        if holeInfos:
+            um = des.unitsManager
+            newCorks = ', '.join('{} {:.3f} s'.format(um.formatInternalValue(radius, um.defaultLengthUnits, True), seconds) for (radius, seconds) in newCorkTimes)
+            writeTiming('CorkHoles: {} corks, {} new sizes{}.  Total: {:.3f} s'.format(
+                        len(holeInfos), len(newCorkTimes), ' (' + newCorks + ')' if newCorks else '', time.perf_counter() - startTime))
+                
+        # Return the first and last timeline objects that were created as part of this cork.
+        return (firstTimelineObj, lastTimelineObj)
+    except:
+        if ui:
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+class MyExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            app = adsk.core.Application.get()
+            ui  = app.userInterface
+    
+            inputs = args.command.commandInputs
+            
+            # Get the selected bodies before the processing begins because the selection will be cleared.
+            selectInput = inputs.itemById('selectEnt')
+            bodies = []
+            for i in range(0, selectInput.selectionCount):
+                bodies.append(selectInput.selection(i).entity)
+    
+            # Place the corks on each body.
+            firstTimelineObject = None
+            lastTimelineObject = None
+            for body in bodies:
+                (first, last) = placeCorks(body)
+                if not firstTimelineObject:
+                    firstTimelineObject = first            
+
+                lastTimelineObject = last
+    
+            if firstTimelineObject and lastTimelineObject:
+                des = adsk.fusion.Design.cast(app.activeProduct)            
+                group = des.timeline.timelineGroups.add(firstTimelineObject.index, lastTimelineObject.index)
+            else:
+                ui.messageBox('No holes were found.')
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# CommandCreated event handler class.
+class MyCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            command = adsk.core.Command.cast(args.command)
+            inputs = command.commandInputs
+            
+            selectInput = inputs.addSelectionInput('selectEnt', 'Bodies', 'Select 1 or more bodies.')
+            selectInput.addSelectionFilter('Bodies')
+            selectInput.setSelectionLimits(1, 0)
+
+            # The handlers of the command are released when the command is destroyed.
+            scope = HandlerRegistry.commandScope(command, 'CorkHoles')
+            scope.add(command.execute, MyExecuteHandler())
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
@@ -0,0 +1,124 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Readers for files that define cutout locations.  The readers are generators
+# so each location is handed back as soon as it's been read and the file is
+# never held in memory, which allows very large files to be imported.
+#
+# Each location is returned as a tuple of (x, y, z, shape, size).  The z value
+# is None when the location was only defined by X and Y, in which case the
+# coordinates are in the space of the sketch.  Otherwise the coordinates are
+# in model space.  The shape and size are None when they weren't specified.
+# All values are returned as they are in the file without any unit conversion.
+
+import csv, os
+
+# Valid shape names, keyed by their lower case name.
+_shapeNames = {'square': 'Square', 'circle': 'Circle', 'pentagon': 'Pentagon'}
+
+_csvColumns = ('x', 'y', 'z', 'shape', 'size')
+
+
+# Reads the locations from the file, using the extension to determine the format.
+def readLocations(filename):
+    if os.path.splitext(filename)[1].lower() == '.dxf':
+        return readDXFLocations(filename)
+    else:
+        return readCSVLocations(filename)
+
+
+# Reads the locations from a CSV file.  Each row is x, y, z, shape, size where
+# everything after y is optional and can be left empty.  An optional header row
+# that uses those names can be used to define the columns in a different order.
+def readCSVLocations(filename):
+    with open(filename, newline='') as csvFile:
+        reader = csv.reader(csvFile)
+        columns = None
+        for row in reader:
+            # Skip empty rows and comments.
+            if len(row) == 0 or row[0].strip() == '' or row[0].lstrip().startswith('#'):
+                continue
+
+            if not columns:
+                names = [field.strip().lower() for field in row]
+                if 'x' in names and 'y' in names:
+                    # It's a header so map the known names to their columns.
+                    columns = [names.index(name) if name in names else -1 for name in _csvColumns]
+                    continue
+                else:
+                    columns = list(range(0, len(_csvColumns)))
+
+            values = []
+            for column in columns:
+                if column >= 0 and column < len(row):
+                    values.append(row[column].strip())
+                else:
+                    values.append('')
+
+            try:
+                x = float(values[0])
+                y = float(values[1])
+                z = float(values[2]) if values[2] else None
+                size = float(values[4]) if values[4] else None
+            except ValueError:
+                raise ValueError('Invalid value on line {} of "{}".'.format(reader.line_num, filename))
+
+            yield (x, y, z, _shapeName(values[3], filename), size)
+
+
+# Reads the locations from the POINT entities in the ENTITIES section of an
+# ASCII DXF file.  Other entity types are ignored.  A DXF file is treated as a
+# 2D layout of the face so only the X and Y of each point is used.
+def readDXFLocations(filename):
+    with open(filename, errors='replace') as dxfFile:
+        inEntities = False
+        point = None
+        while True:
+            code = dxfFile.readline()
+            value = dxfFile.readline()
+            if not code:
+                break
+
+            code = code.strip()
+            value = value.strip()
+            if code == '0':
+                # The start of a new entity, so return the previous point if there is one.
+                if point:
+                    yield (point[0], point[1], None, None, None)
+                    point = None
+
+                if value == 'POINT' and inEntities:
+                    point = [0.0, 0.0]
+                elif value == 'ENDSEC':
+                    inEntities = False
+                elif value == 'EOF':
+                    break
+            elif code == '2' and value == 'ENTITIES':
+                inEntities = True
+            elif point and code == '10':
+                point[0] = float(value)
+            elif point and code == '20':
+                point[1] = float(value)
+
+        if point:
+            yield (point[0], point[1], None, None, None)
+
+
+# Returns the standard name for a shape or None if one isn't specified.
+def _shapeName(name, filename):
+    if not name:
+        return None
+
+    shape = _shapeNames.get(name.lower())
+    if not shape:
+        raise ValueError('Unknown shape "{}" in "{}".'.format(name, filename))
+    return shape
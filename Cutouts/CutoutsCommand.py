@@ -0,0 +1,509 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#    
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+import adsk.core, adsk.fusion, traceback
+import math, time, itertools, os, sys
+from . import CutoutLocations
+
+# The modules shared by the add-ins are in the Common folder next to the add-in folders.
+_commonDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Common')
+if _commonDir not in sys.path:
+    sys.path.append(_commonDir)
+import HandlerRegistry, GeometryKernel, ApiTrace
+
+activeDoc = None
+
+# The normalized equation of the selected plane, as (a, b, c, d) as used by
+# GeometryKernel, which is computed when the plane selection changes.
+_planeEquation = None
+
+# Tolerance used to determine if a point lies on the plane.
+_onPlaneTolerance = 0.00001
+
+# Called when the command is executed.  However, because this command
+# is using the ExecutePreview event and is setting the isValidResult property
+# to true, the results created in the preview will be used as the final
+# results and the Execute will not be called.
+class CutoutCommandExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Get the inputs entered in the dialog.
+            inputs = args.command.commandInputs
+            result = getInput(inputs)
+            
+            # Draw the geometry.
+            app = adsk.core.Application.get()
+            ApiTrace.call(drawGeometry, *result)
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))    
+
+
+class CutoutCommandExecutePreviewHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        # Code to react to the event.
+        try:
+            cmdArgs = adsk.core.CommandEventArgs.cast(args)
+
+            # Get the current value of inputs entered in the dialog.
+            inputs = cmdArgs.command.commandInputs
+            result = getInput(inputs)
+            
+            # Draw the preview geometry.
+            ApiTrace.call(drawGeometry, *result)
+            
+            # Set this property indicating that the preview is a good
+            # result and can be used as the final result when the command
+            # is executed.
+            cmdArgs.isValidResult = True            
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))    
+
+
+# Sets the cached plane equation for the currently selected plane.
+def setSelectedPlane(planeInput):
+    global _planeEquation
+    if planeInput.selectionCount == 1:
+        _planeEquation = GeometryKernel.planeFromAPI(planeInput.selection(0).entity.geometry)
+    else:
+        _planeEquation = None
+
+
+# Checks if the sketch point lies on the selected plane.  The point in model
+# space is checked against the cached plane equation, which is a single API
+# call and a dot product.  The points aren't compared by entity token because
+# two tokens for the same entity aren't guaranteed to be the same.
+def isSketchPointOnPlane(skPoint):
+    pnt = GeometryKernel.fromAPI(skPoint.worldGeometry)
+    return math.fabs(GeometryKernel.distanceToPlane(pnt, _planeEquation)) < _onPlaneTolerance
+
+
+class CutoutCommandInputChangedHandler(adsk.core.InputChangedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Check to see if it's the plane input.
+            if args.input.id == 'planeSelect':
+                # Enable/disable the point input field depending on if the plane input has been specified.
+                planeInput = args.input
+                setSelectedPlane(planeInput)
+                pointInput = args.firingEvent.sender.commandInputs.itemById('pointSelect')
+                if planeInput.selectionCount == 1:
+                    pointInput.isEnabled = True
+                else:
+                    pointInput.clearSelection()
+                    pointInput.isEnabled = False
+            elif args.input.id == 'tiledMode':
+                tileSizeInput = args.firingEvent.sender.commandInputs.itemById('tileSize')
+                tileSizeInput.isEnabled = args.input.value
+            elif args.input.id == 'importButton':
+                # Get the file that defines the locations.
+                app = adsk.core.Application.get()
+                fileDialog = app.userInterface.createFileDialog()
+                fileDialog.title = 'Import Cutout Locations'
+                fileDialog.filter = 'Location files (*.csv;*.dxf);;CSV files (*.csv);;DXF files (*.dxf)'
+                if fileDialog.showOpen() == adsk.core.DialogResults.DialogOK:
+                    inputs = args.firingEvent.sender.commandInputs
+                    inputs.itemById('importFile').text = fileDialog.filename
+
+                    # Points no longer need to be selected because the file defines the locations.
+                    inputs.itemById('pointSelect').setSelectionLimits(0, 0)
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))    
+    
+
+
+class CutoutCommandSelectionEventHandler(adsk.core.SelectionEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Check to see that selection of points is being done.
+            if args.firingEvent.activeInput.id == 'pointSelect':
+                # Get the equation of the selected plane if it hasn't already been computed.
+                if not _planeEquation:
+                    setSelectedPlane(args.firingEvent.sender.commandInputs.itemById('planeSelect'))
+                
+                # Validate that the point lies on the plane and set whether it is selectable or not.
+                ent = args.selection.entity
+                if ent.objectType == adsk.fusion.SketchPoint.classType():
+                    args.isSelectable = isSketchPointOnPlane(ent)
+                else:
+                    args.isSelectable = math.fabs(GeometryKernel.distanceToPlane(GeometryKernel.fromAPI(ent.geometry), _planeEquation)) < _onPlaneTolerance
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))    
+
+
+# Event handler class.
+class CutoutCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            
+            global activeDoc, _planeEquation
+            activeDoc = app.activeDocument
+            _planeEquation = None
+    
+            # Define the command dialog.
+            cmd = adsk.core.Command.cast(args.command)
+            cmdInputs = cmd.commandInputs
+            
+            # Create the selector for the plane.
+            planeInput = cmdInputs.addSelectionInput('planeSelect', 'Select Plane', 'Select Plane')
+            planeInput.addSelectionFilter('PlanarFaces')
+            planeInput.addSelectionFilter('ConstructionPlanes')
+            planeInput.setSelectionLimits(1,1)
+    
+            # Create the selector for the points.
+            pointInput = cmdInputs.addSelectionInput('pointSelect', 'Select Points', 'Select Points')
+            pointInput.addSelectionFilter('Vertices')
+            pointInput.addSelectionFilter('ConstructionPoints')
+            pointInput.addSelectionFilter('SketchPoints')
+            pointInput.setSelectionLimits(1,0)
+            pointInput.isEnabled = False
+
+            # Create the button to import locations from a file and the text box to show the file.
+            cmdInputs.addBoolValueInput('importButton', 'Import Locations', False, '', False)
+            cmdInputs.addTextBoxCommandInput('importFile', 'Location File', '', 1, True)
+    
+            # Create the list for types of shapes.
+            shapeList = cmdInputs.addDropDownCommandInput('shapeList', 'Shape Type', adsk.core.DropDownStyles.LabeledIconDropDownStyle)
+            shapeList.listItems.add('Square', True, 'Resources/Square', -1)
+            shapeList.listItems.add('Circle', False, 'Resources/Circle', -1)
+            shapeList.listItems.add('Pentagon', False, 'Resources/Pentagon', -1)
+    
+            # Create the slider input for the size.
+            des = adsk.fusion.Design.cast(app.activeProduct)
+            um = des.unitsManager
+            oneUnit = um.convert(1, des.unitsManager.defaultLengthUnits, 'cm') * 4
+            sizeSlider = cmdInputs.addFloatSliderCommandInput('sizeSlider', 'Size', des.unitsManager.defaultLengthUnits, oneUnit, oneUnit * 15, False)
+            sizeSlider.valueOne = oneUnit * 4
+            sizeSlider.spinStep = oneUnit/2
+
+            # Create the inputs to split the shapes into multiple sketches, one for each square tile.
+            cmdInputs.addBoolValueInput('tiledMode', 'Tiled Sketches', True, '', False)
+            tileSizeInput = cmdInputs.addValueInput('tileSize', 'Tile Size', des.unitsManager.defaultLengthUnits, adsk.core.ValueInput.createByReal(oneUnit * 25))
+            tileSizeInput.isEnabled = False
+            
+            # The handlers of the command are released when the command is destroyed.
+            scope = HandlerRegistry.commandScope(cmd, 'Cutouts')
+
+            # Connect to the execute event.
+            scope.add(cmd.execute, CutoutCommandExecuteHandler())
+    
+            # Connect to the execute preview event.
+            scope.add(cmd.executePreview, CutoutCommandExecutePreviewHandler())
+            
+            # Connect to the input changed event.
+            scope.add(cmd.inputChanged, CutoutCommandInputChangedHandler())
+            
+            # Connect to the selection event.
+            scope.add(cmd.selectionEvent, CutoutCommandSelectionEventHandler())
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))    
+
+
+# Gets the current values from the command dialog.
+def getInput(inputs):
+    try:
+        for input in inputs:        
+            if input.id == 'planeSelect':
+                planeEnt = input.selection(0).entity
+            elif input.id == 'pointSelect':
+                pointEnts = adsk.core.ObjectCollection.create()
+                for i in range(0, input.selectionCount):
+                    pointEnts.add(input.selection(i).entity)
+            elif input.id == 'sizeSlider':
+                size = input.valueOne
+            elif input.id == 'shapeList':
+                shape = input.selectedItem.name
+            elif input.id == 'importFile':
+                importFilename = input.text
+            elif input.id == 'tiledMode':
+                isTiled = input.value
+            elif input.id == 'tileSize':
+                tileSize = input.value
+
+        if not isTiled:
+            tileSize = 0
+                
+        return (planeEnt, pointEnts, shape, size, importFilename, tileSize)
+    except:
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))    
+
+   
+# Draws the shapes based on the input argument.  The locations are defined by
+# the selected points and by the locations read from the import file, if one
+# was specified.  If a tile size is specified, the locations are split into
+# square tiles of that size and each tile is drawn in its own sketch.
+def drawGeometry(planeEnt, pointEnts, shape, size, importFilename='', tileSize=0):
+    try:
+        # Get the design.
+        app = adsk.core.Application.get()
+        des = adsk.fusion.Design.cast(app.activeProduct)
+        startTime = time.perf_counter()
+        
+        # Create a new sketch plane.
+        sk = des.rootComponent.sketches.add(planeEnt)    
+        sketches = [sk]
+
+        # The sketch space bounding rectangle of all the shapes, as [minX, minY, maxX, maxY].
+        footprint = [math.inf, math.inf, -math.inf, -math.inf]
+        shapeCount = 0
+
+        if tileSize > 0:
+            # Sort the locations into tiles.
+            locations = selectedLocations(sk, pointEnts, shape, size)
+            if importFilename:
+                locations = itertools.chain(locations, importedLocations(sk, importFilename, shape, size))
+
+            tiles = {}
+            for location in locations:
+                key = (math.floor(location[0] / tileSize), math.floor(location[1] / tileSize))
+                tiles.setdefault(key, []).append(location)
+
+            # Draw each tile in its own sketch, deferring the compute until the tile is finished.
+            tileSketch = sk
+            for tileLocations in tiles.values():
+                if not tileSketch:
+                    tileSketch = des.rootComponent.sketches.add(planeEnt)
+                    sketches.append(tileSketch)
+
+                tileSketch.isComputeDeferred = True
+                for (x, y, locShape, locSize) in tileLocations:
+                    drawShape(tileSketch, x, y, locShape, locSize)
+                    addToFootprint(footprint, x, y, locSize)
+                tileSketch.isComputeDeferred = False
+                shapeCount += len(tileLocations)
+                tileSketch = None
+        else:
+            sk.isComputeDeferred = True
+            for pntEnt in pointEnts:
+                # Project the point onto the sketch.
+                skPnt = sk.project(pntEnt).item(0)
+                pntGeom = skPnt.geometry
+                drawShape(sk, pntGeom.x, pntGeom.y, shape, size, skPnt)
+                addToFootprint(footprint, pntGeom.x, pntGeom.y, size)
+                shapeCount += 1
+
+            if importFilename:
+                # Draw the shapes directly at the imported locations, without creating sketch points.
+                for (x, y, locShape, locSize) in importedLocations(sk, importFilename, shape, size):
+                    drawShape(sk, x, y, locShape, locSize)
+                    addToFootprint(footprint, x, y, locSize)
+                    shapeCount += 1
+            sk.isComputeDeferred = False
+        sketchTime = time.perf_counter()
+    
+        # Find the inner profiles (only those with one loop) of all the sketches.
+        profiles = adsk.core.ObjectCollection.create()
+        for profileSketch in sketches:
+            for prof in profileSketch.profiles:
+                if prof.profileLoops.count == 1:
+                    profiles.add(prof)
+        profileTime = time.perf_counter()
+
+        # Create the extrude feature, limiting it to the bodies the shapes overlap and
+        # only extending it far enough to cut completely through them.
+        input = des.rootComponent.features.extrudeFeatures.createInput(profiles, adsk.fusion.FeatureOperations.CutFeatureOperation)
+        (bodies, distance) = getCutBodiesAndExtent(des, sk, footprint)
+        if bodies:
+            input.participantBodies = bodies
+            input.setDistanceExtent(True, adsk.core.ValueInput.createByReal(distance))
+        else:
+            input.setAllExtent(adsk.fusion.ExtentDirections.SymmetricExtentDirection)
+        extrude = des.rootComponent.features.extrudeFeatures.add(input)
+        endTime = time.perf_counter()
+
+        # Report the time taken by each stage so the tile size can be tuned.
+        if tileSize > 0:
+            tileDesc = 'tile size ' + des.unitsManager.formatInternalValue(tileSize, des.unitsManager.defaultLengthUnits, True)
+        else:
+            tileDesc = 'not tiled'
+        writeTiming('Cutouts: {} shapes, {} sketches ({}), {} profiles.  Sketch: {:.3f} s, Profiles: {:.3f} s, Cut: {:.3f} s, Total: {:.3f} s'.format(
+                    shapeCount, len(sketches), tileDesc, profiles.count, sketchTime - startTime, profileTime - sketchTime, endTime - profileTime, endTime - startTime))
+    except:
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))    
+
+
+# Writes a line of timing information to the TEXT COMMANDS window.
+def writeTiming(message):
+    app = adsk.core.Application.get()
+    textPalette = app.userInterface.palettes.itemById('TextCommands')
+    if textPalette:
+        textPalette.writeText(message)
+
+
+# Generator that returns the sketch coordinates, shape, and size of each
+# selected point, without projecting the points into the sketch.
+def selectedLocations(sk, pointEnts, shape, size):
+    for pntEnt in pointEnts:
+        if pntEnt.objectType == adsk.fusion.SketchPoint.classType():
+            pnt = pntEnt.worldGeometry
+        else:
+            pnt = pntEnt.geometry
+
+        skPnt = sk.modelToSketchSpace(pnt)
+        yield (skPnt.x, skPnt.y, shape, size)
+
+
+# Expands the footprint rectangle to include a shape of the given size at x, y.
+def addToFootprint(footprint, x, y, size):
+    halfSize = size/2
+    footprint[0] = min(footprint[0], x - halfSize)
+    footprint[1] = min(footprint[1], y - halfSize)
+    footprint[2] = max(footprint[2], x + halfSize)
+    footprint[3] = max(footprint[3], y + halfSize)
+
+
+# Finds the solid bodies in the design whose bounding box overlaps the footprint of
+# the shapes and computes the distance the cut needs to extend on each side of the
+# sketch plane to go completely through them.  Returns the list of bodies and the
+# distance.  The list is empty if no bodies were found.
+def getCutBodiesAndExtent(des, sk, footprint):
+    bodies = []
+    distance = 0
+    if footprint[0] > footprint[2]:
+        return (bodies, distance)
+
+    # Get the sketch coordinate system in model space.
+    origin = sk.origin
+    xDir = sk.xDirection
+    yDir = sk.yDirection
+    zDir = xDir.crossProduct(yDir)
+    zDir.normalize()
+    axes = ((xDir.x, xDir.y, xDir.z), (yDir.x, yDir.y, yDir.z), (zDir.x, zDir.y, zDir.z))
+
+    # Get the bodies in the root component and the proxies of the bodies in all occurrences.
+    candidates = list(des.rootComponent.bRepBodies)
+    for occ in des.rootComponent.allOccurrences:
+        candidates.extend(occ.bRepBodies)
+
+    for body in candidates:
+        if not body.isSolid:
+            continue
+
+        # Get the extents of the bounding box in sketch space.
+        box = body.boundingBox
+        minPnt = box.minPoint
+        maxPnt = box.maxPoint
+        mins = [math.inf, math.inf, math.inf]
+        maxs = [-math.inf, -math.inf, -math.inf]
+        for x in (minPnt.x, maxPnt.x):
+            for y in (minPnt.y, maxPnt.y):
+                for z in (minPnt.z, maxPnt.z):
+                    vec = (x - origin.x, y - origin.y, z - origin.z)
+                    for i in range(0, 3):
+                        coord = vec[0] * axes[i][0] + vec[1] * axes[i][1] + vec[2] * axes[i][2]
+                        mins[i] = min(mins[i], coord)
+                        maxs[i] = max(maxs[i], coord)
+
+        # Check if the body overlaps the footprint.
+        if maxs[0] < footprint[0] or mins[0] > footprint[2] or maxs[1] < footprint[1] or mins[1] > footprint[3]:
+            continue
+
+        bodies.append(body)
+        distance = max(distance, math.fabs(mins[2]), math.fabs(maxs[2]))
+
+    # Add a little extra so the cut goes cleanly through the bodies.
+    distance = distance * 1.01 + 0.01
+    return (bodies, distance)
+
+
+# Draws a single shape in the sketch, centered at the x, y sketch coordinate.
+# If the center is defined by a sketch point, a circle will use it as its center.
+def drawShape(sk, x, y, shape, size, centerPoint=None):
+    if shape == 'Square':
+        # Draw four lines to define a square.
+        skLines = sk.sketchCurves.sketchLines
+        halfSize = size/2
+        line1 = skLines.addByTwoPoints(adsk.core.Point3D.create(x - halfSize, y - halfSize, 0), adsk.core.Point3D.create(x + halfSize, y - halfSize, 0))
+        line2 = skLines.addByTwoPoints(line1.endSketchPoint, adsk.core.Point3D.create(x + halfSize, y + halfSize, 0))
+        line3 = skLines.addByTwoPoints(line2.endSketchPoint, adsk.core.Point3D.create(x - halfSize, y + halfSize, 0))
+        line4 = skLines.addByTwoPoints(line3.endSketchPoint, line1.startSketchPoint)
+    elif shape == 'Circle':
+        # Draw a circle.
+        if not centerPoint:
+            centerPoint = adsk.core.Point3D.create(x, y, 0)
+        sk.sketchCurves.sketchCircles.addByCenterRadius(centerPoint, size/2)
+    elif shape == 'Pentagon':
+        # Draw five lines to define a pentagon.
+        skLines = sk.sketchCurves.sketchLines
+        angle = math.pi/2
+        halfSize = size/2
+        firstLine = None
+        lastLine = None
+        for i in range(0, 5):
+            if i < 4:
+                nextAngle = angle + math.pi/2.5
+                endPoint = adsk.core.Point3D.create(x + halfSize * math.cos(nextAngle), y + halfSize * math.sin(nextAngle), 0)
+            else:
+                endPoint = firstLine.startSketchPoint
+
+            if lastLine:
+                lastLine = skLines.addByTwoPoints(lastLine.endSketchPoint, endPoint)
+            else:
+                startPoint = adsk.core.Point3D.create(x + halfSize * math.cos(angle), y + halfSize * math.sin(angle), 0)
+                lastLine = skLines.addByTwoPoints(startPoint, endPoint)
+                firstLine = lastLine
+
+            angle = nextAngle
+
+
+# Generator that returns the sketch coordinates, shape, and size of each location
+# in the import file.  Values in the file are in the document's default length units
+# and any shape or size not specified in the file uses the value from the dialog.
+def importedLocations(sk, filename, defaultShape, defaultSize):
+    um = sk.parentComponent.parentDesign.unitsManager
+    scale = um.convert(1, um.defaultLengthUnits, 'cm')
+
+    for (x, y, z, shape, size) in CutoutLocations.readLocations(filename):
+        if z is None:
+            # The coordinates are already in sketch space.
+            x = x * scale
+            y = y * scale
+        else:
+            # Transform the model coordinates into sketch space.
+            skPnt = sk.modelToSketchSpace(adsk.core.Point3D.create(x * scale, y * scale, z * scale))
+            x = skPnt.x
+            y = skPnt.y
+
+        if shape is None:
+            shape = defaultShape
+
+        if size is None:
+            size = defaultSize
+        else:
+            size = size * scale
+
+        yield (x, y, shape, size)
@@ -0,0 +1,315 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#    
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+import adsk.core, adsk.fusion, traceback
+import math, os, sys, time
+
+# The modules shared by the add-ins are in the Common folder next to the add-in folders.
+_commonDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Common')
+if _commonDir not in sys.path:
+    sys.path.append(_commonDir)
+import HandlerRegistry, GeometryKernel, EntityCache, ApiTrace
+
+# The number of points of an approximation that are also evaluated exactly to
+# measure how close the approximation is.
+_spotCheckCount = 9
+
+# Returns the points and normals, as tuples, on the face that are evenly spaced
+# in the parametric space of the surface, where the number of points is defined
+# by the input density argument.  The points are ordered by U and then by V.
+# When approximate is True they're interpolated from the display mesh of the
+# face instead of evaluated exactly.  The preview is redrawn every time an input
+# changes so the results are cached until the model changes.
+def evaluateFace(face, density, approximate=False):
+    if approximate:
+        return EntityCache.getOrCompute('GeometryEval', face, ('mesh', density), lambda: _approximateFace(face, density))
+    return EntityCache.getOrCompute('GeometryEval', face, density, lambda: _evaluateFace(face, density))
+
+
+# Returns the (u, v) parameters of the points, as tuples, and the parametric
+# range of the surface as (minU, minV, maxU, maxV).
+def _parameterGrid(surfEval, density):
+    # Determine the min/max U and V values.
+    paramRange = surfEval.parametricRange()
+    (minU, minV) = paramRange.minPoint.asArray()
+    (maxU, maxV) = paramRange.maxPoint.asArray()
+
+    # Build up an array of UV points on the surface.
+    stepU = (maxU - minU) / density
+    stepV = (maxV - minV) / density
+    params = [(minU + stepU * uCount, minV + stepV * vCount) for uCount in range(0, density+1) for vCount in range(0, density+1)]
+    return (params, (minU, minV, maxU, maxV))
+
+
+def _evaluateParameters(surfEval, params):
+    uvParams = [adsk.core.Point2D.create(u, v) for (u, v) in params]
+
+    # Get the positions and normals at the uv values.
+    (retVal, points) = surfEval.getPointsAtParameters(uvParams)
+    (retVal, normals) = surfEval.getNormalsAtParameters(uvParams)
+    return ([GeometryKernel.fromAPI(pnt) for pnt in points], [GeometryKernel.fromAPI(normal) for normal in normals])
+
+
+def _evaluateFace(face, density):
+    surfEval = face.evaluator
+    (params, paramRange) = _parameterGrid(surfEval, density)
+    return _evaluateParameters(surfEval, params)
+
+
+# Interpolates the points and normals from the display mesh of the face, which
+# Fusion already has, instead of evaluating the surface.  The mesh is read using
+# one call for each of its lists.  A few of the points are also evaluated
+# exactly and the largest differences are written to the TEXT COMMANDS window
+# so it's clear whether the approximation is close enough.
+def _approximateFace(face, density):
+    startTime = time.perf_counter()
+    surfEval = face.evaluator
+    (params, (minU, minV, maxU, maxV)) = _parameterGrid(surfEval, density)
+
+    mesh = face.meshManager.displayMeshes.bestMesh
+    textureCoords = mesh.textureCoordinatesAsDouble if mesh else []
+    if not textureCoords:
+        writeMessage('GeometryEval: The face doesn\'t have a display mesh with texture coordinates so it was evaluated exactly.')
+        return _evaluateFace(face, density)
+
+    # The texture coordinates of the mesh can be scaled from the surface parameters
+    # so map the parametric range to the range of the texture coordinates.
+    (meshMinU, meshMaxU) = (min(textureCoords[0::2]), max(textureCoords[0::2]))
+    (meshMinV, meshMaxV) = (min(textureCoords[1::2]), max(textureCoords[1::2]))
+    scaleU = (meshMaxU - meshMinU) / (maxU - minU) if maxU > minU else 1.0
+    scaleV = (meshMaxV - meshMinV) / (maxV - minV) if maxV > minV else 1.0
+    meshParams = [(meshMinU + (u - minU) * scaleU, meshMinV + (v - minV) * scaleV) for (u, v) in params]
+
+    (points, normals) = GeometryKernel.sampleMesh(mesh.nodeCoordinatesAsDouble, mesh.normalVectorsAsDouble, textureCoords, mesh.nodeIndices, meshParams)
+    approximateTime = time.perf_counter() - startTime
+
+    # Compare some of the points, spread evenly through the list, with the exact results.
+    step = max(1, len(params) // _spotCheckCount)
+    checkIndices = list(range(0, len(params), step))[:_spotCheckCount]
+    (exactPoints, exactNormals) = _evaluateParameters(surfEval, [params[i] for i in checkIndices])
+    maxDistance = max(GeometryKernel.distance(points[i], exactPoint) for (i, exactPoint) in zip(checkIndices, exactPoints))
+    maxAngle = max(math.degrees(math.acos(max(-1.0, min(1.0, GeometryKernel.dot(normals[i], GeometryKernel.normalize(exactNormal))))))
+                   for (i, exactNormal) in zip(checkIndices, exactNormals))
+
+    des = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+    writeMessage('GeometryEval: {} points approximated from a mesh of {} triangles in {:.1f} ms.  Spot check of {} points: maximum distance {}, maximum normal angle {:.2f} deg.'.format(
+                 len(points), mesh.triangleCount, approximateTime * 1000, len(checkIndices),
+                 des.unitsManager.formatInternalValue(maxDistance, des.unitsManager.defaultLengthUnits, True), maxAngle))
+    return (points, normals)
+
+
+# Writes a line to the TEXT COMMANDS window.
+def writeMessage(message):
+    app = adsk.core.Application.get()
+    textPalette = app.userInterface.palettes.itemById('TextCommands')
+    if textPalette:
+        textPalette.writeText(message)
+
+
+# Draws sketch lines that represent surface normals on the input face.
+# The normals are evenly spaced in the parametric space of the surface
+# where the number of normals is defined by the input density argument.
+def drawNormals(inputFace, density, approximate=False):
+    sk = None
+    try:
+        face = adsk.fusion.BRepFace.cast(inputFace)
+        app = adsk.core.Application.get()
+        des = adsk.fusion.Design.cast(app.activeProduct)
+
+        (points, normals) = evaluateFace(face, density, approximate)
+
+        # Compute the other end of each normal, which is the length of the normal
+        # away from the point on the surface.
+        length = 2
+        endPoints = GeometryKernel.offsetPoints(points, normals, length)
+
+        # Create a sketch and draw the results.
+        sk = des.rootComponent.sketches.add(des.rootComponent.xYConstructionPlane)
+        lines = sk.sketchCurves.sketchLines
+        sk.isComputeDeferred = True
+        for (pnt1, pnt2) in zip(points, endPoints):
+            # Draw each normal.
+            lines.addByTwoPoints(GeometryKernel.toPoint3D(pnt1), GeometryKernel.toPoint3D(pnt2))
+        sk.isComputeDeferred = False
+    except:
+        if sk:
+            if sk.isValid:
+                sk.isComputeDeferred = False
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        if ui:
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+    
+def getPoint(points, uIndex, vIndex, density):
+    return points[vIndex*(density+1) + uIndex]
+
+# Draws sketch lines that represent iso curves along the surface in the U and V
+# directions.  The iso curves are evenly spaced in the parametric space of the
+# surface where the number of curves is defined by the input density argument.    
+def drawUVCurves(ent, density, approximate=False):
+    sk = None
+    try:
+        face = adsk.fusion.BRepFace.cast(ent)
+        app = adsk.core.Application.get()
+        des = adsk.fusion.Design.cast(app.activeProduct)
+
+        # Create the points once since each is used by up to four lines.
+        (points, normals) = evaluateFace(face, density, approximate)
+        points = [GeometryKernel.toPoint3D(pnt) for pnt in points]
+                
+        # Create a sketch and draw the results.
+        sk = des.rootComponent.sketches.add(des.rootComponent.xYConstructionPlane)
+        lines = sk.sketchCurves.sketchLines
+        sk.isComputeDeferred = True        
+        for vCount in range(0, density+1):
+            for uCount in range(0, density+1):
+                # Draw the lines for the columns.
+                if vCount > 0:
+                    lines.addByTwoPoints(getPoint(points, uCount, vCount, density), getPoint(points, uCount, vCount-1, density))
+                    
+                # Draw the lines for the rows.
+                if uCount > 0:
+                    lines.addByTwoPoints(getPoint(points, uCount, vCount, density), getPoint(points, uCount-1, vCount, density))
+        sk.isComputeDeferred = False
+    except:
+        if sk:
+            if sk.isValid:
+                sk.isComputeDeferred = False
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        if ui:
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# Get the current values of the command inputs.
+def getInputs(inputs):
+    try:
+        selection = inputs.itemById('selectEnt').selection(0)
+        face = selection.entity
+        
+        evalType = inputs.itemById('evalType').selectedItem.name
+        
+        density = int(inputs.itemById('number').value)
+
+        approximate = inputs.itemById('approximate').value
+    
+        return(evalType, face, density, approximate)
+    except:
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        if ui:
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# ExecutePreview event handler class.
+class MyExecutePreviewHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            cmdArgs = adsk.core.CommandEventArgs.cast(args)
+            # Get the current info from the dialog.
+            inputs = cmdArgs.command.commandInputs
+            (evalType, face, density, approximate) = getInputs(inputs)
+            
+            # Draw the results based on the current type specified in the dialog.
+            if evalType == 'Normals':
+                ApiTrace.call(drawNormals, face, density, approximate)
+            elif evalType == 'UV Curves':
+                ApiTrace.call(drawUVCurves, face, density, approximate)
+                
+            # Set this property indicating that the preview is a good
+            # result and can be used as the final result when the command
+            # is executed.
+            cmdArgs.isValidResult = True
+        except:
+            app = adsk.core.Application.get()
+            ui  = app.userInterface
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# Called when the command is executed.  However, because this command
+# is using the ExecutePreview event and is setting the isValidResult property
+# to true, the results created in the preview will be used as the final
+# results and the Execute will not be called.
+class MyExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Get the current info from the dialog.
+            inputs = args.command.commandInputs        
+            (evalType, face, density, approximate) = getInputs(inputs)
+
+            # Draw the results based on the current type specified in the dialog.
+            if evalType == 'Normals':
+                ApiTrace.call(drawNormals, face, density, approximate)
+            elif evalType == 'UV Curves':
+                ApiTrace.call(drawUVCurves, face, density, approximate)
+        except:
+            app = adsk.core.Application.get()
+            ui  = app.userInterface
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# CommandCreated event handler class.
+class MyCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Code to react to the event.
+            command = adsk.core.Command.cast(args.command)
+            inputs = command.commandInputs
+            
+            # Add the selection input to get the one face.
+            selectInput = inputs.addSelectionInput('selectEnt', 'Selection', 'Select an entity')
+            selectInput.addSelectionFilter('Faces')
+            selectInput.setSelectionLimits(1, 1)
+    
+            # Add the selection input to get the points.
+            typeInput = inputs.addDropDownCommandInput('evalType', 'Evaluation Type', adsk.core.DropDownStyles.LabeledIconDropDownStyle)
+            typeInput.listItems.add('Normals', True, '', -1)
+            typeInput.listItems.add('UV Curves', True, '', -1)
+
+            # Add the unitless value input to get the density.            
+            densityInput = inputs.addValueInput('number', 'Density', '', adsk.core.ValueInput.createByString('10'))
+
+            # Add the check box to approximate the results from the display mesh of the face.
+            inputs.addBoolValueInput('approximate', 'Approximate from Mesh', True, '', False)
+
+            # The handlers of the command are released when the command is destroyed.
+            scope = HandlerRegistry.commandScope(command, 'GeometryEval')
+
+            # Connect to the execute preview and execute events.
+            scope.add(command.executePreview, MyExecutePreviewHandler())
+            
+            scope.add(command.execute, MyExecuteHandler())
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# Called by LazyCommand when the module is first imported.
+def start():
+    # The command only adds sketches so it doesn't change the faces that have been evaluated.
+    EntityCache.register('GeometryEval', ['ekinsGeometrySample'])
+
+
+# Called by LazyCommand when the add-in is stopped.
+def stop():
+    EntityCache.release('GeometryEval')
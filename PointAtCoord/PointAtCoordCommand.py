@@ -0,0 +1,416 @@
+#Author-Brian Ekins
+#Description-Create a construction point at the specified X,Y,Z coordinates.
+
+import adsk.core, adsk.fusion, adsk.cam, traceback
+import os, sys, time
+from . import PointImport, PointFilter
+
+# The modules shared by the add-ins are in the Common folder next to the add-in folders.
+_commonDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Common')
+if _commonDir not in sys.path:
+    sys.path.append(_commonDir)
+import HandlerRegistry
+
+_isParametric = False
+_app = adsk.core.Application.get()
+_ui = _app.userInterface
+_design = adsk.fusion.Design.cast(None)
+
+# Index of the base features in each open document, keyed by the creation id of
+# the document.  Each entry is a dictionary with the timeline state the index was
+# built for, the base features keyed by name and the remembered default name.
+_baseFeatureIndex = {}
+
+
+# Event handler for the commandCreated event.
+class CommandCreatedEventHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            eventArgs = adsk.core.CommandCreatedEventArgs.cast(args)
+            cmd = eventArgs.command
+    
+            # The handlers of the command are released when the command is destroyed.
+            scope = HandlerRegistry.commandScope(cmd, 'PointAtCoord')
+
+            # Connect to the execute event.
+            scope.add(cmd.execute, CommandExecuteHandler())
+            
+            # Connect ot the preview event.       
+            scope.add(cmd.executePreview, ExecutePreviewHandler())
+            
+            # Check to see if this is a parametric or direct-edit model.
+            global _design
+            _design = adsk.fusion.Design.cast(_app.activeProduct)
+            if _design:
+                inputs = cmd.commandInputs
+                
+                global _isParametric
+                if _design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+                    _isParametric = True
+                    
+                    # Create a list of base features.
+                    addBaseFeatureList(inputs)
+                else:
+                    _isParametric = False
+                
+                # Add string input to get the name.
+                nameInput = inputs.addStringValueInput('pointName', 'Name', 'XYZ Point')            
+                
+                # Add value inputs to get the X, Y, and Z values.
+                xValInput = inputs.addValueInput('xValInput', 'X Position', _design.unitsManager.defaultLengthUnits, adsk.core.ValueInput.createByReal(0))
+                yValInput = inputs.addValueInput('yValInput', 'Y Position', _design.unitsManager.defaultLengthUnits, adsk.core.ValueInput.createByReal(0))
+                zValInput = inputs.addValueInput('zValInput', 'Z Position', _design.unitsManager.defaultLengthUnits, adsk.core.ValueInput.createByReal(0))
+            else:
+                _ui.messageBox('You must be in a modeling related workspace.')
+                return False
+        except:
+            _ui.messageBox('Unexpected failure:\n{}'.format(traceback.format_exc()))
+
+
+# Event handler for the executePreview event.
+class ExecutePreviewHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        eventArgs = adsk.core.CommandEventArgs.cast(args)
+        DrawPreview(eventArgs.firingEvent.sender.commandInputs)
+
+
+# Event handler for the execute event.
+class CommandExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        eventArgs = adsk.core.CommandEventArgs.cast(args)
+        DrawPoint(eventArgs.command.commandInputs)
+
+
+# Gets the X, Y, and Z values from the command inputs.
+def getCoordinates(inputs):
+    xValInput = adsk.core.ValueCommandInput.cast(inputs.itemById('xValInput'))
+    yValInput = adsk.core.ValueCommandInput.cast(inputs.itemById('yValInput'))
+    zValInput = adsk.core.ValueCommandInput.cast(inputs.itemById('zValInput'))
+    return (xValInput.value, yValInput.value, zValInput.value)
+
+
+# Draws a marker at the specified coordinate using custom graphics.  Custom
+# graphics created during the preview are removed when the preview ends, so
+# nothing is added to the model until the command is executed.
+def DrawPreview(inputs):
+    try:
+        (xVal, yVal, zVal) = getCoordinates(inputs)
+
+        graphics = _design.rootComponent.customGraphicsGroups.add()
+        coords = adsk.fusion.CustomGraphicsCoordinates.create([xVal, yVal, zVal])
+        pointImage = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'Resources', 'PointAtCoord', '16x16.png')
+        graphics.addPointSet(coords, [0], adsk.fusion.CustomGraphicsPointTypes.UserDefinedCustomGraphicsPointType, pointImage)
+    except:
+        _ui.messageBox('Unexpected failure:\n{}'.format(traceback.format_exc()))
+
+
+def DrawPoint(inputs):
+    try:
+        # Get the values from the command inputs.
+        (xVal, yVal, zVal) = getCoordinates(inputs)
+        
+        nameInput = adsk.core.StringValueCommandInput.cast(inputs.itemById('pointName'))
+        name = nameInput.value
+
+        root = _design.rootComponent
+    
+        if _isParametric:
+            # Get the base feature to create the point in.
+            baseFeature = getBaseFeature(inputs)
+            if not baseFeature:
+                return
+            
+            # Add a construction point ot the base feature.
+            baseFeature.startEdit()        
+            pointInput = root.constructionPoints.createInput()
+            pointInput.setByPoint(adsk.core.Point3D.create(xVal, yVal, zVal))
+            pointInput.targetBaseOrFormFeature = baseFeature
+            point = root.constructionPoints.add(pointInput)
+            baseFeature.finishEdit()
+            
+            # Save the name of the base feature use as an attribute so it
+            # can be used as the default the next time the command is run.
+            setDefaultBaseFeature(baseFeature)
+        else:
+            # Add a construction point to the root component.
+            pointInput = root.constructionPoints.createInput()
+            pointInput.setByPoint(adsk.core.Point3D.create(xVal, yVal, zVal))
+            point = root.constructionPoints.add(pointInput)
+            
+        point.name = name
+    except:
+        _ui.messageBox('Unexpected failure:\n{}'.format(traceback.format_exc()))
+
+
+# Gets the base feature index of the active document, building it if it doesn't
+# exist or if the timeline has changed since it was built.  Renaming a base
+# feature doesn't change the timeline, so getBaseFeature checks the base feature
+# it uses and removes the index if it's out of date.
+def getBaseFeatureIndex():
+    docId = _design.parentDocument.creationId
+    timeline = _design.timeline
+    timelineState = (timeline.count, timeline.markerPosition)
+
+    index = _baseFeatureIndex.get(docId)
+    if not index or index['timelineState'] != timelineState:
+        baseFeatures = {}
+        for baseFeature in _design.rootComponent.features.baseFeatures:
+            baseFeatures[baseFeature.name] = baseFeature
+
+        # Get the name of the last used base feature to use as the default.
+        defaultName = ''
+        baseFeatureNameAttrib = _design.attributes.itemByName('ekinsPointAtCoord', 'BaseFeatureName')
+        if baseFeatureNameAttrib:
+            defaultName = baseFeatureNameAttrib.value
+
+        index = {'timelineState': timelineState, 'baseFeatures': baseFeatures, 'defaultName': defaultName}
+        _baseFeatureIndex[docId] = index
+
+    return index
+
+
+# Saves the name of the base feature as an attribute so it can be used as the
+# default the next time the command is run.  The attribute is only written when
+# the name is different from the current default.
+def setDefaultBaseFeature(baseFeature):
+    index = getBaseFeatureIndex()
+    name = baseFeature.name
+    if index['defaultName'] != name:
+        _design.attributes.add('ekinsPointAtCoord', 'BaseFeatureName', name)
+        index['defaultName'] = name
+
+
+# Adds the drop-down that lists the base features to the command inputs.  The
+# base feature used last is selected by default.
+def addBaseFeatureList(inputs):
+    listInput = inputs.addDropDownCommandInput('baseFeatureList', 'Base feature', adsk.core.DropDownStyles.TextListDropDownStyle) 
+    fillBaseFeatureList(listInput)
+
+
+# Fills the base feature drop-down with the base features of the index.
+def fillBaseFeatureList(listInput):
+    listInput.listItems.clear()
+    listInput.listItems.add('Create new Base Feature', True, '')                
+
+    index = getBaseFeatureIndex()
+    for baseFeatureName in index['baseFeatures']:
+        if baseFeatureName == index['defaultName']:
+            listInput.listItems.item(0).isSelected = False
+            listInput.listItems.add(baseFeatureName, True, '')                                
+        else:
+            listInput.listItems.add(baseFeatureName, False, '')
+
+
+# Gets the base feature selected in the drop-down, creating a new one if requested.
+# If the selected base feature no longer exists, the drop-down is filled again
+# and None is returned.
+def getBaseFeature(inputs):
+    root = _design.rootComponent
+    listInput = adsk.core.DropDownCommandInput.cast(inputs.itemById('baseFeatureList'))
+    baseFeatureName = listInput.selectedItem.name
+    index = getBaseFeatureIndex()
+                
+    if baseFeatureName == 'Create new Base Feature':
+        # Create a new base feature and add it to the index.
+        baseFeature = root.features.baseFeatures.add()
+        index['baseFeatures'][baseFeature.name] = baseFeature
+        timeline = _design.timeline
+        index['timelineState'] = (timeline.count, timeline.markerPosition)
+        return baseFeature
+    else:
+        # Get the specified existing base feature.  Only this entry of the index
+        # is checked.  If it has been renamed or deleted since the index was
+        # built, the index is rebuilt and the base feature is looked up again.
+        baseFeature = index['baseFeatures'].get(baseFeatureName)
+        if not baseFeature or not baseFeature.isValid or baseFeature.name != baseFeatureName:
+            _baseFeatureIndex.pop(_design.parentDocument.creationId, None)
+            baseFeature = getBaseFeatureIndex()['baseFeatures'].get(baseFeatureName)
+            if not baseFeature:
+                _ui.messageBox('The base feature "{}" no longer exists.  Select another base feature.'.format(baseFeatureName))
+                fillBaseFeatureList(listInput)
+        return baseFeature
+
+
+# Event handler for the documentActivated and documentClosed events that removes
+# the base feature index of the document because it might no longer be valid.
+class DocumentEventHandler(adsk.core.DocumentEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            eventArgs = adsk.core.DocumentEventArgs.cast(args)
+            _baseFeatureIndex.pop(eventArgs.document.creationId, None)
+        except:
+            _ui.messageBox('Unexpected failure:\n{}'.format(traceback.format_exc()))
+
+
+# Event handler for the commandCreated event of the import command.
+class ImportCommandCreatedEventHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            eventArgs = adsk.core.CommandCreatedEventArgs.cast(args)
+            cmd = eventArgs.command
+
+            global _design
+            _design = adsk.fusion.Design.cast(_app.activeProduct)
+            if not _design:
+                _ui.messageBox('You must be in a modeling related workspace.')
+                return False
+
+            # The handlers of the command are released when the command is destroyed.
+            scope = HandlerRegistry.commandScope(cmd, 'PointAtCoord')
+
+            # Connect to the execute and input changed events.
+            scope.add(cmd.execute, ImportExecuteHandler())
+
+            scope.add(cmd.inputChanged, ImportInputChangedHandler())
+
+            inputs = cmd.commandInputs
+
+            # All of the points are created in a single base feature in a parametric model.
+            global _isParametric
+            _isParametric = _design.designType == adsk.fusion.DesignTypes.ParametricDesignType
+            if _isParametric:
+                addBaseFeatureList(inputs)
+
+            # Add the inputs to choose the file and the units used in it.
+            inputs.addBoolValueInput('importButton', 'Point File', False, '', False)
+            inputs.addTextBoxCommandInput('importFile', '', '', 1, True)
+            unitsInput = inputs.addDropDownCommandInput('fileUnits', 'File Units', adsk.core.DropDownStyles.TextListDropDownStyle)
+            for units in ('mm', 'cm', 'm', 'in', 'ft'):
+                unitsInput.listItems.add(units, units == _design.unitsManager.defaultLengthUnits, '')
+            if not unitsInput.selectedItem:
+                unitsInput.listItems.item(1).isSelected = True
+
+            # Add the option to name the points using the names in the file.
+            inputs.addBoolValueInput('useNames', 'Use Names from File', True, '', True)
+
+            # Add the inputs to reduce the number of points that are created.
+            lengthUnits = _design.unitsManager.defaultLengthUnits
+            zero = adsk.core.ValueInput.createByReal(0)
+            inputs.addValueInput('voxelSize', 'Voxel Size', lengthUnits, zero)
+            inputs.addValueInput('mergeTolerance', 'Merge Tolerance', lengthUnits, zero)
+
+            # Add the inputs to limit the points to a box.
+            boxGroup = inputs.addGroupCommandInput('boxGroup', 'Limit to Box')
+            boxGroup.isExpanded = False
+            boxInputs = boxGroup.children
+            boxInputs.addBoolValueInput('useBox', 'Limit to Box', True, '', False)
+            for (inputId, name) in _boxInputs:
+                boxInputs.addValueInput(inputId, name, lengthUnits, zero)
+        except:
+            _ui.messageBox('Unexpected failure:\n{}'.format(traceback.format_exc()))
+
+
+# The ids and names of the inputs that define the box to limit the points to.
+_boxInputs = (('boxMinX', 'Minimum X'), ('boxMinY', 'Minimum Y'), ('boxMinZ', 'Minimum Z'),
+              ('boxMaxX', 'Maximum X'), ('boxMaxY', 'Maximum Y'), ('boxMaxZ', 'Maximum Z'))
+
+
+# Event handler for the inputChanged event of the import command.
+class ImportInputChangedHandler(adsk.core.InputChangedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            if args.input.id == 'importButton':
+                fileDialog = _ui.createFileDialog()
+                fileDialog.title = 'Import Points'
+                fileDialog.filter = 'Point files (*.csv;*.xyz;*.txt;*.ply;*.npy;*.bin;*.f64;*.raw);;All files (*.*)'
+                if fileDialog.showOpen() == adsk.core.DialogResults.DialogOK:
+                    args.firingEvent.sender.commandInputs.itemById('importFile').text = fileDialog.filename
+        except:
+            _ui.messageBox('Unexpected failure:\n{}'.format(traceback.format_exc()))
+
+
+# Event handler for the execute event of the import command.
+class ImportExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        eventArgs = adsk.core.CommandEventArgs.cast(args)
+        ImportPoints(eventArgs.command.commandInputs)
+
+
+# Creates a construction point for every point in the selected file.  In a
+# parametric model, all of the points are created within a single edit of
+# one base feature.
+def ImportPoints(inputs):
+    try:
+        filename = inputs.itemById('importFile').text
+        if not filename:
+            _ui.messageBox('A point file must be selected.')
+            return
+
+        units = inputs.itemById('fileUnits').selectedItem.name
+        scale = _design.unitsManager.convert(1, units, 'cm')
+        useNames = inputs.itemById('useNames').value
+        voxelSize = inputs.itemById('voxelSize').value
+        tolerance = inputs.itemById('mergeTolerance').value
+        box = None
+        if inputs.itemById('useBox').value:
+            box = [inputs.itemById(inputId).value for (inputId, name) in _boxInputs]
+
+        root = _design.rootComponent
+        constructionPoints = root.constructionPoints
+        startTime = time.perf_counter()
+
+        baseFeature = None
+        if _isParametric:
+            baseFeature = getBaseFeature(inputs)
+            if not baseFeature:
+                return
+            baseFeature.startEdit()
+
+        # Read the points in chunks, which converts each chunk to centimeters, and filter them.
+        stats = PointFilter.newStats()
+        points = (point for chunk in PointImport.readPointChunks(filename, scale) for point in chunk)
+        points = PointFilter.filterPoints(points, voxelSize, tolerance, box, stats)
+
+        pointCount = 0
+        try:
+            for (x, y, z, name) in points:
+                pointInput = constructionPoints.createInput()
+                pointInput.setByPoint(adsk.core.Point3D.create(x, y, z))
+                if baseFeature:
+                    pointInput.targetBaseOrFormFeature = baseFeature
+                point = constructionPoints.add(pointInput)
+
+                if useNames and name:
+                    point.name = name
+                pointCount += 1
+        finally:
+            if baseFeature:
+                baseFeature.finishEdit()
+
+        if baseFeature:
+            # Save the name of the base feature so it's the default next time.
+            setDefaultBaseFeature(baseFeature)
+
+        elapsed = time.perf_counter() - startTime
+        rate = pointCount / elapsed if elapsed > 0 else 0
+        _ui.messageBox('Imported {} points in {:.2f} seconds ({:.0f} points per second).\n\n'
+                       'Points read: {}\nOutside of the box: {}\nMerged duplicates: {}\nRemoved by voxel grid: {}'.format(
+                       pointCount, elapsed, rate, stats['read'], stats['outsideBox'], stats['duplicates'], stats['decimated']))
+    except:
+        _ui.messageBox('Unexpected failure:\n{}'.format(traceback.format_exc()))
+
+
+# Called by LazyCommand when the module is first imported.
+def start():
+    # Connect to the document events to invalidate the base feature index.
+    HandlerRegistry.addHandler('PointAtCoord', _app.documentActivated, DocumentEventHandler())
+    HandlerRegistry.addHandler('PointAtCoord', _app.documentClosed, DocumentEventHandler())
+
+
+# Called by LazyCommand when the add-in is stopped.
+def stop():
+    _baseFeatureIndex.clear()
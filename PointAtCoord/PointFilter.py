@@ -0,0 +1,70 @@
+#Author-Brian Ekins
+#Description-Reduces the points imported by the Point at Coordinate add-in.
+
+# The filter works on a stream of (x, y, z, name) tuples, like those returned by
+# the readers in PointImport, and returns the points that should be created.
+# It's a generator, so only the points that are kept are held in memory.
+
+import math
+
+
+# Returns a new dictionary used to count what happened to the points.
+def newStats():
+    return {'read': 0, 'retained': 0, 'outsideBox': 0, 'duplicates': 0, 'decimated': 0}
+
+
+# Generator that returns the points that pass the filter.  The filtering is done
+# in this order and each step is skipped if it isn't specified.
+#   box - A tuple of (minX, minY, minZ, maxX, maxY, maxZ).  Points outside of it are dropped.
+#   tolerance - Points closer than this to a point that's already been kept are dropped.
+#   voxelSize - Space is divided into cubes of this size and only the first point in each cube is kept.
+# The stats dictionary, if given, is updated with the number of points read, kept
+# and dropped by each step.
+def filterPoints(points, voxelSize=0, tolerance=0, box=None, stats=None):
+    if stats is None:
+        stats = newStats()
+
+    voxels = set()
+    cells = {}
+    for point in points:
+        stats['read'] += 1
+        (x, y, z) = point[0:3]
+
+        if box and (x < box[0] or y < box[1] or z < box[2] or x > box[3] or y > box[4] or z > box[5]):
+            stats['outsideBox'] += 1
+            continue
+
+        if tolerance > 0:
+            # Check the points in this cell and the surrounding cells for one that's too close.
+            i = math.floor(x / tolerance)
+            j = math.floor(y / tolerance)
+            k = math.floor(z / tolerance)
+            if _hasNearPoint(cells, i, j, k, x, y, z, tolerance * tolerance):
+                stats['duplicates'] += 1
+                continue
+
+        if voxelSize > 0:
+            voxel = (math.floor(x / voxelSize), math.floor(y / voxelSize), math.floor(z / voxelSize))
+            if voxel in voxels:
+                stats['decimated'] += 1
+                continue
+            voxels.add(voxel)
+
+        if tolerance > 0:
+            cells.setdefault((i, j, k), []).append((x, y, z))
+
+        stats['retained'] += 1
+        yield point
+
+
+# Checks if any point in the 27 cells around cell i, j, k is within the tolerance.
+def _hasNearPoint(cells, i, j, k, x, y, z, toleranceSquared):
+    for di in (-1, 0, 1):
+        for dj in (-1, 0, 1):
+            for dk in (-1, 0, 1):
+                cell = cells.get((i + di, j + dj, k + dk))
+                if cell:
+                    for (px, py, pz) in cell:
+                        if (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2 < toleranceSquared:
+                            return True
+    return False
@@ -0,0 +1,295 @@
+#Author-Brian Ekins
+#Description-Readers for the point files imported by the Point at Coordinate add-in.
+
+# The readers are generators that return each point as a tuple of (x, y, z, name)
+# as soon as it's read, so the file is never held in memory.  The name is None
+# when the file doesn't define one.  Values are returned as they are in the file
+# without any unit conversion.
+#
+# Binary files (.npy, binary PLY and raw files of float64 x, y, z triplets) are
+# memory mapped and read in fixed size chunks by readPointChunks, which also
+# does the unit conversion for a whole chunk at once.
+
+import csv, os, sys, mmap, ast, struct, itertools
+
+# The number of points in each chunk returned by readPointChunks.
+defaultChunkSize = 65536
+
+# Extensions of files that contain raw little-endian float64 x, y, z triplets.
+_rawExtensions = ('.bin', '.f64', '.raw')
+
+# The struct format character for each PLY property type.
+_plyTypes = {'char': 'b', 'uchar': 'B', 'short': 'h', 'ushort': 'H', 'int': 'i', 'uint': 'I',
+             'float': 'f', 'double': 'd', 'int8': 'b', 'uint8': 'B', 'int16': 'h', 'uint16': 'H',
+             'int32': 'i', 'uint32': 'I', 'float32': 'f', 'float64': 'd'}
+
+
+# Reads the points from the file, using the extension to determine the format.
+def readPoints(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.ply':
+        if _isBinaryPLY(filename):
+            return _chunksToPoints(readPointChunks(filename))
+        return readPLYPoints(filename)
+    elif ext == '.npy' or ext in _rawExtensions:
+        return _chunksToPoints(readPointChunks(filename))
+    elif ext == '.csv':
+        return readCSVPoints(filename)
+    else:
+        return readXYZPoints(filename)
+
+
+# Generator that reads the points from the file in chunks, returning each chunk as
+# a list of (x, y, z, name) tuples where the coordinates have been multiplied by
+# the scale.  Binary files are memory mapped so only the current chunk is ever
+# converted into Python values.
+def readPointChunks(filename, scale=1.0, chunkSize=defaultChunkSize):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.npy':
+        return _readBinaryChunks(filename, _readNPYLayout, scale, chunkSize)
+    elif ext in _rawExtensions:
+        return _readBinaryChunks(filename, _rawLayout, scale, chunkSize)
+    elif ext == '.ply' and _isBinaryPLY(filename):
+        return _readBinaryChunks(filename, _readPLYLayout, scale, chunkSize)
+    else:
+        return _readTextChunks(filename, scale, chunkSize)
+
+
+def _chunksToPoints(chunks):
+    for chunk in chunks:
+        yield from chunk
+
+
+# Groups the points of a text file into chunks and scales them.
+def _readTextChunks(filename, scale, chunkSize):
+    points = readPoints(filename)
+    while True:
+        chunk = list(itertools.islice(points, chunkSize))
+        if not chunk:
+            break
+        if scale != 1.0:
+            chunk = [(x * scale, y * scale, z * scale, name) for (x, y, z, name) in chunk]
+        yield chunk
+
+
+# Reads the points of a memory mapped binary file in chunks.  The layout function
+# returns how the points are stored as (dataOffset, pointCount, recordFormat, indices)
+# where recordFormat is the struct format of one point record and indices are the
+# positions of x, y, and z within the record.
+def _readBinaryChunks(filename, layoutFunction, scale, chunkSize):
+    with open(filename, 'rb') as binaryFile:
+        (offset, pointCount, recordFormat, indices) = layoutFunction(binaryFile, filename)
+        if pointCount == 0:
+            return
+
+        record = struct.Struct(recordFormat)
+        if offset + pointCount * record.size > os.fstat(binaryFile.fileno()).st_size:
+            raise ValueError('"{}" is shorter than the {} points it should contain.'.format(filename, pointCount))
+
+        # When the records are just x, y, z in the native byte order, the mapped
+        # memory can be viewed directly as an array of values.
+        typeCode = recordFormat[1:]
+        isDirect = (typeCode in ('ddd', 'fff') and indices == (0, 1, 2) and
+                    recordFormat[0] == ('<' if sys.byteorder == 'little' else '>'))
+
+        with mmap.mmap(binaryFile.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+            view = memoryview(mappedFile)
+            try:
+                for start in range(0, pointCount, chunkSize):
+                    count = min(chunkSize, pointCount - start)
+                    chunkView = view[offset + start * record.size:offset + (start + count) * record.size]
+                    if isDirect:
+                        values = chunkView.cast(typeCode[0])
+                        if scale != 1.0:
+                            values = [value * scale for value in values]
+                        chunk = list(zip(values[0::3], values[1::3], values[2::3], itertools.repeat(None)))
+                        if isinstance(values, memoryview):
+                            values.release()
+                    else:
+                        (i, j, k) = indices
+                        chunk = [(values[i] * scale, values[j] * scale, values[k] * scale, None) for values in record.iter_unpack(chunkView)]
+                    chunkView.release()
+                    yield chunk
+            finally:
+                view.release()
+
+
+# Layout of a raw file of little-endian float64 x, y, z triplets.
+def _rawLayout(binaryFile, filename):
+    size = os.fstat(binaryFile.fileno()).st_size
+    if size % 24 != 0:
+        raise ValueError('The size of "{}" isn\'t a multiple of three float64 values.'.format(filename))
+    return (0, size // 24, '<ddd', (0, 1, 2))
+
+
+# Layout of a NumPy .npy file containing an N x 3 array of float32 or float64 values.
+def _readNPYLayout(binaryFile, filename):
+    if binaryFile.read(6) != b'\x93NUMPY':
+        raise ValueError('"{}" is not a NumPy .npy file.'.format(filename))
+
+    major = binaryFile.read(2)[0]
+    if major == 1:
+        headerLength = struct.unpack('<H', binaryFile.read(2))[0]
+    else:
+        headerLength = struct.unpack('<I', binaryFile.read(4))[0]
+    header = ast.literal_eval(binaryFile.read(headerLength).decode('latin1'))
+
+    descr = header['descr']
+    shape = header['shape']
+    if descr[1:] not in ('f8', 'f4') or descr[0] not in '<>|=' or header['fortran_order'] or len(shape) != 2 or shape[1] != 3:
+        raise ValueError('"{}" must contain an N x 3 array of float32 or float64 values in C order.'.format(filename))
+
+    byteOrder = '>' if descr[0] == '>' else '<'
+    typeCode = 'd' if descr[1:] == 'f8' else 'f'
+    return (binaryFile.tell(), shape[0], byteOrder + typeCode * 3, (0, 1, 2))
+
+
+# Layout of a binary PLY file.  Only the vertices are read so they must be the first
+# element and can't have any list properties.
+def _readPLYLayout(binaryFile, filename):
+    headerLines = []
+    while True:
+        line = binaryFile.readline()
+        if not line:
+            raise ValueError('The header of "{}" is incomplete.'.format(filename))
+        headerLines.append(line.decode('ascii', 'replace'))
+        if line.strip() == b'end_header':
+            break
+
+    (format, vertexCount, properties) = _parsePLYHeader(headerLines, filename)
+    byteOrder = '<' if format == 'binary_little_endian' else '>'
+
+    recordFormat = byteOrder
+    for (name, type) in properties:
+        if type not in _plyTypes:
+            raise ValueError('The vertex property "{}" in "{}" has an unsupported type.'.format(name, filename))
+        recordFormat += _plyTypes[type]
+
+    names = [name for (name, type) in properties]
+    return (binaryFile.tell(), vertexCount, recordFormat, tuple(names.index(name) for name in ('x', 'y', 'z')))
+
+
+# Checks if a PLY file is binary by reading its format line.
+def _isBinaryPLY(filename):
+    with open(filename, 'rb') as plyFile:
+        for i in range(0, 3):
+            fields = plyFile.readline().split()
+            if fields and fields[0] == b'format':
+                return fields[1] != b'ascii'
+    return False
+
+
+# Reads the points from a CSV file where each row is x, y, z and an optional name.
+# An optional header row that uses those names can define the columns in a different order.
+def readCSVPoints(filename):
+    with open(filename, newline='') as csvFile:
+        reader = csv.reader(csvFile)
+        columns = None
+        for row in reader:
+            # Skip empty rows and comments.
+            if len(row) == 0 or row[0].strip() == '' or row[0].lstrip().startswith('#'):
+                continue
+
+            if not columns:
+                names = [field.strip().lower() for field in row]
+                if 'x' in names and 'y' in names and 'z' in names:
+                    # It's a header so map the known names to their columns.
+                    columns = [names.index(name) if name in names else -1 for name in ('x', 'y', 'z', 'name')]
+                    continue
+                else:
+                    columns = [0, 1, 2, 3]
+
+            try:
+                x = float(row[columns[0]])
+                y = float(row[columns[1]])
+                z = float(row[columns[2]])
+            except (ValueError, IndexError):
+                raise ValueError('Invalid point on line {} of "{}".'.format(reader.line_num, filename))
+
+            name = None
+            if columns[3] >= 0 and columns[3] < len(row) and row[columns[3]].strip():
+                name = row[columns[3]].strip()
+
+            yield (x, y, z, name)
+
+
+# Reads the points from a text file where each line is x y z, separated by spaces,
+# tabs or commas, optionally followed by a name.  Lines starting with # or // are comments.
+def readXYZPoints(filename):
+    with open(filename) as xyzFile:
+        for (lineNumber, line) in enumerate(xyzFile, 1):
+            line = line.strip()
+            if not line or line.startswith('#') or line.startswith('//'):
+                continue
+
+            fields = line.replace(',', ' ').split(None, 3)
+            try:
+                x = float(fields[0])
+                y = float(fields[1])
+                z = float(fields[2])
+            except (ValueError, IndexError):
+                raise ValueError('Invalid point on line {} of "{}".'.format(lineNumber, filename))
+
+            name = fields[3].strip() if len(fields) > 3 else None
+            yield (x, y, z, name)
+
+
+# Reads the vertices of an ASCII PLY file.  PLY vertices don't have names.
+def readPLYPoints(filename):
+    with open(filename, errors='replace') as plyFile:
+        headerLines = []
+        while True:
+            line = plyFile.readline()
+            if not line:
+                raise ValueError('The header of "{}" is incomplete.'.format(filename))
+            headerLines.append(line)
+            if line.strip() == 'end_header':
+                break
+
+        (format, vertexCount, properties) = _parsePLYHeader(headerLines, filename)
+        if format != 'ascii':
+            raise ValueError('"{}" is a {} PLY file.  Use readPointChunks to read binary PLY files.'.format(filename, format))
+
+        names = [name for (name, type) in properties]
+        indices = [names.index(name) for name in ('x', 'y', 'z')]
+        for i in range(0, vertexCount):
+            fields = plyFile.readline().split()
+            try:
+                yield (float(fields[indices[0]]), float(fields[indices[1]]), float(fields[indices[2]]), None)
+            except (ValueError, IndexError):
+                raise ValueError('Invalid vertex {} in "{}".'.format(i, filename))
+
+
+# Parses the lines of a PLY header and returns the format, the number of vertices
+# and the vertex properties as a list of (name, type) tuples.
+def _parsePLYHeader(headerLines, filename):
+    if not headerLines or headerLines[0].strip() != 'ply':
+        raise ValueError('"{}" is not a PLY file.'.format(filename))
+
+    format = ''
+    vertexCount = 0
+    properties = []
+    element = ''
+    for line in headerLines[1:]:
+        fields = line.split()
+        if not fields:
+            continue
+        elif fields[0] == 'format':
+            format = fields[1]
+        elif fields[0] == 'element':
+            element = fields[1]
+            if element == 'vertex':
+                vertexCount = int(fields[2])
+            elif vertexCount == 0:
+                raise ValueError('The vertices must be the first element in "{}".'.format(filename))
+        elif fields[0] == 'property' and element == 'vertex':
+            if fields[1] == 'list':
+                raise ValueError('The vertices in "{}" have a list property, which isn\'t supported.'.format(filename))
+            properties.append((fields[-1], fields[1]))
+
+    names = [name for (name, type) in properties]
+    for name in ('x', 'y', 'z'):
+        if name not in names:
+            raise ValueError('The vertices in "{}" don\'t have an {} property.'.format(filename, name))
+
+    return (format, vertexCount, properties)
@@ -0,0 +1,109 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Traverses a large assembly without freezing Fusion.  The traversal is done in
+# slices that each run for a limited time.  At the end of each slice a custom
+# event is fired to run the next slice, which returns control to Fusion so it
+# can handle user input and redraw before the event is processed.  The index and
+# path resolver contain the occurrences found so far and can be used at any time.
+
+import adsk.core, traceback, time
+from . import ProxyIndex, PathResolver
+
+# The default time, in seconds, that each slice runs for.
+defaultSliceTime = 0.05
+
+
+# CustomEvent event handler class that runs the next slice of a traversal.
+class TraversalEventHandler(adsk.core.CustomEventHandler):
+    def __init__(self, traversal):
+        super().__init__()
+        self.traversal = traversal
+    def notify(self, args):
+        self.traversal._runSlice()
+
+
+class BackgroundTraversal:
+    # The onComplete function is called with the traversal when it finishes or is
+    # cancelled, which can be checked with the isCancelled property.
+    def __init__(self, design, eventId, onComplete=None, sliceTime=defaultSliceTime):
+        self._app = adsk.core.Application.get()
+        self._design = design
+        self._eventId = eventId
+        self._onComplete = onComplete
+        self._sliceTime = sliceTime
+        self._builder = None
+        self._handler = None
+        self._total = 0
+        self.resolver = PathResolver.PathResolver()
+        self.isRunning = False
+        self.isCancelled = False
+        self.seconds = 0.0
+
+    # The index of the occurrences that have been found so far.
+    @property
+    def index(self):
+        return self._builder.index if self._builder else None
+
+    @property
+    def isComplete(self):
+        return self._builder is not None and self._builder.isComplete
+
+    # Starts the traversal.  The first slice runs when Fusion processes the custom event.
+    def start(self):
+        self._builder = ProxyIndex.IndexBuilder(self._design)
+        self._total = self._design.rootComponent.allOccurrences.count + 1
+        self.isRunning = True
+        self.isCancelled = False
+        self.seconds = 0.0
+
+        event = self._app.registerCustomEvent(self._eventId)
+        self._handler = TraversalEventHandler(self)
+        event.add(self._handler)
+
+        self._app.userInterface.progressBar.show('Traversing assembly (%v of %m occurrences)', 0, self._total)
+        self._app.fireCustomEvent(self._eventId)
+
+    # Stops the traversal after the current slice.  The occurrences found so far
+    # remain in the index and resolver.
+    def cancel(self):
+        if self.isRunning:
+            self.isCancelled = True
+            self._finish()
+
+    def _runSlice(self):
+        if not self.isRunning:
+            return
+
+        try:
+            startTime = time.perf_counter()
+            isComplete = self._builder.step(self._sliceTime)
+            self.resolver.addIndexNodes(self._builder.index)
+            self.seconds += time.perf_counter() - startTime
+
+            self._app.userInterface.progressBar.progressValue = self._builder.index.count
+            if isComplete:
+                self._finish()
+            else:
+                self._app.fireCustomEvent(self._eventId)
+        except:
+            self.isCancelled = True
+            self._finish()
+            self._app.userInterface.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+    def _finish(self):
+        self.isRunning = False
+        self._app.userInterface.progressBar.hide()
+        self._app.unregisterCustomEvent(self._eventId)
+        self._handler = None
+        if self._onComplete:
+            self._onComplete(self)
@@ -0,0 +1,139 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Finds the occurrence for a proxy path like "Root/Frame:1/Bracket:3", which is
+# the reverse of what ShowProxy displays.  The paths are held in a trie where each
+# node is a list of [occurrence, children] and children is a dictionary of the
+# child nodes keyed by occurrence name.  Resolving a path is one dictionary lookup
+# for each level without any calls to the Fusion API.
+
+from . import ProxyIndex
+
+
+class PathResolver:
+    # Builds the resolver for all of the occurrences in the design.  If a design isn't
+    # given, the resolver is empty until nodes are added with addIndexNodes.
+    def __init__(self, design=None):
+        self._root = [None, {}]
+        self._indexNodes = []
+        self.count = 0
+        if design:
+            self.addIndexNodes(ProxyIndex.buildIndex(design))
+
+    # Adds the nodes of the index that haven't already been added.  An index that's
+    # being built in steps can be passed in after each step so the paths found so far
+    # can be resolved while the rest of the assembly is still being traversed.
+    def addIndexNodes(self, index):
+        # The index nodes are in order with parents always before their children.
+        nodes = self._indexNodes
+        for node in range(len(nodes), index.count):
+            trieNode = [index.occurrences[node], {}]
+            parent = index.parents[node]
+            if parent >= 0:
+                nodes[parent][1][index.names[node]] = trieNode
+            else:
+                self._root = trieNode
+            nodes.append(trieNode)
+            self.count += 1
+
+    # Returns the trie node for the path or None if it doesn't exist.
+    def _findNode(self, path):
+        names = path.split('/')
+        if names[0] != 'Root':
+            return None
+
+        trieNode = self._root
+        for name in names[1:]:
+            trieNode = trieNode[1].get(name)
+            if trieNode is None:
+                return None
+        return trieNode
+
+    # Returns the occurrence for the path, the root component for "Root", or None
+    # if there isn't an occurrence with that path.
+    def resolve(self, path):
+        trieNode = self._findNode(path)
+        return trieNode[0] if trieNode else None
+
+    # Returns a list of the occurrences for the paths, with None for any path that
+    # doesn't exist.  The node of each parent path is remembered so paths that share
+    # a parent only need one lookup each.
+    def resolvePaths(self, paths):
+        parentNodes = {}
+        occurrences = []
+        for path in paths:
+            (parentPath, separator, name) = path.rpartition('/')
+            if not separator:
+                occurrences.append(self._root[0] if path == 'Root' else None)
+                continue
+
+            if parentPath in parentNodes:
+                parentNode = parentNodes[parentPath]
+            else:
+                parentNode = self._findNode(parentPath)
+                parentNodes[parentPath] = parentNode
+
+            trieNode = parentNode[1].get(name) if parentNode else None
+            occurrences.append(trieNode[0] if trieNode else None)
+        return occurrences
+
+    # Adds an occurrence that has been created, and all of the occurrences within
+    # it, to the resolver.  The occurrence must be in the context of the root
+    # component and its parent must already be in the resolver.
+    def addOccurrence(self, occ):
+        names = []
+        parentOcc = occ.assemblyContext
+        while parentOcc:
+            names.append(parentOcc.name)
+            parentOcc = parentOcc.assemblyContext
+
+        parentNode = self._findNode('/'.join(['Root'] + names[::-1]))
+        if parentNode is None:
+            raise ValueError('The parent of "{}" isn\'t in the path resolver.'.format(occ.name))
+
+        # Replace the occurrence if it's already in the resolver.
+        if occ.name in parentNode[1]:
+            self.count -= _countNodes(parentNode[1][occ.name])
+
+        # Add the occurrence and its children using a stack rather than recursion.
+        stack = [(occ, parentNode)]
+        while stack:
+            (occ, parentNode) = stack.pop()
+            trieNode = [occ, {}]
+            parentNode[1][occ.name] = trieNode
+            self.count += 1
+            for childOcc in occ.childOccurrences:
+                stack.append((childOcc, trieNode))
+
+    # Removes the occurrence with the path, and all of the occurrences within it,
+    # from the resolver.  This is used after an occurrence has been deleted, when
+    # the occurrence itself can no longer be used.  Returns False if the path
+    # wasn't found.
+    def removePath(self, path):
+        (parentPath, separator, name) = path.rpartition('/')
+        parentNode = self._findNode(parentPath) if separator else None
+        if parentNode is None or name not in parentNode[1]:
+            return False
+
+        self.count -= _countNodes(parentNode[1].pop(name))
+        return True
+
+
+# Returns the number of nodes in the trie, including the node itself.
+def _countNodes(trieNode):
+    count = 0
+    stack = [trieNode]
+    while stack:
+        trieNode = stack.pop()
+        count += 1
+        stack.extend(trieNode[1].values())
+    return count
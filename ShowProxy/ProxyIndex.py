@@ -0,0 +1,184 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# A flat index of every occurrence in an assembly.  Each occurrence is a node
+# identified by its position in the index.  Node 0 is the root component and the
+# data for each node is held in parallel arrays rather than as an object per node
+# so large assemblies use little memory and can be written out quickly.
+
+import array, json, struct, sys, time
+
+# Identifies a binary proxy index file and the version of its format.
+_binaryMagic = b'PXIX'
+_binaryVersion = 1
+
+_identity = (1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0)
+
+
+class ProxyIndex:
+    def __init__(self):
+        # The node data.  The transform of each node is 16 values in the transforms array.
+        self.parents = array.array('i')
+        self.depths = array.array('i')
+        self.componentIds = array.array('i')
+        self.transforms = array.array('d')
+        self.names = []
+        self.paths = []
+
+        # The occurrence of each node, or the root component for node 0, when the
+        # index was built from a design.  These aren't written to the files.
+        self.occurrences = []
+
+        # The name of each component, which the component ids refer to.
+        self.componentNames = []
+
+    @property
+    def count(self):
+        return len(self.names)
+
+    # Adds a node to the index and returns its id.
+    def addNode(self, parent, name, componentId, transform, occurrence=None):
+        self.parents.append(parent)
+        self.depths.append(self.depths[parent] + 1 if parent >= 0 else 0)
+        self.componentIds.append(componentId)
+        self.transforms.extend(transform)
+        self.names.append(name)
+        self.paths.append(self.paths[parent] + '/' + name if parent >= 0 else name)
+        self.occurrences.append(occurrence)
+        return len(self.names) - 1
+
+    def transform(self, node):
+        return tuple(self.transforms[node * 16:node * 16 + 16])
+
+    # Writes the index as JSON Lines, with one line for each node.
+    def writeJSONLines(self, filename):
+        with open(filename, 'w') as jsonFile:
+            for node in range(0, self.count):
+                jsonFile.write(json.dumps({'id': node, 'parent': self.parents[node], 'depth': self.depths[node],
+                                           'name': self.names[node], 'path': self.paths[node],
+                                           'component': self.componentNames[self.componentIds[node]],
+                                           'transform': self.transform(node)}) + '\n')
+
+    # Writes the index in the compact binary format.  It's a header of the magic
+    # bytes, the version, the node count and the component count, followed by the
+    # parent, depth and component id arrays as little-endian int32, the transforms
+    # as little-endian float64 and then the node and component names as UTF-8
+    # strings that are each preceded by their length as a uint32.
+    def writeBinary(self, filename):
+        with open(filename, 'wb') as binaryFile:
+            binaryFile.write(_binaryMagic + struct.pack('<III', _binaryVersion, self.count, len(self.componentNames)))
+            for values in (self.parents, self.depths, self.componentIds, self.transforms):
+                if sys.byteorder == 'big':
+                    values = array.array(values.typecode, values)
+                    values.byteswap()
+                values.tofile(binaryFile)
+
+            for name in self.names + self.componentNames:
+                encodedName = name.encode('utf-8')
+                binaryFile.write(struct.pack('<I', len(encodedName)) + encodedName)
+
+
+# Reads an index written by ProxyIndex.writeBinary.
+def readBinary(filename):
+    with open(filename, 'rb') as binaryFile:
+        header = binaryFile.read(16)
+        if len(header) != 16 or header[0:4] != _binaryMagic:
+            raise ValueError('"{}" is not a proxy index file.'.format(filename))
+        (version, nodeCount, componentCount) = struct.unpack('<III', header[4:])
+        if version != _binaryVersion:
+            raise ValueError('"{}" is version {} of the proxy index format, which isn\'t supported.'.format(filename, version))
+
+        index = ProxyIndex()
+        for (values, count) in ((index.parents, nodeCount), (index.depths, nodeCount),
+                                (index.componentIds, nodeCount), (index.transforms, nodeCount * 16)):
+            values.fromfile(binaryFile, count)
+            if sys.byteorder == 'big':
+                values.byteswap()
+
+        names = []
+        for i in range(0, nodeCount + componentCount):
+            (length,) = struct.unpack('<I', binaryFile.read(4))
+            names.append(binaryFile.read(length).decode('utf-8'))
+        index.names = names[0:nodeCount]
+        index.componentNames = names[nodeCount:]
+        index.occurrences = [None] * nodeCount
+
+        for node in range(0, nodeCount):
+            parent = index.parents[node]
+            index.paths.append(index.paths[parent] + '/' + index.names[node] if parent >= 0 else index.names[node])
+
+    return index
+
+
+# Builds the index of all of the occurrences in the design.  The traversal uses a
+# stack rather than recursion so there's no limit on the depth of the assembly.
+def buildIndex(design):
+    builder = IndexBuilder(design)
+    builder.step()
+    return builder.index
+
+
+# Builds the index of a design in steps, so the traversal can be spread over time.
+# The index can be used while it's being built and contains every node added so far.
+class IndexBuilder:
+    def __init__(self, design):
+        self.index = ProxyIndex()
+        self._componentIds = {}
+
+        root = design.rootComponent
+        rootId = self.index.addNode(-1, 'Root', self._getComponentId(root), _identity, root)
+
+        # Each entry is a collection of occurrences that still need to be added, the
+        # number of them, the id of their parent and the position of the next one to add.
+        rootOccurrences = root.occurrences
+        self._stack = [[rootOccurrences, rootOccurrences.count, rootId, 0]]
+
+    @property
+    def isComplete(self):
+        return not self._stack
+
+    def _getComponentId(self, component):
+        componentId = self._componentIds.get(component.id)
+        if componentId is None:
+            componentId = len(self.index.componentNames)
+            self._componentIds[component.id] = componentId
+            self.index.componentNames.append(component.name)
+        return componentId
+
+    # Adds occurrences to the index until it's complete or, if a time limit in seconds
+    # is given, until that much time has passed.  Returns True when it's complete.
+    def step(self, timeLimit=None):
+        index = self.index
+        stack = self._stack
+        endTime = time.perf_counter() + timeLimit if timeLimit is not None else None
+        while stack:
+            entry = stack[-1]
+            (occurrences, count, parent, position) = entry
+            if position >= count:
+                stack.pop()
+                continue
+
+            occ = occurrences.item(position)
+            entry[3] = position + 1
+            node = index.addNode(parent, occ.name, self._getComponentId(occ.component), occ.transform.asArray(), occ)
+            childOccurrences = occ.childOccurrences
+            childCount = childOccurrences.count
+            if childCount > 0:
+                stack.append([childOccurrences, childCount, node, 0])
+
+            if endTime is not None and time.perf_counter() >= endTime:
+                break
+
+        return not stack
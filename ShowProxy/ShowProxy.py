@@ -10,89 +10,17 @@
 #    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
 #    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
 
-import adsk.core, adsk.fusion, traceback
+# Only creates the buttons when Fusion starts.  The commands are implemented in
+# ShowProxyCommand, which isn't imported until one of them is first run.
 
-# Global variable used to maintain a reference to all event handlers.
-handlers = []
+import adsk.core, traceback
+import os, sys
 
-# CommandCreated event handler class.
-class MyCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
-    def __init__(self):
-        super().__init__()
-    def notify(self, args):
-        try:
-            command = adsk.core.Command.cast(args.command)
-            inputs = command.commandInputs
-
-            # Create a selection input to get a selected entity from the user.            
-            selectInput = inputs.addSelectionInput('selectEnt', 'Selection', 'Select an entity')
-            selectInput.setSelectionLimits(1, 1)
-            
-            # Create a text box that will be used to display the results.
-            textResult = inputs.addTextBoxCommandInput('textResult', '', '', 2, True)
-    
-            # Connect to the input changed event.
-            onInputChanged = MyInputChangedHandler()
-            command.inputChanged.add(onInputChanged)
-            handlers.append(onInputChanged)
-        except:
-            app = adsk.core.Application.get()
-            ui = app.userInterface
-            if ui:
-                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
-        
-        
-# InputChanged event handler class.
-class MyInputChangedHandler(adsk.core.InputChangedEventHandler):
-    def __init__(self):
-        super().__init__()
-    def notify(self, args):
-        try:
-            # Get the selection command input.
-            cmdInput = adsk.core.CommandInput.cast(args.input)
-            if cmdInput.id == 'selectEnt':
-                selInput = adsk.core.SelectionCommandInput.cast(cmdInput)
-                # Check that an entity is selected.
-                if selInput.selectionCount > 0:
-                    ent = selInput.selection(0).entity
-
-                    # Create a string showing the proxy path.    
-                    path = getPath(ent)
-                    entType = ent.objectType
-                    entType = entType.split(':')
-                    entType = entType[len(entType)-1]
-                    path += '/' + entType
-                    
-                    # Get the text box command input and display the path string in it.
-                    textResult = cmdInput.parentCommand.commandInputs.itemById('textResult')
-                    textResult.text = path
-        except:
-            app = adsk.core.Application.get()
-            ui = app.userInterface
-            if ui:
-                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
-
-        
-# Builds up the string showing the proxy path by stepping up the path from
-# the proxy entity itself to each occurrence that defines its context.
-def getPath(ent):
-    path = ''
-    if ent.assemblyContext:
-
-        occ = ent.assemblyContext
-        while occ:
-            if path == '':
-                path = occ.name
-            else:
-                path = occ.name + '/' + path
-
-            occ = occ.assemblyContext
-        
-        path = 'Root/' + path
-    else:
-        path = 'Root'
-
-    return path        
+# The modules shared by the add-ins are in the Common folder next to the add-in folders.
+_commonDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Common')
+if _commonDir not in sys.path:
+    sys.path.append(_commonDir)
+import HandlerRegistry, LazyCommand
         
         
 def run(context):
@@ -103,13 +31,16 @@ def run(context):
 
         # Create a new command and connect to the command created event.
         buttonDef = ui.commandDefinitions.addButtonDefinition('ekinsShowProxyPath', 'Show Proxy', 'Display the proxy path of the selected entity.', 'Resources/ShowProxy')
-        onCommandCreated = MyCommandCreatedHandler()
-        buttonDef.commandCreated.add(onCommandCreated)
-        handlers.append(onCommandCreated)
+        HandlerRegistry.addHandler('ShowProxy', buttonDef.commandCreated, LazyCommand.CommandCreatedHandler(__package__, 'ShowProxyCommand', 'MyCommandCreatedHandler', 'ekinsShowProxyPath'))
 
         # Add a control for the command into the INSPECT panel.
         inspectPanel = ui.allToolbarPanels.itemById('InspectPanel')
         inspectPanel.controls.addCommand(buttonDef)                
+
+        # Create the command that exports the proxy index of the whole assembly.
+        exportDef = ui.commandDefinitions.addButtonDefinition('ekinsExportProxyIndex', 'Export Proxy Index', 'Write the path, transform and component of every occurrence in the assembly to a file.', 'Resources/ShowProxy')
+        HandlerRegistry.addHandler('ShowProxy', exportDef.commandCreated, LazyCommand.CommandCreatedHandler(__package__, 'ShowProxyCommand', 'MyExportCommandCreatedHandler', 'ekinsExportProxyIndex'))
+        inspectPanel.controls.addCommand(exportDef, 'ekinsShowProxyPath')
     except:
         if ui:
             ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
@@ -120,6 +51,9 @@ def stop(context):
         app = adsk.core.Application.get()
         ui  = app.userInterface
 
+        HandlerRegistry.releaseHandlers('ShowProxy')
+        LazyCommand.stopModule(__package__, 'ShowProxyCommand')
+
         # Clean up all UI related to this command.
         buttonDef = ui.commandDefinitions.itemById('ekinsShowProxyPath')
         if buttonDef:
@@ -128,6 +62,13 @@ def stop(context):
         inspectPanel = ui.allToolbarPanels.itemById('InspectPanel')
         if inspectPanel.controls.itemById('ekinsShowProxyPath'):
             inspectPanel.controls.itemById('ekinsShowProxyPath').deleteMe()
+
+        exportDef = ui.commandDefinitions.itemById('ekinsExportProxyIndex')
+        if exportDef:
+            exportDef.deleteMe()
+
+        if inspectPanel.controls.itemById('ekinsExportProxyIndex'):
+            inspectPanel.controls.itemById('ekinsExportProxyIndex').deleteMe()
     except:
         if ui:
             ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
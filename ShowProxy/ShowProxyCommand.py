@@ -0,0 +1,351 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#    
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+import adsk.core, adsk.fusion, traceback
+import os, sys, time
+from . import ProxyIndex, PathResolver, BackgroundTraversal
+
+# The modules shared by the add-ins are in the Common folder next to the add-in folders.
+_commonDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Common')
+if _commonDir not in sys.path:
+    sys.path.append(_commonDir)
+import HandlerRegistry, EntityCache
+
+# The commands of the add-in, which don't change the assembly.
+_commandIds = ('ekinsShowProxyPath', 'ekinsExportProxyIndex')
+
+# The commands that don't change the assembly, which don't update the path
+# resolver.  The Select command finishes every time the selection changes.
+_readOnlyCommands = set(_commandIds) | {'SelectCommand'}
+
+# The traversal of the assembly being exported and the file it will be written to.
+_traversal = None
+_exportFilename = ''
+
+# The path resolver of the active design, which is built by getResolver and then
+# updated as occurrences are created and deleted, the number of timeline objects
+# it has been updated for, and the paths of the occurrences that were selected
+# when the current command started, which are the ones it could delete.
+_resolver = None
+_resolverTimelineCount = 0
+_selectedOccurrences = []
+
+# CommandCreated event handler class.
+class MyCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            command = adsk.core.Command.cast(args.command)
+            inputs = command.commandInputs
+
+            # Create a selection input to get a selected entity from the user.            
+            selectInput = inputs.addSelectionInput('selectEnt', 'Selection', 'Select an entity')
+            selectInput.setSelectionLimits(1, 1)
+            
+            # Create a text box that will be used to display the results.
+            textResult = inputs.addTextBoxCommandInput('textResult', '', '', 2, True)
+    
+            # The handlers of the command are released when the command is destroyed.
+            scope = HandlerRegistry.commandScope(command, 'ShowProxy')
+
+            # Connect to the input changed event.
+            scope.add(command.inputChanged, MyInputChangedHandler())
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+        
+        
+# InputChanged event handler class.
+class MyInputChangedHandler(adsk.core.InputChangedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Get the selection command input.
+            cmdInput = adsk.core.CommandInput.cast(args.input)
+            if cmdInput.id == 'selectEnt':
+                selInput = adsk.core.SelectionCommandInput.cast(cmdInput)
+                # Check that an entity is selected.
+                if selInput.selectionCount > 0:
+                    ent = selInput.selection(0).entity
+
+                    # Create a string showing the proxy path.    
+                    path = getPath(ent)
+                    entType = ent.objectType
+                    entType = entType.split(':')
+                    entType = entType[len(entType)-1]
+                    path += '/' + entType
+                    
+                    # Get the text box command input and display the path string in it.
+                    textResult = cmdInput.parentCommand.commandInputs.itemById('textResult')
+                    textResult.text = path
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# CommandCreated event handler class for the command that exports the proxy index.
+class MyExportCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            command = adsk.core.Command.cast(args.command)
+
+            # The handlers of the command are released when the command is destroyed.
+            scope = HandlerRegistry.commandScope(command, 'ShowProxy')
+
+            # The command doesn't have a dialog so connect to the execute event.
+            scope.add(command.execute, MyExportExecuteHandler())
+        except:
+            app = adsk.core.Application.get()
+            ui = app.userInterface
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# Execute event handler class that starts building the index of every occurrence
+# in the active design in the background.  It's written to the file the user chooses
+# when the traversal finishes.  Running the command while a traversal is in progress
+# cancels it.
+class MyExportExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        global _traversal, _exportFilename
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        try:
+            if _traversal and _traversal.isRunning:
+                _traversal.cancel()
+                return
+
+            des = adsk.fusion.Design.cast(app.activeProduct)
+            if not des:
+                ui.messageBox('A design must be active to export the proxy index.')
+                return
+
+            fileDialog = ui.createFileDialog()
+            fileDialog.title = 'Export Proxy Index'
+            fileDialog.filter = 'JSON Lines (*.jsonl);;Binary proxy index (*.pxi)'
+            if fileDialog.showSave() != adsk.core.DialogResults.DialogOK:
+                return
+            _exportFilename = fileDialog.filename
+
+            _traversal = BackgroundTraversal.BackgroundTraversal(des, 'ekinsProxyTraversal', exportIndex)
+            _traversal.start()
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# Called when the background traversal finishes to write the index to the file.
+def exportIndex(traversal):
+    global _resolver, _resolverTimelineCount
+    ui = adsk.core.Application.get().userInterface
+    try:
+        if traversal.isCancelled:
+            ui.messageBox('The export was cancelled after {} nodes.'.format(traversal.index.count))
+            return
+
+        startTime = time.perf_counter()
+        if os.path.splitext(_exportFilename)[1].lower() == '.pxi':
+            traversal.index.writeBinary(_exportFilename)
+        else:
+            traversal.index.writeJSONLines(_exportFilename)
+        writeTime = time.perf_counter() - startTime
+
+        # The traversal also built a path resolver of the whole assembly, which
+        # can be used if the assembly hasn't changed since the traversal started.
+        des = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+        if des and traversal.resolver.count == des.rootComponent.allOccurrences.count + 1:
+            _resolver = traversal.resolver
+            _resolverTimelineCount = getTimelineCount(des)
+
+        ui.messageBox('Exported {} nodes.\n\nTraversal: {:.3f} seconds\nWriting: {:.3f} seconds'.format(traversal.index.count, traversal.seconds, writeTime))
+    except:
+        ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# DocumentActivated event handler class that cancels any traversal and removes
+# the path resolver because the occurrences belong to the previously active document.
+class MyDocumentActivatedHandler(adsk.core.DocumentEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        global _resolver
+        _resolver = None
+        if _traversal:
+            _traversal.cancel()
+
+
+# CommandStarting event handler class that remembers the paths of the selected
+# occurrences, because a command can only delete an occurrence that's selected
+# and its path can't be found once it has been deleted.
+class MyCommandStartingHandler(adsk.core.ApplicationCommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        global _selectedOccurrences
+        try:
+            _selectedOccurrences = []
+            eventArgs = adsk.core.ApplicationCommandEventArgs.cast(args)
+            if not _resolver or eventArgs.commandId in _readOnlyCommands:
+                return
+
+            for selection in adsk.core.Application.get().userInterface.activeSelections:
+                occ = adsk.fusion.Occurrence.cast(selection.entity)
+                if occ:
+                    _selectedOccurrences.append((getOccurrencePath(occ), occ))
+        except:
+            adsk.core.Application.get().userInterface.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# CommandTerminated event handler class that updates the path resolver.
+class MyCommandTerminatedHandler(adsk.core.ApplicationCommandEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        global _selectedOccurrences
+        try:
+            eventArgs = adsk.core.ApplicationCommandEventArgs.cast(args)
+            if _resolver and eventArgs.commandId not in _readOnlyCommands:
+                updateResolver(_selectedOccurrences)
+            _selectedOccurrences = []
+        except:
+            adsk.core.Application.get().userInterface.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+# Returns the path resolver of the active design, building it the first time.
+# It's kept up to date as occurrences are created and deleted, so paths can be
+# resolved at any time, for example from the Python console of the Text Commands
+# window:
+#     occurrences = ShowProxyCommand.getResolver().resolvePaths(paths)
+def getResolver():
+    global _resolver, _resolverTimelineCount
+    if not _resolver:
+        des = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+        if not des:
+            return None
+        _resolver = PathResolver.PathResolver(des)
+        _resolverTimelineCount = getTimelineCount(des)
+    return _resolver
+
+
+# Returns the occurrences for the paths, with None for any path that doesn't exist.
+def resolvePaths(paths):
+    resolver = getResolver()
+    return resolver.resolvePaths(paths) if resolver else [None] * len(paths)
+
+
+# Returns the number of objects in the timeline, or 0 for a direct modeling design.
+def getTimelineCount(des):
+    if des.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        return des.timeline.count
+    return 0
+
+
+# Updates the path resolver after a command that could have changed the assembly.
+# The selected occurrences that have been deleted are removed and the occurrences
+# the command added to the end of the timeline are added.  If the resolver doesn't
+# have the same number of occurrences as the design afterwards, because the change
+# couldn't be followed, like an undo or a change in a direct modeling design, it's
+# removed so it's built again the next time it's needed.
+def updateResolver(selectedOccurrences):
+    global _resolver, _resolverTimelineCount
+    des = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+    if not des:
+        _resolver = None
+        return
+
+    for (path, occ) in selectedOccurrences:
+        if not occ.isValid:
+            _resolver.removePath(path)
+
+    timelineCount = getTimelineCount(des)
+    if timelineCount > _resolverTimelineCount:
+        timeline = des.timeline
+        for timelineIndex in range(_resolverTimelineCount, timelineCount):
+            occ = adsk.fusion.Occurrence.cast(timeline.item(timelineIndex).entity)
+            if occ:
+                try:
+                    _resolver.addOccurrence(occ)
+                except ValueError:
+                    _resolver = None
+                    return
+    _resolverTimelineCount = timelineCount
+
+    if _resolver.count != des.rootComponent.allOccurrences.count + 1:
+        _resolver = None
+
+
+# Builds up the string showing the proxy path of the occurrence that defines
+# the context of the entity.
+def getPath(ent):
+    occ = ent.assemblyContext
+    if occ:
+        return getOccurrencePath(occ)
+    else:
+        return 'Root'
+
+
+# Returns the full path of the occurrence.  The path of each occurrence is only
+# built once, by adding its name to the path of its parent, and is then cached
+# until a command that could change the assembly finishes.
+def getOccurrencePath(occ):
+    # Step up the path from the occurrence until an occurrence whose path is
+    # already known, or the root, is reached.
+    path = 'Root'
+    uncached = []
+    while occ:
+        token = occ.entityToken
+        cachedPath = EntityCache.get('ShowProxy', token)
+        if cachedPath:
+            path = cachedPath
+            break
+
+        uncached.append((token, occ))
+        occ = occ.assemblyContext
+
+    # Build the paths of the new occurrences from the top down.
+    for (token, occ) in reversed(uncached):
+        path += '/' + occ.name
+        EntityCache.put('ShowProxy', token, path)
+
+    return path
+
+
+# Called by LazyCommand when the module is first imported.
+def start():
+    app = adsk.core.Application.get()
+
+    # The paths are cached by EntityCache, which takes care of invalidating them.
+    EntityCache.register('ShowProxy', _commandIds)
+    HandlerRegistry.addHandler('ShowProxy', app.documentActivated, MyDocumentActivatedHandler())
+
+    # The path resolver is updated when a command finishes.
+    HandlerRegistry.addHandler('ShowProxy', app.userInterface.commandStarting, MyCommandStartingHandler())
+    HandlerRegistry.addHandler('ShowProxy', app.userInterface.commandTerminated, MyCommandTerminatedHandler())
+
+
+# Called by LazyCommand when the add-in is stopped.
+def stop():
+    global _resolver
+    _resolver = None
+    EntityCache.release('ShowProxy')
+    if _traversal:
+        _traversal.cancel()
@@ -0,0 +1,159 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Runs a queue of operations inside the execute event of a single command so
+# everything they do is one transaction and can be undone with one undo.  This is
+# the same approach as the TransactionSample script, made reusable.
+#
+# Each operation is a function that's called with the executor as its first
+# argument, followed by the arguments it was queued with.  An operation that
+# adds to a sketch should pass the sketch to deferCompute first so the sketch is
+# only computed once, after all of the operations have run.  In a parametric
+# design, the timeline entries the operations create are combined into a group.
+
+import adsk.core, adsk.fusion, traceback, time
+import os, sys
+
+# The modules shared by the add-ins are in the Common folder next to the add-in folders.
+_commonDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Common')
+if _commonDir not in sys.path:
+    sys.path.append(_commonDir)
+import HandlerRegistry
+
+
+class BatchExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self, executor):
+        super().__init__()
+        self.executor = executor
+    def notify(self, args):
+        try:
+            self.executor._execute()
+        except:
+            ui = adsk.core.Application.get().userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+class BatchCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
+    def __init__(self, executor):
+        super().__init__()
+        self.executor = executor
+    def notify(self, args):
+        try:
+            cmd = adsk.core.Command.cast(args.command)
+
+            # The command doesn't have any inputs so it goes directly to the execute event.
+            scope = HandlerRegistry.commandScope(cmd, self.executor.commandId)
+            scope.add(cmd.execute, BatchExecuteHandler(self.executor))
+        except:
+            ui = adsk.core.Application.get().userInterface
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+class BatchExecutor:
+    # The command id and name are what the user sees in the undo list.  The
+    # onComplete function is called with the executor after the operations have run.
+    def __init__(self, commandId, name, onComplete=None, groupName=''):
+        self.commandId = commandId
+        self.name = name
+        self.groupName = groupName if groupName else name
+        self._onComplete = onComplete
+        self._operations = []
+        self._deferredSketches = []
+        self.design = None
+
+        # A list of (operation name, seconds) for each operation that was run.
+        self.timings = []
+        self.computeSeconds = 0.0
+        self.totalSeconds = 0.0
+        self.error = ''
+
+    @property
+    def count(self):
+        return len(self._operations)
+
+    # Adds an operation to the queue.  The name is used in the timing report and
+    # defaults to the name of the function.
+    def add(self, operation, *args, name=''):
+        self._operations.append((operation, args, name if name else operation.__name__))
+
+    # Turns off computing the sketch until all of the operations have run.
+    def deferCompute(self, sketch):
+        if not sketch.isComputeDeferred:
+            sketch.isComputeDeferred = True
+            self._deferredSketches.append(sketch)
+
+    # Creates and executes the command that runs the queued operations.
+    def run(self):
+        ui = adsk.core.Application.get().userInterface
+        cmdDef = ui.commandDefinitions.itemById(self.commandId)
+        if cmdDef:
+            cmdDef.deleteMe()
+        cmdDef = ui.commandDefinitions.addButtonDefinition(self.commandId, self.name, '', '')
+
+        # Only the handler of the latest command definition with this id is kept.
+        HandlerRegistry.releaseHandlers(self.commandId)
+        HandlerRegistry.addHandler(self.commandId, cmdDef.commandCreated, BatchCommandCreatedHandler(self))
+
+        cmdDef.execute()
+
+    # Runs the operations.  The onComplete function is always called, with the
+    # error set if anything failed, so the caller can report it and clean up.
+    def _execute(self):
+        app = adsk.core.Application.get()
+        self.timings = []
+        self.error = ''
+        batchStartTime = time.perf_counter()
+
+        try:
+            self.design = adsk.fusion.Design.cast(app.activeProduct)
+            if not self.design:
+                raise RuntimeError('A design must be active to run the operations.')
+
+            isParametric = self.design.designType == adsk.fusion.DesignTypes.ParametricDesignType
+            if isParametric:
+                startPosition = self.design.timeline.markerPosition
+
+            try:
+                for (operation, args, name) in self._operations:
+                    startTime = time.perf_counter()
+                    operation(self, *args)
+                    self.timings.append((name, time.perf_counter() - startTime))
+            finally:
+                # Compute all of the sketches that were changed.
+                startTime = time.perf_counter()
+                for sketch in self._deferredSketches:
+                    sketch.isComputeDeferred = False
+                self._deferredSketches = []
+                self.computeSeconds = time.perf_counter() - startTime
+
+            if isParametric:
+                endPosition = self.design.timeline.markerPosition
+                if endPosition - startPosition > 1:
+                    group = self.design.timeline.timelineGroups.add(startPosition, endPosition - 1)
+                    group.name = self.groupName
+        except:
+            self.error = traceback.format_exc()
+        finally:
+            self._operations = []
+            self.totalSeconds = time.perf_counter() - batchStartTime
+            if self._onComplete:
+                self._onComplete(self)
+
+    # Returns a report of the time taken by each operation.
+    def timingReport(self):
+        lines = ['{}: {} operations in {:.3f} seconds'.format(self.name, len(self.timings), self.totalSeconds)]
+        for (name, seconds) in self.timings:
+            lines.append('    {:<30} {:.4f} s'.format(name, seconds))
+        lines.append('    {:<30} {:.4f} s'.format('Computing sketches', self.computeSeconds))
+        if self.error:
+            lines.append('Failed:\n' + self.error)
+        return '\n'.join(lines)
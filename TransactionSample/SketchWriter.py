@@ -0,0 +1,116 @@
+#    (C) Copyright 2015 by Autodesk, Inc.
+#    Permission to use, copy, modify, and distribute this software in
+#    object code form for any purpose and without fee is hereby granted,
+#    provided that the above copyright notice appears in all copies and
+#    that both that copyright notice and the limited warranty and restricted
+#    rights notice below appear in all supporting documentation.
+#
+#    AUTODESK PROVIDES THIS PROGRAM "AS IS" AND WITH ALL FAULTS.
+#    AUTODESK SPECIFICALLY DISCLAIMS ANY IMPLIED WARRANTY OF MERCHANTABILITY OR
+#    FITNESS FOR A PARTICULAR USE. AUTODESK, INC. DOES NOT WARRANT THAT THE
+#    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
+
+# Functions to add large numbers of lines to a sketch.  Points are given as
+# sequences of (x, y, z) in sketch space, which can be lists of tuples or the rows
+# of an N x 3 array.  Lines that end at the same coordinates share a sketch point
+# rather than each creating their own, so the lines are connected and the sketch
+# has fewer points.  The sketch is only computed once, after all of the lines have
+# been added.
+
+import adsk.core, time
+
+# Coordinates closer than this, in centimeters, are treated as the same point.
+defaultTolerance = 1e-8
+
+
+# Keeps track of the sketch points that have been created so lines that end at
+# the same coordinates can use the same point.
+class _PointMap:
+    def __init__(self, tolerance):
+        self._scale = 1.0 / tolerance
+        self._points = {}
+
+    def _key(self, point):
+        scale = self._scale
+        return (round(point[0] * scale), round(point[1] * scale), round(point[2] * scale))
+
+    # Adds a line between the points and returns the number of new sketch points,
+    # or -1 if the points are the same and a line wasn't added.
+    def addLine(self, lines, startPoint, endPoint):
+        startKey = self._key(startPoint)
+        endKey = self._key(endPoint)
+        if startKey == endKey:
+            return -1
+
+        points = self._points
+        startSketchPoint = points.get(startKey)
+        endSketchPoint = points.get(endKey)
+        line = lines.addByTwoPoints(startSketchPoint if startSketchPoint else adsk.core.Point3D.create(startPoint[0], startPoint[1], startPoint[2]),
+                                    endSketchPoint if endSketchPoint else adsk.core.Point3D.create(endPoint[0], endPoint[1], endPoint[2]))
+
+        # Only get the sketch points of the line when they're new.
+        pointCount = 0
+        if not startSketchPoint:
+            points[startKey] = line.startSketchPoint
+            pointCount += 1
+        if not endSketchPoint:
+            points[endKey] = line.endSketchPoint
+            pointCount += 1
+        return pointCount
+
+
+# Returns a dictionary of the number of lines and points created, the time taken
+# and the number of objects created per second.
+def _stats(lineCount, pointCount, seconds):
+    return {'lines': lineCount, 'points': pointCount, 'seconds': seconds,
+            'objectsPerSecond': (lineCount + pointCount) / seconds if seconds > 0 else 0.0}
+
+
+# Adds a line between each start point and the corresponding end point.  Lines
+# whose start and end points are the same are skipped.
+def addLines(sketch, startPoints, endPoints, tolerance=defaultTolerance):
+    startTime = time.perf_counter()
+    lines = sketch.sketchCurves.sketchLines
+    pointMap = _PointMap(tolerance)
+    pointCount = 0
+    lineCount = 0
+
+    isDeferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
+    try:
+        for (startPoint, endPoint) in zip(startPoints, endPoints):
+            newPoints = pointMap.addLine(lines, startPoint, endPoint)
+            if newPoints >= 0:
+                lineCount += 1
+                pointCount += newPoints
+    finally:
+        sketch.isComputeDeferred = isDeferred
+
+    return _stats(lineCount, pointCount, time.perf_counter() - startTime)
+
+
+# Adds connected lines through the points of each polyline.  A polyline whose
+# last point is the same as its first is closed.
+def addPolylines(sketch, polylines, tolerance=defaultTolerance):
+    startTime = time.perf_counter()
+    lines = sketch.sketchCurves.sketchLines
+    pointMap = _PointMap(tolerance)
+    pointCount = 0
+    lineCount = 0
+
+    isDeferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
+    try:
+        for polyline in polylines:
+            previousPoint = None
+            for point in polyline:
+                if previousPoint is not None:
+                    newPoints = pointMap.addLine(lines, previousPoint, point)
+                    if newPoints >= 0:
+                        lineCount += 1
+                        pointCount += newPoints
+                previousPoint = point
+    finally:
+        sketch.isComputeDeferred = isDeferred
+
+    return _stats(lineCount, pointCount, time.perf_counter() - startTime)
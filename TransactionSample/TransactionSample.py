@@ -11,46 +11,33 @@
 #    OPERATION OF THE PROGRAM WILL BE UNINTERRUPTED OR ERROR FREE.
 
 import adsk.core, adsk.fusion, traceback
+from . import BatchExecutor, SketchWriter
 
-handlers = []
-
-def drawLines():
-    app = adsk.core.Application.get()
-    des = adsk.fusion.Design.cast(app.activeProduct)
+# Operation that creates a sketch and draws a row of vertical lines in it.
+def drawLines(executor, lineCount=100, xOffset=1):
+    des = executor.design
 
     sk = des.rootComponent.sketches.add(des.rootComponent.xYConstructionPlane)
-    currentX = 0
-    xOffset = 1
-    lines = sk.sketchCurves.sketchLines
-    sk.isComputeDeferred = True
-    for i in range(0,100):
-        lines.addByTwoPoints(adsk.core.Point3D.create(currentX, 0, 0), adsk.core.Point3D.create(currentX, 10, 0))
-        currentX += xOffset
-    sk.isComputeDeferred = False
-
-
-class CommandExecuteHandler(adsk.core.CommandEventHandler):
-    def __init__(self):
-        super().__init__()
-    def notify(self, args):
-        # Do whatever the command does.
-        drawLines()
-        
-        # Force the termination of the command.
-        adsk.terminate()        
+    executor.deferCompute(sk)
+    startPoints = [(i * xOffset, 0, 0) for i in range(0, lineCount)]
+    endPoints = [(i * xOffset, 10, 0) for i in range(0, lineCount)]
+    SketchWriter.addLines(sk, startPoints, endPoints)
 
 
-class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
-    def __init__(self):
-        super().__init__()
-    def notify(self, args):
-        cmd = adsk.core.Command.cast(args.command)
+# Called after the command has run all of the operations, or failed.  The time
+# taken by each operation is shown, along with the error if there was one.
+def batchComplete(executor):
+    ui = None
+    try:
+        ui = adsk.core.Application.get().userInterface
+        ui.messageBox(executor.timingReport())
+    except:
+        if ui:
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+    finally:
+        # Force the termination of the script.
+        adsk.terminate()
 
-        # Connect up to the command executed event.        
-        onExecute = CommandExecuteHandler()
-        cmd.execute.add(onExecute)
-        handlers.append(onExecute)
-        
 
 def run(context):
     ui = None
@@ -58,18 +45,11 @@ def run(context):
         app = adsk.core.Application.get()
         ui  = app.userInterface
         
-        # Create the command definition.
-        if ui.commandDefinitions.itemById('transactionSample'):
-            ui.commandDefinitions.itemById('transactionSample').deleteMe()            
-        cmdDef = ui.commandDefinitions.addButtonDefinition('transactionSample', 'Transaction Sample', '', '')
-        
-        # Connect up to the command created event.
-        onCommandCreated = CommandCreatedHandler()
-        cmdDef.commandCreated.add(onCommandCreated)
-        handlers.append(onCommandCreated)
-        
-        # execute the command.
-        cmdDef.execute()
+        # Queue the operations and run them in a single command so they're one
+        # transaction and can be undone with one undo.
+        executor = BatchExecutor.BatchExecutor('transactionSample', 'Transaction Sample', batchComplete)
+        executor.add(drawLines, 100)
+        executor.run()
         
         # Keep the script running.
         adsk.autoTerminate(False)